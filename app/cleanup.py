@@ -2,6 +2,8 @@ import logging
 import time
 from datetime import datetime, timedelta
 
+from .config import DATABASE_CONFIG, HTML_CACHE_CONFIG
+from .html_cache import HtmlCache
 from .store import Database
 
 logger = logging.getLogger(__name__)
@@ -10,23 +12,73 @@ logger = logging.getLogger(__name__)
 class CleanupManager:
     """Handles periodic cleanup of old database records."""
 
-    def __init__(self, cleanup_after_hours: int):
+    def __init__(self, cleanup_after_hours: int, batch_size: int = 500,
+                 archive_retention_days: int = DATABASE_CONFIG['archive_retention_days'],
+                 event_retention_days: int = DATABASE_CONFIG['event_retention_days']):
         """
         Initializes the CleanupManager.
 
         Args:
-            cleanup_after_hours: The age in hours after which records should be deleted.
+            cleanup_after_hours: The age in hours after which records are moved to the archive.
+            batch_size: How many rowids each archive transaction may cover.
+            archive_retention_days: How long archived ids are kept for deduplication.
+            event_retention_days: How long article_events are kept for analytics.
         """
-        self.db = Database()
         self.cleanup_delta = timedelta(hours=cleanup_after_hours)
+        self.batch_size = batch_size
+        self.archive_retention = timedelta(days=archive_retention_days)
+        self.event_retention = timedelta(days=event_retention_days)
 
     def run_cleanup(self):
-        """Deletes records from the database older than the configured delta."""
+        """
+        Archives records older than the configured delta, prunes the archive and
+        event log, and sweeps expired pages out of the HTML cache.
+        """
         cutoff_time = datetime.now() - self.cleanup_delta
         logger.info(f"Starting cleanup of records older than {cutoff_time.isoformat()}")
+        # The scheduler runs this job on a worker thread, so the connection is
+        # taken from that thread's pool rather than created up front.
+        db = Database()
         try:
-            # This assumes the Database class has a method to perform the cleanup.
-            deleted_count = self.db.cleanup_old_entries(cutoff_time)
-            logger.info(f"Cleanup complete. Deleted {deleted_count} old records.")
+            started = time.monotonic()
+            archived_count = db.cleanup_old_entries(cutoff_time, batch_size=self.batch_size)
+            pruned_count = db.prune_archive(datetime.utcnow() - self.archive_retention)
+            pruned_events = db.prune_events(datetime.utcnow() - self.event_retention)
+            released_pages = db.reclaim_space()
+            logger.info(
+                f"Cleanup complete. Archived {archived_count} old records, pruned {pruned_count} "
+                f"archive entries and {pruned_events} events and released {released_pages} free pages "
+                f"in {time.monotonic() - started:.1f}s."
+            )
         except Exception as e:
-            logger.error(f"An error occurred during cleanup: {e}", exc_info=True)
\ No newline at end of file
+            logger.error(f"An error occurred during cleanup: {e}", exc_info=True)
+        finally:
+            db.close()
+        self.sweep_html_cache()
+
+    def sweep_html_cache(self) -> int:
+        """Runs the HTML cache's full eviction pass (TTL and size cap). Returns entries dropped."""
+        if not HTML_CACHE_CONFIG['enabled']:
+            return 0
+        try:
+            dropped = HtmlCache().evict()
+            logger.info(f"HTML cache sweep dropped {dropped} entries.")
+            return dropped
+        except Exception as e:
+            logger.error(f"An error occurred while sweeping the HTML cache: {e}", exc_info=True)
+            return 0
+
+
+def run_counter_reconciliation():
+    """Recounts the dashboard's materialized counters and repairs any drift."""
+    db = Database()
+    try:
+        drift = db.reconcile_counters()
+        if drift:
+            logger.warning(f"Counter reconciliation corrected {drift} drifted counter(s).")
+        else:
+            logger.info("Counter reconciliation found no drift.")
+    except Exception as e:
+        logger.error(f"An error occurred during counter reconciliation: {e}", exc_info=True)
+    finally:
+        db.close()
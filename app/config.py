@@ -16,6 +16,7 @@ PIPELINE_ORDER: List[str] = [
 
 # --- Feeds RSS ---
 # As URLs são carregadas das variáveis de ambiente (FEED_1, FEED_2, etc.)
+# 'extraction_profile' (opcional): 'fast', 'balanced' ou 'thorough' (ver extractor.EXTRACTION_PROFILES)
 RSS_FEEDS: Dict[str, Dict[str, Any]] = {
     'lance_futebol': {
         'urls': ['https://aprenderpoker.site/feeds/lance/futebol/rss'],
@@ -41,6 +42,62 @@ USER_AGENT = (
     'Chrome/91.0.4472.124 Safari/537.36'
 )
 
+# Política de retry compartilhada por todas as sessões HTTP (http_retry): retries
+# por host limitados a uma fração das requisições da janela; Retry-After acima do
+# limite encerra os retries
+HTTP_RETRY_CONFIG = {
+    'total': int(os.getenv('HTTP_RETRY_TOTAL', 3)),
+    'backoff_factor': float(os.getenv('HTTP_RETRY_BACKOFF_FACTOR', 0.6)),
+    'budget_ratio': float(os.getenv('HTTP_RETRY_BUDGET_RATIO', 0.1)),
+    'budget_min_retries': int(os.getenv('HTTP_RETRY_BUDGET_MIN_RETRIES', 3)),
+    'budget_window_seconds': int(os.getenv('HTTP_RETRY_BUDGET_WINDOW_SECONDS', 60)),
+    'max_retry_after_seconds': int(os.getenv('HTTP_RETRY_MAX_RETRY_AFTER_SECONDS', 30)),
+}
+
+# Cache em disco do HTML das matérias (comprimido, endereçado por conteúdo)
+HTML_CACHE_CONFIG = {
+    'enabled': os.getenv('HTML_CACHE_ENABLED', 'true').lower() in ('1', 'true', 'yes'),
+    'directory': os.getenv('HTML_CACHE_DIR', 'data/html_cache'),
+    'ttl_seconds': int(os.getenv('HTML_CACHE_TTL_SECONDS', 6 * 3600)),
+    'max_bytes': int(os.getenv('HTML_CACHE_MAX_BYTES', 200 * 1024 * 1024)),
+}
+
+# Download das matérias em streaming: limite de tamanho e parada antecipada
+# quando o <article> e o JSON-LD da página já foram fechados
+HTML_FETCH_CONFIG = {
+    'max_bytes': int(os.getenv('HTML_FETCH_MAX_BYTES', 4 * 1024 * 1024)),
+    'early_stop': os.getenv('HTML_FETCH_EARLY_STOP', 'true').lower() in ('1', 'true', 'yes'),
+    'chunk_size': int(os.getenv('HTML_FETCH_CHUNK_SIZE', 64 * 1024)),
+}
+
+# Estratégia de download que funcionou por host (cabeçalhos/UA/fetcher do trafilatura);
+# a decisão expira após o TTL e é reaprendida
+FETCH_STRATEGY_MEMORY = {
+    'maxsize': int(os.getenv('FETCH_STRATEGY_MEMORY_SIZE', 1024)),
+    'ttl_seconds': int(os.getenv('FETCH_STRATEGY_TTL_SECONDS', 6 * 3600)),
+}
+
+# Seletores do corpo aprendidos por domínio: usados sem trafilatura após N
+# confirmações e com taxa de acerto mínima; as contagens são gravadas em lote
+LEARNED_SELECTORS_CONFIG = {
+    'enabled': os.getenv('LEARNED_SELECTORS_ENABLED', 'true').lower() in ('1', 'true', 'yes'),
+    'min_confirmations': int(os.getenv('LEARNED_SELECTORS_MIN_CONFIRMATIONS', 3)),
+    'min_confidence': float(os.getenv('LEARNED_SELECTORS_MIN_CONFIDENCE', 0.8)),
+    'flush_interval_seconds': float(os.getenv('LEARNED_SELECTORS_FLUSH_INTERVAL_SECONDS', 30)),
+    'flush_batch_size': int(os.getenv('LEARNED_SELECTORS_FLUSH_BATCH_SIZE', 20)),
+}
+
+# Extração das matérias: 0 = na thread do pipeline; N > 0 = pool de N processos
+# com timeout por artigo, reciclados após N artigos ou acima do limite de RSS
+EXTRACTION_CONFIG = {
+    'pool_workers': int(os.getenv('EXTRACTION_POOL_WORKERS', 0)),
+    'timeout_seconds': int(os.getenv('EXTRACTION_TIMEOUT_SECONDS', 60)),
+    'max_tasks_per_worker': int(os.getenv('EXTRACTION_MAX_TASKS_PER_WORKER', 200)),
+    'max_worker_rss_mb': int(os.getenv('EXTRACTION_MAX_WORKER_RSS_MB', 512)),
+    # Perfil dos feeds sem 'extraction_profile' próprio
+    'default_profile': os.getenv('EXTRACTION_PROFILE', 'balanced'),
+}
+
 # --- Configuração da IA ---
 def _load_ai_keys() -> Dict[str, List[str]]:
     """
@@ -89,6 +146,13 @@ WORDPRESS_CONFIG = {
     'password': os.getenv('WORDPRESS_PASSWORD'),
 }
 
+# Cache em memória para buscas de categorias/tags no WordPress (slug/nome -> termo)
+TAXONOMY_LOOKUP_CACHE = {
+    'maxsize': int(os.getenv('TAXONOMY_LOOKUP_CACHE_SIZE', 2048)),
+    'ttl_seconds': int(os.getenv('TAXONOMY_LOOKUP_TTL_SECONDS', 6 * 3600)),
+    'negative_ttl_seconds': int(os.getenv('TAXONOMY_LOOKUP_NEGATIVE_TTL_SECONDS', 120)),
+}
+
 # IDs das categorias no WordPress (ajuste os IDs conforme o seu WP)
 WORDPRESS_CATEGORIES: Dict[str, int] = {
     'futebol': 1,  # TODO: Atualizar com o ID correto da categoria "Futebol" no WordPress
@@ -103,6 +167,37 @@ SCHEDULE_CONFIG = {
     'per_article_delay_seconds': int(os.getenv('PER_ARTICLE_DELAY_SECONDS', 8)),
     'per_feed_delay_seconds': int(os.getenv('PER_FEED_DELAY_SECONDS', 15)),
     'cleanup_after_hours': int(os.getenv('CLEANUP_AFTER_HOURS', 72)),
+    'cleanup_interval_minutes': int(os.getenv('CLEANUP_INTERVAL_MINUTES', 60)),
+    'cleanup_batch_size': int(os.getenv('CLEANUP_BATCH_SIZE', 500)),
+    'counter_reconcile_interval_minutes': int(os.getenv('COUNTER_RECONCILE_INTERVAL_MINUTES', 360)),
+}
+
+# --- Novas tentativas (falhas transitórias) ---
+RETRY_CONFIG = {
+    'max_attempts': int(os.getenv('RETRY_MAX_ATTEMPTS', 4)),
+    'base_delay_seconds': int(os.getenv('RETRY_BASE_DELAY_SECONDS', 120)),
+    'max_delay_seconds': int(os.getenv('RETRY_MAX_DELAY_SECONDS', 3600)),
+    'jitter': float(os.getenv('RETRY_JITTER', 0.25)),
+    # Artigos vistos há mais tempo que isso não são mais reprocessados
+    'max_age_hours': int(os.getenv('RETRY_MAX_AGE_HOURS', 6)),
+}
+
+# --- Banco de dados (SQLite) ---
+DATABASE_CONFIG = {
+    'path': os.getenv('DB_PATH', 'data/app.db'),
+    'busy_timeout_ms': int(os.getenv('DB_BUSY_TIMEOUT_MS', 10000)),
+    'mmap_size_bytes': int(os.getenv('DB_MMAP_SIZE_BYTES', 256 * 1024 * 1024)),
+    'cache_size_kib': int(os.getenv('DB_CACHE_SIZE_KIB', 64 * 1024)),
+    # Arquivo frio de deduplicação (vazio = '<banco>-archive.db' ao lado do banco principal)
+    'archive_path': os.getenv('DB_ARCHIVE_PATH', ''),
+    'archive_retention_days': int(os.getenv('DB_ARCHIVE_RETENTION_DAYS', 180)),
+    # Write-behind das mudanças de status dos artigos
+    'status_flush_batch_size': int(os.getenv('DB_STATUS_FLUSH_BATCH_SIZE', 20)),
+    'status_flush_interval_seconds': float(os.getenv('DB_STATUS_FLUSH_INTERVAL_SECONDS', 30)),
+    # Log de eventos por artigo (analytics), gravado em lotes
+    'event_flush_batch_size': int(os.getenv('DB_EVENT_FLUSH_BATCH_SIZE', 50)),
+    'event_flush_interval_seconds': float(os.getenv('DB_EVENT_FLUSH_INTERVAL_SECONDS', 30)),
+    'event_retention_days': int(os.getenv('DB_EVENT_RETENTION_DAYS', 30)),
 }
 
 def _get_domain_from_wp_url(wp_url: str) -> str:
@@ -0,0 +1,121 @@
+"""
+Read-only data access for the dashboard.
+
+Every method reads through one shared `mode=ro` connection inside a single
+read transaction, so one page load sees one consistent WAL snapshot and never
+takes a write lock away from the pipeline. The dashboard's server handles each
+request on a new thread, so the connection is opened once with
+`check_same_thread=False` and snapshots take turns on a lock instead of every
+thread opening (and leaking) its own.
+"""
+
+import logging
+import sqlite3
+import threading
+from contextlib import contextmanager
+from datetime import datetime
+from typing import Any, Dict, Iterable, Optional
+
+from .config import DATABASE_CONFIG
+from .store import connect, read_counters
+
+logger = logging.getLogger(__name__)
+
+
+class DashboardReader:
+    """Queries the pipeline database on behalf of the dashboard, read-only."""
+
+    def __init__(self, db_path: str = DATABASE_CONFIG['path']):
+        self.db_path = db_path
+        self._conn: Optional[sqlite3.Connection] = None
+        self._lock = threading.Lock()
+
+    @contextmanager
+    def snapshot(self):
+        """Yields a cursor whose reads all come from the same database snapshot."""
+        with self._lock:
+            if self._conn is None:
+                self._conn = connect(self.db_path, readonly=True, check_same_thread=False)
+            conn = self._conn
+            if conn.in_transaction:
+                conn.rollback()
+            conn.execute("BEGIN")
+            try:
+                yield conn.cursor()
+            finally:
+                conn.rollback()
+
+    def close(self) -> None:
+        """Closes the shared connection; the next snapshot opens a new one."""
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+
+    def get_stats(self, recent_limit: int = 10) -> Dict[str, Any]:
+        """Returns counters, recent posts, 24h API usage and the last activity time."""
+        with self.snapshot() as cursor:
+            counters = read_counters(cursor.connection)
+            cursor.execute('''
+                SELECT sa.source_id, sa.external_id, p.wp_post_id, p.created_at
+                FROM posts p
+                JOIN seen_articles sa ON sa.id = p.seen_article_id
+                ORDER BY p.created_at DESC
+                LIMIT ?
+            ''', (recent_limit,))
+            recent_posts = [tuple(row) for row in cursor.fetchall()]
+
+            cursor.execute('''
+                SELECT api_type, SUM(usage_count) AS usage_count
+                FROM api_usage
+                WHERE last_used > datetime('now', '-24 hours')
+                GROUP BY api_type
+            ''')
+            api_usage = {row['api_type']: row['usage_count'] for row in cursor.fetchall()}
+
+            cursor.execute('''
+                SELECT MAX(inserted_at) FROM seen_articles
+                WHERE inserted_at > datetime('now', '-2 hours')
+            ''')
+            last_activity = _parse_timestamp(cursor.fetchone()[0])
+
+        return {
+            'counters': counters,
+            'recent_posts': recent_posts,
+            'api_usage': api_usage,
+            'last_activity': last_activity,
+        }
+
+    def get_feed_stats(self, source_ids: Iterable[str]) -> Dict[str, Dict[str, int]]:
+        """Returns articles seen in the last 24h and published posts for each feed."""
+        source_ids = list(source_ids)
+        with self.snapshot() as cursor:
+            by_source = read_counters(cursor.connection)['by_source']
+            recent: Dict[str, int] = {}
+            if source_ids:
+                placeholders = ','.join('?' for _ in source_ids)
+                cursor.execute(f'''
+                    SELECT source_id, COUNT(*) FROM seen_articles
+                    WHERE source_id IN ({placeholders}) AND inserted_at > datetime('now', '-24 hours')
+                    GROUP BY source_id
+                ''', source_ids)
+                recent = {row[0]: row[1] for row in cursor.fetchall()}
+
+        return {
+            source_id: {
+                'recent_articles': recent.get(source_id, 0),
+                'published_posts': by_source.get(source_id, {}).get('PUBLISHED', 0),
+            }
+            for source_id in source_ids
+        }
+
+
+def _parse_timestamp(value: Optional[str]) -> Optional[datetime]:
+    """Parses SQLite timestamps, with or without milliseconds (stored as UTC)."""
+    if not value:
+        return None
+    try:
+        return datetime.fromisoformat(value)
+    except (ValueError, TypeError):
+        logger.warning(f"Unparseable timestamp in database: {value!r}")
+        return None
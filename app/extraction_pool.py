@@ -0,0 +1,275 @@
+"""
+Article extraction in a pool of warm worker processes.
+
+Each worker imports the extractor (compiled site rules, trafilatura) and builds
+one ContentExtractor when it starts, then serves URLs over a pipe. The parent
+gives every article a wall-clock deadline: a worker that overruns it is killed
+and replaced, so a pathological page costs one article, not the pipeline
+thread. Workers are also replaced after `max_tasks_per_worker` articles or once
+their peak RSS passes `max_rss_mb`, which bounds leaks and bloat in the HTML stack.
+"""
+
+import atexit
+import logging
+import multiprocessing
+import sys
+import threading
+import time
+from collections import deque
+from multiprocessing.connection import wait
+from typing import Any, Callable, Deque, Dict, Iterable, List, Optional
+
+from .config import EXTRACTION_CONFIG
+from .extractor import ContentExtractor
+
+logger = logging.getLogger(__name__)
+
+
+# Workers that die before reporting ready, per pool slot, before the pool gives up.
+MAX_START_FAILURES = 3
+
+
+def _peak_rss_bytes() -> int:
+    """Peak resident memory of this process (0 where the resource module is missing)."""
+    try:
+        import resource
+    except ImportError:  # Windows
+        return 0
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak if sys.platform == 'darwin' else peak * 1024
+
+
+def _worker_main(conn, extractor_factory: Callable[[], Any]) -> None:
+    """Worker loop: receives (url, profile), sends back (url, result, error, peak_rss); url None means ready."""
+    logging.basicConfig(
+        level=logging.INFO,
+        format='%(asctime)s - %(name)s[extraction worker %(process)d] - %(levelname)s - %(message)s',
+    )
+    extractor = extractor_factory()
+    conn.send((None, None, None, _peak_rss_bytes()))
+    while True:
+        try:
+            task = conn.recv()
+        except (EOFError, OSError):
+            break
+        if task is None:
+            break
+        url, profile = task
+        result, error = None, None
+        try:
+            result = extractor.extract(url, profile=profile)
+        except Exception as e:
+            error = f"{type(e).__name__}: {e}"
+        conn.send((url, result, error, _peak_rss_bytes()))
+    # Recycled or shut down cleanly: flush what the extractor buffered (learned selectors).
+    close = getattr(extractor, 'close', None)
+    if close is not None:
+        close()
+    conn.close()
+
+
+class _Worker:
+    """Parent-side handle of one worker process."""
+
+    def __init__(self, ctx, extractor_factory: Callable[[], Any]):
+        self.conn, child_conn = ctx.Pipe()
+        self.process = ctx.Process(target=_worker_main, args=(child_conn, extractor_factory), daemon=True)
+        self.process.start()
+        child_conn.close()
+        self.ready = False
+        self.tasks = 0
+        self.url: Optional[str] = None
+        self.deadline = 0.0
+
+    def send(self, url: str, profile: Optional[str], timeout_seconds: float) -> None:
+        self.conn.send((url, profile))
+        self.url = url
+        self.deadline = time.monotonic() + timeout_seconds
+
+    def stop(self, kill: bool = False) -> None:
+        if not kill:
+            try:
+                self.conn.send(None)
+            except (OSError, ValueError):
+                kill = True
+            self.process.join(timeout=5)
+        if kill or self.process.is_alive():
+            self.process.kill()
+            self.process.join(timeout=5)
+        self.conn.close()
+
+
+class ExtractionPool:
+    """
+    Runs ContentExtractor.extract() in worker processes.
+
+    `prefetch(urls)` queues a batch so every worker stays busy while the
+    pipeline thread handles earlier articles; `extract(url)` returns one result
+    (waiting for it if needed) and is a drop-in for ContentExtractor.extract().
+    Not thread-safe by design beyond an internal lock: one pipeline uses it.
+    """
+
+    def __init__(
+        self,
+        workers: int = EXTRACTION_CONFIG['pool_workers'],
+        timeout_seconds: float = EXTRACTION_CONFIG['timeout_seconds'],
+        max_tasks_per_worker: int = EXTRACTION_CONFIG['max_tasks_per_worker'],
+        max_rss_mb: int = EXTRACTION_CONFIG['max_worker_rss_mb'],
+        extractor_factory: Callable[[], Any] = ContentExtractor,
+    ):
+        methods = multiprocessing.get_all_start_methods()
+        # forkserver: workers fork from a clean, preloaded server instead of from
+        # the scheduler process and its threads/SQLite connections.
+        self._ctx = multiprocessing.get_context('forkserver' if 'forkserver' in methods else 'spawn')
+        if 'forkserver' in methods:
+            self._ctx.set_forkserver_preload(['app.extractor'])
+        self.size = max(1, workers)
+        self.timeout_seconds = timeout_seconds
+        self.max_tasks_per_worker = max_tasks_per_worker
+        self.max_rss_bytes = max_rss_mb * 1024 * 1024
+        self.extractor_factory = extractor_factory
+        self._in_process = None  # Used instead of the workers if they cannot start
+        self._start_failures = 0
+        self._workers: List[_Worker] = []
+        self._queue: Deque[str] = deque()
+        self._profiles: Dict[str, Optional[str]] = {}  # Extraction profile of each queued URL
+        self._results: Dict[str, Optional[Dict[str, Any]]] = {}
+        self._lock = threading.Lock()
+        self.timeouts = 0
+        self.recycled = 0
+
+    def start(self) -> None:
+        """Starts the workers; they warm up (imports, extractor) in the background."""
+        with self._lock:
+            while self._in_process is None and len(self._workers) < self.size:
+                self._workers.append(_Worker(self._ctx, self.extractor_factory))
+
+    def prefetch(self, urls: Iterable[str], profile: Optional[str] = None) -> None:
+        """
+        Queues a batch of URLs for extraction ahead of the calls to `extract()`.
+        Results and queued URLs of the previous batch that were never asked for are dropped.
+        """
+        with self._lock:
+            self._queue.clear()
+            self._profiles.clear()
+            self._results.clear()
+            for url in urls:
+                if url and url not in self._results and url not in self._queue and not self._in_flight(url):
+                    self._queue.append(url)
+                    self._profiles[url] = profile
+        self.start()
+        with self._lock:
+            self._dispatch()
+
+    def extract(self, url: str, profile: Optional[str] = None) -> Optional[Dict[str, Any]]:
+        """Returns the extraction of `url`, or None on failure or timeout."""
+        self.start()
+        with self._lock:
+            if self._in_process is not None:
+                return self._in_process.extract(url, profile=profile)
+            if url not in self._results and not self._in_flight(url):
+                if url in self._queue:
+                    self._queue.remove(url)
+                self._queue.appendleft(url)
+                # A URL prefetched with its feed's profile keeps it when asked for without one.
+                self._profiles[url] = profile if profile is not None else self._profiles.get(url)
+            while url not in self._results:
+                if self._in_process is not None:
+                    return self._in_process.extract(url, profile=profile)
+                self._dispatch()
+                self._collect()
+            return self._results.pop(url)
+
+    def close(self) -> None:
+        with self._lock:
+            for worker in self._workers:
+                worker.stop(kill=worker.url is not None)
+            self._workers.clear()
+            self._queue.clear()
+            self._profiles.clear()
+            self._results.clear()
+
+    def _in_flight(self, url: str) -> bool:
+        return any(worker.url == url for worker in self._workers)
+
+    def _dispatch(self) -> None:
+        for worker in self._workers:
+            if not self._queue:
+                return
+            if worker.ready and worker.url is None:
+                url = self._queue.popleft()
+                worker.send(url, self._profiles.pop(url, None), self.timeout_seconds)
+
+    def _collect(self) -> None:
+        """Waits for the next worker message or deadline and handles it."""
+        busy = [w for w in self._workers if w.url is not None]
+        now = time.monotonic()
+        timeout = min((w.deadline for w in busy), default=now + 1.0) - now
+        ready = wait([w.conn for w in self._workers], timeout=max(0.0, timeout))
+
+        for worker in list(self._workers):
+            if self._in_process is not None:
+                return
+            if worker.conn in ready:
+                try:
+                    url, result, error, rss = worker.conn.recv()
+                except (EOFError, OSError):
+                    self._worker_died(worker)
+                    continue
+                if url is None:
+                    worker.ready = True
+                    self._start_failures = 0
+                    continue
+                if error:
+                    logger.error(f"Extraction failed in worker for {url}: {error}")
+                self._finish(worker, result)
+                worker.tasks += 1
+                if worker.tasks >= self.max_tasks_per_worker or rss > self.max_rss_bytes:
+                    logger.info(f"Recycling extraction worker {worker.process.pid} after {worker.tasks} "
+                                f"articles ({rss // (1024 * 1024)} MB RSS).")
+                    self._replace(worker)
+            elif worker.url is not None and time.monotonic() >= worker.deadline:
+                logger.error(f"Extraction of {worker.url} exceeded {self.timeout_seconds}s; killing worker "
+                             f"{worker.process.pid}.")
+                self.timeouts += 1
+                self._finish(worker, None)
+                self._replace(worker, kill=True)
+
+    def _worker_died(self, worker: _Worker) -> None:
+        if worker.url is not None:
+            logger.error(f"Extraction worker {worker.process.pid} died while extracting {worker.url}.")
+            self._finish(worker, None)
+        elif not worker.ready:
+            self._start_failures += 1
+            if self._start_failures >= MAX_START_FAILURES * self.size:
+                logger.error("Extraction workers keep dying on start-up; extracting in-process instead.")
+                for w in self._workers:
+                    w.stop(kill=True)
+                self._workers.clear()
+                self._in_process = self.extractor_factory()
+                return
+        self._replace(worker, kill=True)
+
+    def _finish(self, worker: _Worker, result: Optional[Dict[str, Any]]) -> None:
+        self._results[worker.url] = result
+        worker.url = None
+
+    def _replace(self, worker: _Worker, kill: bool = False) -> None:
+        worker.stop(kill=kill)
+        self._workers[self._workers.index(worker)] = _Worker(self._ctx, self.extractor_factory)
+        self.recycled += 1
+
+
+_pool: Optional[ExtractionPool] = None
+
+
+def get_extraction_pool() -> Optional[ExtractionPool]:
+    """The process-wide pool, or None when EXTRACTION_CONFIG['pool_workers'] is 0."""
+    global _pool
+    if EXTRACTION_CONFIG['pool_workers'] <= 0:
+        return None
+    if _pool is None:
+        _pool = ExtractionPool()
+        _pool.start()
+        atexit.register(_pool.close)
+    return _pool
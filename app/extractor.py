@@ -1,7 +1,8 @@
 import logging
 import trafilatura
 from bs4 import BeautifulSoup
-from bs4 import Tag, BeautifulSoup
+from bs4 import Tag, BeautifulSoup, NavigableString
+from bs4.element import PreformattedString
 import requests
 import random
 import html
@@ -11,10 +12,14 @@ import re
 import os
 import time
 from urllib.parse import urljoin, urlparse, parse_qs
-from requests.adapters import HTTPAdapter
-from urllib3.util.retry import Retry
-from .html_utils import normalize_images_with_captions, convert_twitter_embeds_to_oembed, remove_lance_widgets, _remove_related_content_blocks
-from .config import USER_AGENT
+from .html_utils import normalize_image_containers, convert_twitter_embeds_to_oembed, _remove_related_content_blocks
+from .config import USER_AGENT, HTML_CACHE_CONFIG, LEARNED_SELECTORS_CONFIG, EXTRACTION_CONFIG, FETCH_STRATEGY_MEMORY
+from .html_cache import HtmlCache
+from .html_fetch import PartialHtml, read_html
+from .http_retry import create_session, get_shared_session
+from .learned_selectors import LearnedSelectors, domain_of, stable_selector
+from .lookup_cache import LookupCache
+from .site_rules import VIDEO_HOSTS, rules_for_url
 from trafilatura.metadata import extract_metadata as trafilatura_extract_metadata # New import
 
 logger = logging.getLogger(__name__)
@@ -25,6 +30,27 @@ DEFAULT_UA_LIST = [
     "Mozilla/5.0 (X11; Linux x86_64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/118.0.0.0 Safari/537.36",
 ]
 
+# --- Fetch strategies ---
+# Formas de baixar a página, na ordem padrão: cabeçalhos de navegador com UA
+# rotativo, cabeçalhos mínimos com UA fixo e o fetcher do trafilatura. Só um 403
+# faz passar para a próxima. Por host, a estratégia que funcionou é tentada
+# primeiro; a decisão não é renovada enquanto funciona, então expira com o TTL
+# e o host volta à ordem padrão.
+FETCH_STRATEGIES = ('browser', 'minimal', 'trafilatura')
+FETCH_STRATEGY_CACHE = LookupCache(**FETCH_STRATEGY_MEMORY)
+
+
+def _strategy_headers(strategy: str) -> Dict[str, str]:
+    if strategy == 'minimal':
+        return {"User-Agent": USER_AGENT, "Accept": "text/html,application/xhtml+xml"}
+    return {
+        "User-Agent": random.choice(DEFAULT_UA_LIST),
+        "Accept-Language": "pt-BR,pt;q=0.9,en;q=0.8",
+        "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8",
+        "Referer": "https://www.google.com/",
+        "Cache-Control": "no-cache",
+    }
+
 
 def _coerce_url(candidate: Any) -> Optional[str]:
     """
@@ -92,12 +118,7 @@ BAD_IMAGE_DOMAINS = {
 }
 
 # ---- Media/host filters (from user request) ----
-VIDEO_HOSTS = (
-    "youtube.com", "youtu.be", "player.vimeo.com", "vimeo.com",
-    "dailymotion.com", "player.dailymotion.com", "jwplayer", "brightcove",
-    "spotify.com", "soundcloud.com", "tiktok.com", "embed", "iframe",
-    "globo.com/play", "globoplay.globo.com", "tv.uol.com.br", "video"
-)
+# VIDEO_HOSTS vem de site_rules, que também o usa nas regras do GE.
 
 IMAGE_BLACKLIST_PATTERNS = (
     "sprite", "icon", "favicon", "logo", "placehold", "placeholder",
@@ -160,6 +181,19 @@ FORBIDDEN_LABELS: Set[str] = {
     "Producer", "Producers", "Cast"
 }
 
+# Um rótulo no início de uma linha, seguido de ':' ou do fim da linha.
+FORBIDDEN_LABEL_LINE_RX = re.compile(
+    r"^[ \t]*(" + "|".join(re.escape(lbl) for lbl in sorted(FORBIDDEN_LABELS, key=len, reverse=True)) + r")[ \t]*(?::|$)",
+    re.I | re.M,
+)
+FORBIDDEN_BLOCK_TAGS = frozenset({"div", "section", "aside", "ul", "ol"})
+FORBIDDEN_LINE_TAGS = frozenset({"p", "li", "span", "h3", "h4"})
+# Uma ficha técnica é curta e só tem linhas curtas; senão o bloco é o próprio artigo.
+INFOBOX_MAX_CHARS = 600
+INFOBOX_MAX_LINE = 120
+# Só textos até este tamanho podem ser iguais a um rótulo/texto proibido.
+FORBIDDEN_SHORT_TEXT_LIMIT = max(map(len, FORBIDDEN_LABELS | FORBIDDEN_TEXT_EXACT)) + 64
+
 JUNK_IMAGE_PATTERNS = (
     "placeholder", "sprite", "icon", "emoji", ".svg",
     # From user suggestion to filter out non-content images
@@ -181,23 +215,11 @@ RELATED_CLASS_RE = re.compile(r'(relacionad|mais[- ]noticia|card|carousel)', re.
 
 def _lance_cleaner(soup: BeautifulSoup) -> Tag:
     """
-    Isola o corpo do artigo em páginas do Lance.com.br, removendo lixo
-    global mas preservando embeds de redes sociais DENTRO do corpo do artigo.
+    Isola o corpo do artigo em páginas do Lance.com.br. O lixo global (cabeçalho,
+    rodapé, carrosséis, placeholders de publicidade) já saiu pelas regras de
+    site_rules; embeds de redes sociais DENTRO do corpo do artigo são preservados.
     """
-    # 1) Remover lixo global (cabeçalho, rodapé, carrosséis, etc.)
-    for sel in [
-        "header", "footer", "nav", "template", "script", "style", "svg",
-    ]:
-        for el in soup.select(sel): el.decompose()
-    remove_lance_widgets(soup)
-
-    # 3) Remover placeholders de publicidade
-    for t in soup.find_all(string=re.compile(r'continua\s+após\s+a\s+publicidade', re.I)):
-        parent = t.find_parent()
-        if parent:
-            parent.decompose()
-
-    # 4) Achar um container que de fato é o artigo
+    # 1) Achar um container que de fato é o artigo
     h1 = soup.find("h1")
     body_root = None
     candidates = []
@@ -216,53 +238,13 @@ def _lance_cleaner(soup: BeautifulSoup) -> Tag:
     pools = sorted(set(pools), key=lambda n: len(n.find_all("p")), reverse=True)
     body_root = pools[0] if pools else soup
 
-    # 5) Remover linhas de crédito soltas dentro do corpo do artigo
+    # 2) Remover linhas de crédito soltas dentro do corpo do artigo
     for el in body_root.find_all(string=re.compile(r"continua.*publicidade|texto:|fonte:|crédito:|credito:", re.I)):
         if isinstance(el, str) and el.parent and len(el.parent.get_text(strip=True)) < 50:
             el.parent.decompose()
 
     return body_root
 
-def _ge_cleaner(soup: BeautifulSoup) -> None:
-    """
-    Cleans GE (Globo Esporte) pages by removing video players, playlists,
-    ads, and other non-content blocks. Modifies the soup in-place.
-    """
-    logger.info("Applying GE-specific DOM cleaning.")
-    
-    blocked_selectors = [
-        # Playlists and multicontent blocks (GE)
-        "div.show-multicontent-playlist-container",
-        "[data-block-type='playlist']",
-        "[data-track-category='multicontent'][data-track-action*='playlist']",
-        # Video players and wrappers (GE)
-        "article.content-video",
-        "div.cxm-video-block.content-video",
-        "div.content-media.content-video",
-        "div.content-video__video",
-        "div.poster.poster--hidden",
-        # Generic iframes/players
-        "iframe", "bs-player", "amp-iframe", "figure[class*='video']",
-        "div[class*='video']",
-        # Ads (GE)
-        "div.content-ads", "glb-ad",
-        # Text-based CTAs (GE)
-        "div.mc-column.content-text[data-block-type='unstyled']"
-    ]
-    for sel in blocked_selectors:
-        for el in soup.select(sel):
-            el.decompose()
-
-    for p in soup.find_all(["p", "div"]):
-        text = (p.get_text(" ", strip=True) or "").lower()
-        if any(x in text for x in ("podcast ge corinthians", "assista: tudo sobre", "assista tudo sobre")):
-            p.decompose()
-
-    for img in soup.find_all("img"):
-        src = (img.get("src") or "") + (img.get("data-src") or "")
-        if any(h in src for h in VIDEO_HOSTS):
-            img.decompose()
-
 def _parse_srcset(srcset: str):
     """Retorna a URL com maior largura declarada em um srcset."""
     best = None
@@ -382,34 +364,100 @@ def _extract_from_style(style_attr: str) -> Optional[str]:
     return m.group(2) if m else None
 
 
+# Equivalente a select("article .entry-content, article .content, article [itemprop='articleBody'],
+# .post-content, .single-content, .post-body, [itemprop='articleBody'], .article-body,
+# .article-content, article"), avaliado na mesma passada da pontuação.
+_BODY_CLASSES = frozenset({"post-content", "single-content", "post-body", "article-body", "article-content"})
+_BODY_CLASSES_IN_ARTICLE = frozenset({"entry-content", "content"})
+_BODY_INDEX_ATTR = '_article_body_index'
+
+def _root_document(node: Union[BeautifulSoup, Tag]) -> Union[BeautifulSoup, Tag]:
+    while node.parent is not None:
+        node = node.parent
+    return node
+
+def _article_body_index(soup: Union[BeautifulSoup, Tag]) -> Dict[str, Any]:
+    """
+    Indexa o documento inteiro numa passada de cima para baixo (quem casa com os
+    seletores de corpo) e outra de baixo para cima (quantos <p> + <figure> cada nó
+    contém e onde termina sua subárvore), ambas O(n). O índice é memoizado no
+    documento e compartilhado por todas as chamadas de _find_article_body;
+    quem altera a estrutura da árvore deve chamar _forget_article_body_index.
+    """
+    doc = _root_document(soup)
+    # vars(): Tag.__getattr__ transformaria um atributo ausente num find().
+    index = vars(doc).get(_BODY_INDEX_ATTR)
+    if index is not None:
+        return index
+
+    tags = [doc] + doc.find_all(True)
+    n = len(tags)
+    pos = {id(tag): i for i, tag in enumerate(tags)}
+    parents = [-1] * n
+    in_article = [False] * n
+    selected = [False] * n
+    for i in range(1, n):
+        tag = tags[i]
+        p = parents[i] = pos.get(id(tag.parent), -1)
+        inside = in_article[i] = p >= 0 and (in_article[p] or tags[p].name == "article")
+        classes = tag.get("class") or ()
+        if isinstance(classes, str):
+            classes = classes.split()
+        selected[i] = (
+            tag.name == "article"
+            or tag.get("itemprop") == "articleBody"
+            or not _BODY_CLASSES.isdisjoint(classes)
+            or (inside and not _BODY_CLASSES_IN_ARTICLE.isdisjoint(classes))
+        )
+
+    scores = [0] * n
+    sizes = [0] * n
+    # Ordem de documento invertida: filhos sempre antes dos pais.
+    for i in range(n - 1, 0, -1):
+        p = parents[i]
+        if p >= 0:
+            scores[p] += scores[i] + (tags[i].name in ("p", "figure"))
+            sizes[p] += sizes[i] + 1
+
+    index = {'tags': tags, 'pos': pos, 'sizes': sizes, 'scores': scores, 'selected': selected}
+    setattr(doc, _BODY_INDEX_ATTR, index)
+    return index
+
+def _forget_article_body_index(soup: Union[BeautifulSoup, Tag]) -> None:
+    """Descarta o índice memoizado depois de mudanças estruturais na árvore."""
+    vars(_root_document(soup)).pop(_BODY_INDEX_ATTR, None)
+
 def _find_article_body(soup: BeautifulSoup) -> BeautifulSoup:
     """
     Tenta localizar o nó raiz do corpo do artigo.
     - Prefere seletores comuns (article body/content)
     - Evita nós com classes/ids que casem _BAD_SECTION_RX
     - Fallback: nó com mais <p> + <figure>
-    """    
-    # Enhanced with user suggestions for more specific content containers
-    candidates = soup.select(
-        "article .entry-content, article .content, article [itemprop='articleBody'], "
-        ".post-content, .single-content, .post-body, "
-        "[itemprop='articleBody'], .article-body, .article-content, " # Original selectors
-        "article" # Fallback
-    )
-    if not candidates:
-        candidates = soup.find_all(True)
+    """
+    index = _article_body_index(soup)
+    start = index['pos'].get(id(soup))
+    if start is None:
+        # Nó criado depois da memoização: a árvore mudou, reindexa.
+        _forget_article_body_index(soup)
+        index = _article_body_index(soup)
+        start = index['pos'][id(soup)]
+
+    # Os descendentes de um nó são contíguos na ordem de documento.
+    subtree = range(start + 1, start + 1 + index['sizes'][start])
+    selected, tags, scores = index['selected'], index['tags'], index['scores']
+    candidates = [i for i in subtree if selected[i]] or subtree
 
     best, best_score = None, -1
-    for c in candidates:
+    for i in candidates:
+        c = tags[i]
         classes = " ".join(c.get("class", [])) + " " + (c.get("id") or "")
         if _BAD_SECTION_RX.search(classes):
             continue
         # Evita wrappers muito genéricos do site
         if c.name in ("header", "footer", "nav", "aside"):
             continue
-        score = len(c.find_all("p")) + len(c.find_all("figure"))
-        if score > best_score:
-            best, best_score = c, score
+        if scores[i] > best_score:
+            best, best_score = c, scores[i]
     return best or soup
 
 LEGEND_SELECTORS = [
@@ -436,6 +484,39 @@ def _find_caption_for_image(img_tag: Tag) -> Optional[str]:
                 return cap_node.get_text(" ", strip=True)
     return None
 
+# --- Extraction profiles ---
+# Selecionáveis por feed (RSS_FEEDS[...]['extraction_profile']); o padrão vem de EXTRACTION_CONFIG.
+#   trafilatura  opções de precisão/recall; fast=True dispensa os extratores de fallback do trafilatura
+#   shortcuts    se o atalho do JSON-LD e os seletores aprendidos podem dispensar o trafilatura
+# A coleta de imagens roda inteira em todos os perfis: cortar estratégias perdia
+# imagens sem economizar CPU mensurável.
+EXTRACTION_PROFILES: Dict[str, Dict[str, Any]] = {
+    'fast': {
+        'trafilatura': {'fast': True, 'favor_precision': True},
+        'shortcuts': True,
+    },
+    'balanced': {
+        'trafilatura': {},
+        'shortcuts': True,
+    },
+    # Referência de qualidade: sempre o caminho completo, com recall máximo.
+    'thorough': {
+        'trafilatura': {'favor_recall': True},
+        'shortcuts': False,
+    },
+}
+
+
+def get_extraction_profile(name: Optional[str] = None) -> Dict[str, Any]:
+    """O perfil `name` (ou o padrão da configuração); nomes desconhecidos caem no 'balanced'."""
+    name = name or EXTRACTION_CONFIG['default_profile']
+    profile = EXTRACTION_PROFILES.get(name)
+    if profile is None:
+        logger.warning(f"Unknown extraction profile {name!r}; using 'balanced'.")
+        profile = EXTRACTION_PROFILES['balanced']
+    return profile
+
+
 def collect_images_from_article(soup: BeautifulSoup, base_url: str) -> List[Dict[str, str]]:
     """
     Coleta URLs de imagens relevantes SOMENTE DO CORPO DO ARTIGO.
@@ -485,16 +566,18 @@ def collect_images_from_article(soup: BeautifulSoup, base_url: str) -> List[Dict
             _push(cand, alt=alt_text, caption=caption_text)
 
     # 2.5) <noscript> com <img> (fallback de lazy-load)
-    for ns in root.find_all("noscript"):
+    # O lxml já transforma o conteúdo do <noscript> em tags (cobertas no passo 1);
+    # os que chegam como texto são juntados e parseados uma única vez.
+    noscript_html = "".join(ns.string for ns in root.find_all("noscript") if ns.string)
+    if noscript_html:
         try:
-            inner = BeautifulSoup(ns.string or "", "html.parser")
-            for img in inner.find_all("img"):
+            for img in BeautifulSoup(noscript_html, "html.parser").find_all("img"):
                 cand = img.get("src") or img.get("data-src") or img.get("data-original")
                 alt_text = img.get('alt', '').strip()
                 # Não é possível buscar legenda aqui de forma confiável, então deixamos em branco
                 _push(cand, alt=alt_text, caption="")
         except Exception:
-            continue
+            pass
 
     # 3) nós com data-* comuns
     for node in root.select('[data-img-url], [data-image], [data-src], [data-original]'):
@@ -532,18 +615,11 @@ def collect_images_from_article(soup: BeautifulSoup, base_url: str) -> List[Dict
     
     return sorted(final_list, key=get_pref)
 # --- New helper functions from user prompt ---
-def _get(url, timeout=25, tries=2):
-    last_err = None
-    for _ in range(tries):
-        try:
-            r = requests.get(url, headers={"User-Agent": USER_AGENT}, timeout=timeout, allow_redirects=True)
-            if 200 <= r.status_code < 300 and "text/html" in r.headers.get("Content-Type",""):
-                return r
-        except Exception as e:
-            last_err = e
-        time.sleep(0.6)
-    if last_err:
-        raise last_err
+def _get(url, timeout=25):
+    # Retries come from the shared policy (http_retry) and its per-host budget.
+    r = get_shared_session().get(url, headers={"User-Agent": USER_AGENT}, timeout=timeout, allow_redirects=True)
+    if 200 <= r.status_code < 300 and "text/html" in r.headers.get("Content-Type",""):
+        return r
     raise RuntimeError(f"HTTP error fetching {url}")
 
 def _clean_text(s):
@@ -609,7 +685,8 @@ def _choose_best(a, b):
         out[k] = a.get(k) or b.get(k)
     return out
 
-def _extract_site_specific(soup: BeautifulSoup, url: str, selectors: Dict[str, Union[str, List[str]]]) -> Optional[Dict[str, Any]]:
+def _extract_site_specific(soup: BeautifulSoup, url: str, selectors: Dict[str, Union[str, List[str]]],
+                           extractor: Optional['ContentExtractor'] = None) -> Optional[Dict[str, Any]]:
     """
     Helper for site-specific extraction using a dictionary of CSS selectors.
     Falls back gracefully by returning None if key elements are not found.
@@ -635,7 +712,8 @@ def _extract_site_specific(soup: BeautifulSoup, url: str, selectors: Dict[str, U
 
         # Use existing helpers for media and metadata
         # Note: These helpers operate on the *original* soup object to find meta tags, etc.
-        extractor = ContentExtractor() # Temporary instance to access helpers
+        # Helpers only: reuse the caller's extractor instead of opening another session.
+        extractor = extractor or ContentExtractor()
         featured_image_url = extractor._pick_featured_image(soup, url)
         images = collect_images_from_article(soup, url) # This also uses its own logic to find the body
         videos = extractor._extract_youtube_videos(soup)
@@ -695,105 +773,275 @@ def _find_news_article_in_json_ld(json_ld_data: List[Dict[str, Any]]) -> Optiona
                 return item
     return None
 
+# --- JSON-LD fast path ---
+# Tamanho mínimo do articleBody para montar a matéria só pelo schema, sem trafilatura.
+JSON_LD_BODY_MIN_CHARS = 800
+# articleBody com marcação HTML não é texto puro: fica com o caminho genérico.
+_JSON_LD_MARKUP_RX = re.compile(r"<\s*/?\s*(p|br|div|h[1-6]|figure|img|a)\b", re.I)
+# A cada N tentativas, o extrator registra no log o resumo das estatísticas do atalho.
+JSON_LD_STATS_LOG_EVERY = 50
+
+
+def _json_ld_images(schema: Dict[str, Any], base_url: str) -> List[Dict[str, str]]:
+    """Imagens de `image` e `associatedMedia` do schema, no formato de collect_images_from_article."""
+    images: List[Dict[str, str]] = []
+    seen: Set[str] = set()
+
+    def _walk(node: Any) -> None:
+        if isinstance(node, list):
+            for item in node:
+                _walk(item)
+            return
+        caption = ''
+        if isinstance(node, str):
+            src = node
+        elif isinstance(node, dict) and node.get('@type', 'ImageObject') == 'ImageObject':
+            src = _coerce_url(node.get('contentUrl') or node.get('url'))
+            caption = node.get('caption') or node.get('description') or ''
+        else:
+            return  # VideoObject, AudioObject...
+        abs_u = _abs(src, base_url) if src else None
+        if not abs_u or not is_valid_article_image(abs_u) or abs_u.rstrip('/') in seen:
+            return
+        seen.add(abs_u.rstrip('/'))
+        images.append({
+            "src": abs_u.rstrip('/'),
+            "alt": '',
+            "caption": _clean_text(caption) if isinstance(caption, str) else '',
+        })
+
+    _walk(schema.get('image'))
+    _walk(schema.get('associatedMedia'))
+    return images
+
+
+def _extract_from_json_ld_body(soup: BeautifulSoup, url: str,
+                               extractor: 'ContentExtractor') -> Optional[Dict[str, Any]]:
+    """
+    Monta a matéria direto do NewsArticle do JSON-LD (headline, articleBody,
+    image/associatedMedia), sem limpeza nem trafilatura. Retorna None quando o
+    schema não traz um corpo em texto puro com ao menos JSON_LD_BODY_MIN_CHARS.
+    """
+    schema = _find_news_article_in_json_ld(_extract_json_ld(soup))
+    if not schema:
+        return None
+    title = schema.get('headline') or schema.get('name')
+    body = schema.get('articleBody')
+    if not isinstance(title, str) or not title.strip() or not isinstance(body, str):
+        return None
+    if len(body.strip()) < JSON_LD_BODY_MIN_CHARS or _JSON_LD_MARKUP_RX.search(body):
+        return None
+
+    paragraphs = [_clean_text(p) for p in re.split(r"\n+", body)]
+    content_html = "".join(f"<p>{html.escape(p, quote=False)}</p>" for p in paragraphs if p)
+
+    images = _json_ld_images(schema, url)
+    featured_image_url = extractor._pick_featured_image(soup, url) or (images[0]['src'] if images else None)
+    description = schema.get('description')
+    return {
+        "title": _clean_text(title),
+        "content": content_html,
+        "excerpt": description.strip() if isinstance(description, str) else '',
+        "featured_image_url": featured_image_url,
+        "images": [img for img in images if img['src'] != featured_image_url],
+        "videos": extractor._extract_youtube_videos(soup),
+        "source_url": url,
+        "schema_original": schema,
+    }
+
+# --- Learned content roots ---
+# Validação barata do nó apontado pelo seletor aprendido antes de dispensar o trafilatura.
+LEARNED_ROOT_MIN_CHARS = 400
+LEARNED_ROOT_MAX_LINK_DENSITY = 0.3
+# Só se confirma um seletor quando o trafilatura aproveitou ao menos esta fração do texto do nó.
+LEARNED_ROOT_MIN_COVERAGE = 0.6
+LEARNED_ROOT_DROP_TAGS = ("script", "style", "noscript", "template", "iframe", "form", "button",
+                          "input", "select", "nav", "aside", "header", "footer", "svg")
+LEARNED_ROOT_KEEP_ATTRS = frozenset({"href", "src", "alt", "title"})
+
+
+def _looks_like_article_root(node: Tag) -> bool:
+    """Texto suficiente, ao menos dois parágrafos e pouco texto em links."""
+    text_len = len(node.get_text(" ", strip=True))
+    if text_len < LEARNED_ROOT_MIN_CHARS or len(node.find_all("p", limit=2)) < 2:
+        return False
+    link_len = sum(len(a.get_text(" ", strip=True)) for a in node.find_all("a"))
+    return link_len <= LEARNED_ROOT_MAX_LINK_DENSITY * text_len
+
+
+def _strip_to_content(root: Tag) -> None:
+    """Limpa o nó aprendido como o trafilatura faria: sem widgets, scripts nem atributos de layout."""
+    for tag in root.find_all(LEARNED_ROOT_DROP_TAGS):
+        if not tag.decomposed:
+            tag.decompose()
+    for tag in [root, *root.find_all(True)]:
+        tag.attrs = {k: v for k, v in tag.attrs.items() if k in LEARNED_ROOT_KEEP_ATTRS}
+
 # --- New constants for related content removal ---
 LEIA_HEADING_RE = re.compile(r"(leia também|veja também|relacionad[oa]s|recomendad[oa]s|tópicos relacionados)", re.I)
 
-# Site-specific rules for related content
-SITE_SPECIFIC_RELATED_SELECTORS = {
-    "infomoney.com.br": [
-        ".single__related", ".article__related", ".post-related", ".related-posts",
-        ".rm-related", ".block-related", ".single__sidebar", ".article__sidebar",
-        "section.single__see-also", ".wp-block-infomoney-blocks-infomoney-read-more",
-    ],
-    "estadao.com.br": [
-        ".links-relacionados", ".mat-relacionadas", ".es-relacionadas",
-        ".stories-related", ".see-also", ".link-relacionado", ".box-relacionadas",
-    ],
-}
-
 # --- Site-specific Cleaner Registry ---
+# Lógica que não cabe nas regras declarativas de site_rules, pelo mesmo domínio.
 CLEANER_REGISTRY = {
     'lance.com.br': _lance_cleaner,
-    'ge.globo.com': _ge_cleaner,
 }
 
 
 class ContentExtractor:
     """Extrai e limpa conteúdo para o pipeline."""
-    def __init__(self):
+    def __init__(self, html_cache: Optional[HtmlCache] = None,
+                 learned_selectors: Optional[LearnedSelectors] = None):
         self.session = self._session_with_retries()
+        # Every page fetch goes through the disk cache, so retried articles are not downloaded again.
+        if html_cache is None and HTML_CACHE_CONFIG['enabled']:
+            html_cache = HtmlCache()
+        self.html_cache = html_cache
+        # Content roots learned per domain let the generic path skip trafilatura.
+        if learned_selectors is None and LEARNED_SELECTORS_CONFIG['enabled']:
+            learned_selectors = LearnedSelectors()
+        self.learned_selectors = learned_selectors
+        # Atalho do JSON-LD: tentativas/acertos e CPU (s) de cada caminho, para medir o ganho.
+        self.json_ld_stats = {'attempts': 0, 'hits': 0, 'fast_cpu': 0.0, 'generic_runs': 0, 'generic_cpu': 0.0}
+
+    def close(self) -> None:
+        """Writes out the learned selector counts still buffered."""
+        if self.learned_selectors:
+            self.learned_selectors.close()
 
     def _session_with_retries(self) -> requests.Session:
-        s = requests.Session()
-        retries = Retry(total=3, backoff_factor=0.6, status_forcelist=(403, 429, 500, 502, 503, 504))
-        adapter = HTTPAdapter(max_retries=retries)
-        s.mount("https://", adapter)
-        s.mount("http://", adapter)
-        return s
+        # Shared policy: 5xx/429 retried within the host's budget; 403 is a refusal,
+        # not a transient error, so _download_html switches strategy instead.
+        return create_session()
 
     def _fetch_html(self, url: str) -> Optional[str]:
-        """Busca o HTML da URL com retries e fallback."""
-        headers = {
-            "User-Agent": random.choice(DEFAULT_UA_LIST),
-            "Accept-Language": "pt-BR,pt;q=0.9,en;q=0.8",
-            "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8",
-            "Referer": "https://www.google.com/",
-            "Cache-Control": "no-cache",
-        }
+        """Busca o HTML da URL (cache em disco primeiro) com retries e fallback."""
+        if self.html_cache:
+            html = self.html_cache.get(url)
+            if html:
+                logger.info(f"HTML cache hit for {url}.")
+                return html
+        html = self._download_html(url)
+        # Partial reads (stopped at the end of the article or cut at the size cap) are
+        # not cached, so a truncated page is not served for the whole TTL.
+        if html and self.html_cache and not isinstance(html, PartialHtml):
+            self.html_cache.set(url, html)
+        return html
+
+    def _download_html(self, url: str) -> Optional[str]:
+        """
+        Baixa o HTML da URL tentando as FETCH_STRATEGIES, a última que funcionou
+        para o host primeiro. Só um 403 passa para a próxima estratégia; outros
+        erros encerram a tentativa. O corpo é lido em streaming (ver
+        html_fetch.read_html): com limite de tamanho e parando quando o artigo e
+        o JSON-LD já chegaram.
+        """
+        host = (urlparse(url).hostname or '').lower()
+        found, learned = FETCH_STRATEGY_CACHE.get(host)
+        order = [learned] if found and learned in FETCH_STRATEGIES else []
+        order += [strategy for strategy in FETCH_STRATEGIES if strategy not in order]
+        for strategy in order:
+            html, refused = self._fetch_with_strategy(strategy, url)
+            if html:
+                if strategy != learned:
+                    logger.info(f"Fetch strategy for {host} is now '{strategy}'.")
+                    FETCH_STRATEGY_CACHE.set(host, strategy)
+                return html
+            if not refused:
+                return None
+            logger.warning(f"Got 403 for {url} with the '{strategy}' fetch strategy; trying the next one.")
+        logger.error(f"Every fetch strategy was refused for {url}.")
+        return None
+
+    def _fetch_with_strategy(self, strategy: str, url: str) -> Tuple[Optional[str], bool]:
+        """Returns (html, refused); `refused` is True when the site answered 403."""
+        if strategy == 'trafilatura':
+            try:
+                # trafilatura.fetch_url might also fail
+                html = trafilatura.fetch_url(url)
+            except Exception as e:
+                logger.error(f"Trafilatura fetch failed for {url}: {e}")
+                html = None
+            return html, html is None
         try:
-            resp = self.session.get(url, headers=headers, timeout=20, allow_redirects=True)
+            resp = self.session.get(url, headers=_strategy_headers(strategy), timeout=20,
+                                    allow_redirects=True, stream=True)
+            if resp.status_code == 403:
+                resp.close()
+                return None, True
+            if not resp.ok:
+                resp.close()
             resp.raise_for_status()
-            return resp.text
-        except requests.HTTPError as e:
-            if e.response is not None and e.response.status_code == 403:
-                logger.warning(f"Got 403 for {url} with requests. Falling back to trafilatura.fetch_url().")
-                try:
-                    # trafilatura.fetch_url might also fail
-                    html = trafilatura.fetch_url(url)
-                    if html:
-                        logger.info(f"Successfully fetched {url} with trafilatura fallback.")
-                        return html
-                except Exception as te:
-                    logger.error(f"Trafilatura fallback also failed for {url}: {te}")
-            # Log original error if fallback fails or is not applicable
-            logger.error(f"Failed to fetch HTML from {url}: {e}")
-            return None
+            return read_html(resp), False
         except requests.RequestException as e:
             logger.error(f"Failed to fetch HTML from {url}: {e}")
-            return None
+            return None, False
 
     def _remove_forbidden_blocks(self, soup: BeautifulSoup) -> None:
-        """Remove infobox técnica e mensagens indesejadas do html extraído."""
-        for t in soup.find_all(string=True):
-            s = (t or "").strip()
-            if s and s in FORBIDDEN_TEXT_EXACT:
-                try:
-                    t.parent.decompose()
-                except Exception:
-                    pass
-
-        candidates = []
-        for tag in soup.find_all(["div", "section", "aside", "ul", "ol"]):
-            text = " ".join(tag.get_text(separator="\n").split())
-            lbl_count = sum(1 for lbl in FORBIDDEN_LABELS
-                            if re.search(rf"(^|\n)\s*{re.escape(lbl)}\s*(\n|:|$)", text, flags=re.I))
-            if lbl_count >= 2:
-                candidates.append(tag)
-        for c in candidates:
-            try:
-                c.decompose()
-            except Exception:
-                pass
+        """
+        Remove infobox técnica e mensagens indesejadas do html extraído.
+
+        Uma única passada de baixo para cima: cada nó recebe dos filhos o tamanho
+        do texto, os rótulos de ficha técnica que abrem linhas e (se curto) o
+        próprio texto, e é removido ali mesmo quando:
+        - tem um texto filho igual a FORBIDDEN_TEXT_EXACT;
+        - é div/section/aside/ul/ol curto com 2+ rótulos distintos (infobox);
+        - é p/li/span/h3/h4 cujo texto inteiro é um rótulo ou texto proibido.
+        Blocos removidos não contam para os ancestrais, então só o bloco mais
+        interno sai (e não o artigo que o contém); linhas-rótulo removidas
+        ainda repassam o rótulo, para a ficha que as contém ser detectada.
+        """
+        # id(tag) -> (tamanho do texto visível, maior linha, rótulos encontrados, texto bruto ou None se longo)
+        info: Dict[int, Tuple[int, int, frozenset, Optional[str]]] = {}
+        doomed: List[Tag] = []
+        for tag in reversed(soup.find_all(True)):
+            length, longest, labels, parts, raw_length, forbidden_text = 0, 0, set(), [], 0, False
+            for child in tag.contents:
+                if isinstance(child, Tag):
+                    c_length, c_longest, c_labels, c_text = info.pop(id(child), (0, 0, frozenset(), ''))
+                    length += c_length
+                    longest = max(longest, c_longest)
+                    labels.update(c_labels)
+                elif isinstance(child, NavigableString) and not isinstance(child, PreformattedString):
+                    c_text = str(child)
+                    stripped = c_text.strip()
+                    if stripped in FORBIDDEN_TEXT_EXACT:
+                        forbidden_text = True
+                    length += len(stripped)
+                    longest = max(longest, len(stripped))
+                    labels.update(m.lower() for m in FORBIDDEN_LABEL_LINE_RX.findall(c_text))
+                else:
+                    continue
+                if parts is not None:
+                    raw_length += len(c_text) if c_text is not None else FORBIDDEN_SHORT_TEXT_LIMIT + 1
+                    if raw_length <= FORBIDDEN_SHORT_TEXT_LIMIT:
+                        parts.append(c_text)
+                    else:
+                        parts = None
+
+            text = "".join(parts) if parts is not None else None
+            if forbidden_text:
+                remove = True
+            elif tag.name in FORBIDDEN_BLOCK_TAGS:
+                remove = len(labels) >= 2 and length <= INFOBOX_MAX_CHARS and longest <= INFOBOX_MAX_LINE
+            elif tag.name in FORBIDDEN_LINE_TAGS and text is not None:
+                s = text.strip().rstrip(':').strip()
+                remove = s in FORBIDDEN_TEXT_EXACT or s in FORBIDDEN_LABELS
+                if remove:
+                    info[id(tag)] = (0, 0, frozenset(labels), '')
+                    doomed.append(tag)
+                    continue
+            else:
+                remove = False
 
-        for tag in soup.find_all(["p", "li", "span", "h3", "h4"]):
-            if not tag.parent:
-                continue
-            s = (tag.get_text() or "").strip().rstrip(':').strip()
-            if s in FORBIDDEN_TEXT_EXACT or s in FORBIDDEN_LABELS:
-                try:
-                    tag.decompose()
-                except Exception:
-                    pass
+            if remove:
+                info[id(tag)] = (0, 0, frozenset(), '')
+                doomed.append(tag)
+            else:
+                info[id(tag)] = (length, longest, frozenset(labels), text)
+
+        # Filhos antes dos pais, então nada é destruído duas vezes por um ancestral.
+        for tag in doomed:
+            tag.decompose()
 
     def _convert_data_img_to_figure(self, soup: BeautifulSoup):
         """
@@ -820,6 +1068,7 @@ class ContentExtractor:
             except Exception:
                 pass
         if converted:
+            _forget_article_body_index(soup)
             logger.info(f"Converted {converted} 'data-img-url' divs to <figure> tags.")
 
     def _pick_featured_image(self, soup: BeautifulSoup, base_url: str) -> Optional[str]:
@@ -914,37 +1163,67 @@ class ContentExtractor:
         return [{"id": v, "embed_url": f"https://www.youtube.com/embed/{v}",
                  "watch_url": f"https://www.youtube.com/watch?v={v}"} for v in ordered]
 
-    def _extract_with_trafilatura(self, html: str, url: str) -> Optional[Dict[str, Any]]:
+    def _extract_with_trafilatura(self, html: str, url: str,
+                                  soup: Optional[BeautifulSoup] = None,
+                                  profile: Optional[Dict[str, Any]] = None) -> Optional[Dict[str, Any]]:
         """
         Generic extraction method using Trafilatura as the core engine. It uses a
         modular cleaner system for site-specific logic.
+
+        `soup` is the page already parsed and cleaned by the site rules in
+        `extract()`; cleaners, metadata and image collection all work on that one
+        tree, which is serialized once for trafilatura. `profile` is one of
+        EXTRACTION_PROFILES (default: the configured one).
         """
         logger.debug(f"Using generic (trafilatura) extractor for {url}")
+        profile = profile or get_extraction_profile()
         try:
-            soup = BeautifulSoup(html, 'lxml')
-            domain = urlparse(url).netloc.lower()
+            rules = rules_for_url(url)
+            if soup is None:
+                soup = BeautifulSoup(html, 'lxml')
+                if rules:
+                    rules.clean(soup)
 
-            # 1. Apply site-specific cleaner if available.
+            # 1. Apply the site-specific cleaner if one is registered for the site.
             # The cleaner can modify the soup in-place and optionally return a
             # pre-identified content_root.
             content_root = None
             # Remove blocos de "relacionadas" antes de qualquer outra coisa
             _remove_related_content_blocks(soup)
 
-            for cleaner_domain, cleaner_func in CLEANER_REGISTRY.items():
-                if cleaner_domain in domain:
-                    content_root = cleaner_func(soup)
-                    break
-            
-            # 2. If no specific cleaner returned a root, use the generic finder on the (potentially cleaned) soup.
+            cleaner_func = CLEANER_REGISTRY.get(rules.domain) if rules else None
+            if cleaner_func:
+                content_root = cleaner_func(soup)
+            # The site-specific extractor may already have scored this soup before the cleaning.
+            _forget_article_body_index(soup)
+
+            # 2. If no specific cleaner returned a root, try the selector learned for the
+            # domain, then the generic finder on the (potentially cleaned) soup.
+            domain, learned_selector, root_selector, root_chars = domain_of(url), None, None, 0
+            if content_root is None and self.learned_selectors and profile['shortcuts']:
+                learned_selector = self.learned_selectors.selector_for(domain)
+                if learned_selector:
+                    node = soup.select_one(learned_selector)
+                    if node is not None and _looks_like_article_root(node):
+                        content_root = node
+                    else:
+                        logger.info(f"Learned selector {learned_selector!r} did not validate for {url}; "
+                                    f"using the generic extractor.")
+                        self.learned_selectors.fail(domain, learned_selector)
+                        learned_selector = None
             if content_root is None:
                 content_root = _find_article_body(soup)
+                if self.learned_selectors:
+                    root_selector = stable_selector(content_root, soup)
+                    if root_selector:
+                        root_chars = len(content_root.get_text(" ", strip=True))
 
             # 3. Common processing on the identified content root
             # Convert Twitter embeds to oEmbed URLs before further processing
             tweet_count = len(content_root.select("blockquote.twitter-tweet"))
             if tweet_count > 0:
                 convert_twitter_embeds_to_oembed(content_root)
+                _forget_article_body_index(soup)
                 logger.info(f"Converted {tweet_count} Twitter embeds to oEmbed URLs.")
 
             # 4. Metadata extraction (from the original full soup)
@@ -969,25 +1248,48 @@ class ContentExtractor:
                 excerpt = (meta_desc.get('content') if (meta_desc := soup.find('meta', attrs={'name': 'description'})) else None) or \
                           (og_desc.get('content') if (og_desc := soup.find('meta', property='og:description')) else '')
 
-            # 5. Prepare body for trafilatura
-            body_html_string = str(content_root)
-            body_html_string = normalize_images_with_captions(body_html_string, source_url=url)
-
-            # 6. Extract main content with Trafilatura
-            content_html = trafilatura.extract(
-                body_html_string,
-                include_images=True,
-                include_links=True,
-                include_comments=False,
-                include_tables=False,
-                output_format='html'
-            )
-            if not content_html:
-                logger.warning(f"Trafilatura returned empty content for {url}")
-                return None
+            # 5. Prepare body for trafilatura. The root is detached first so the
+            # normalization cannot climb into (and remove) the page around it;
+            # the full soup is not needed after the metadata step above.
+            if content_root is not soup:
+                content_root.extract()
+            normalize_image_containers(content_root, soup, source_url=url)
+
+            if learned_selector:
+                # 6. The learned root already is the article: clean it in place, no trafilatura.
+                _strip_to_content(content_root)
+                article_soup = content_root
+                self.learned_selectors.confirm(domain, learned_selector)
+                logger.info(f"Extracted {url} from learned selector {learned_selector!r}.")
+            else:
+                # Trafilatura treats a bare fragment differently from a document
+                # (e.g. drops the leading <h1>), so keep the <html><body> wrapper.
+                body_html_string = str(content_root) if content_root is soup else f"<html><body>{content_root}</body></html>"
+
+                # 6. Extract main content with Trafilatura
+                content_html = trafilatura.extract(
+                    body_html_string,
+                    include_images=True,
+                    include_links=True,
+                    include_comments=False,
+                    include_tables=False,
+                    output_format='html',
+                    **profile['trafilatura']
+                )
+                if not content_html:
+                    logger.warning(f"Trafilatura returned empty content for {url}")
+                    return None
+                article_soup = BeautifulSoup(content_html, 'lxml')
+
+                # Learn the root only when trafilatura kept most of its text.
+                if root_selector:
+                    coverage = len(article_soup.get_text(" ", strip=True)) / max(root_chars, 1)
+                    if coverage >= LEARNED_ROOT_MIN_COVERAGE:
+                        self.learned_selectors.confirm(domain, root_selector)
+                    else:
+                        self.learned_selectors.fail(domain, root_selector)
 
             # 7. Post-process the extracted content
-            article_soup = BeautifulSoup(content_html, 'lxml')
             self._remove_forbidden_blocks(article_soup)
 
             # 8. Select final body images (excluding the featured one)
@@ -997,7 +1299,9 @@ class ContentExtractor:
             logger.info(f"Selected featured image: {featured_image_url}. Found {len(other_valid_images_data)} other valid images.")
 
             # Conteúdo final: só o conteúdo interno do <body>, se existir
-            if article_soup.body:
+            if learned_selector:
+                final_content_html = article_soup.decode_contents()
+            elif article_soup.body:
                 final_content_html = article_soup.body.decode_contents()
             else:
                 final_content_html = str(article_soup)
@@ -1018,40 +1322,68 @@ class ContentExtractor:
             logger.error(f"An unexpected error occurred during extraction for {url}: {e}", exc_info=True)
             return None
 
-    def extract(self, url: str) -> Optional[Dict[str, Any]]:
+    def extract(self, url: str, profile: Optional[str] = None) -> Optional[Dict[str, Any]]:
         """
         Main extraction flow: fetches HTML, tries a site-specific extractor if available,
-        and falls back to the generic trafilatura-based extractor.
+        and falls back to the generic trafilatura-based extractor. `profile` names one
+        of EXTRACTION_PROFILES (e.g. the feed's 'extraction_profile').
         """
         html = self._fetch_html(url)
         if not html:
             return None
 
-        domain = urlparse(url).netloc.lower()
+        started = time.process_time()
+        extraction_profile = get_extraction_profile(profile)
         soup = BeautifulSoup(html, 'lxml')
-        
         extracted_data = None
+        rules = rules_for_url(url)
 
-        # Router for site-specific extractors
-        if 'infomoney.com.br' in domain:
-            selectors = {
-                'title': 'h1.asset-title, h1.entry-title',
-                'content': 'div.article-content, div.entry-content',
-                'junk': ['.advertisement', '.leia-mais', '.box-leia-mais', '.box-newsletter', '.article-related-box']
-            }
-            extracted_data = _extract_site_specific(soup, url, selectors)
-        
-        elif 'estadao.com.br' in domain:
-            selectors = {
-                'title': 'h1.n--noticia__title, h1.entry-title',
-                'content': 'div.n--noticia__content.content, div.entry-content',
-                'junk': ['.veja-tambem', '.publicidade', '.box-relacionadas', '.posts-relacionados']
-            }
-            extracted_data = _extract_site_specific(soup, url, selectors)
+        # Sites whose JSON-LD carries the full body skip the cleaning and trafilatura entirely.
+        if rules and rules.json_ld_body and extraction_profile['shortcuts']:
+            extracted_data = _extract_from_json_ld_body(soup, url, self)
+            self._record_json_ld_attempt(url, extracted_data is not None, time.process_time() - started)
+            if extracted_data:
+                return extracted_data
+
+        # Site rules: one cleaning pass, then the site-specific extractor if the site has one.
+        if rules:
+            rules.clean(soup)
+            if rules.extract:
+                extracted_data = _extract_site_specific(soup, url, rules.extract, self)
 
         # If a specific extractor ran and succeeded, return its data.
         if extracted_data:
             return extracted_data
         
         # Otherwise, fall back to the generic method.
-        return self._extract_with_trafilatura(html, url)
+        extracted_data = self._extract_with_trafilatura(html, url, soup, extraction_profile)
+        self.json_ld_stats['generic_runs'] += 1
+        self.json_ld_stats['generic_cpu'] += time.process_time() - started
+        return extracted_data
+
+    def _record_json_ld_attempt(self, url: str, hit: bool, cpu_seconds: float) -> None:
+        stats = self.json_ld_stats
+        stats['attempts'] += 1
+        if hit:
+            stats['hits'] += 1
+            stats['fast_cpu'] += cpu_seconds
+            logger.info(f"Extracted {url} from its JSON-LD articleBody in {cpu_seconds * 1000:.1f} ms CPU.")
+        if stats['attempts'] % JSON_LD_STATS_LOG_EVERY == 0:
+            summary = self.json_ld_summary()
+            logger.info(
+                f"JSON-LD fast path: {stats['hits']}/{stats['attempts']} hits ({summary['hit_rate']:.0%}), "
+                f"{summary['fast_ms']:.1f} ms vs {summary['generic_ms']:.1f} ms generic per article, "
+                f"~{summary['cpu_saved_seconds']:.1f}s CPU saved."
+            )
+
+    def json_ld_summary(self) -> Dict[str, float]:
+        """Hit rate of the JSON-LD fast path and the CPU it saved against the generic path."""
+        stats = self.json_ld_stats
+        fast_ms = stats['fast_cpu'] * 1000 / stats['hits'] if stats['hits'] else 0.0
+        generic_ms = stats['generic_cpu'] * 1000 / stats['generic_runs'] if stats['generic_runs'] else 0.0
+        return {
+            'hit_rate': stats['hits'] / stats['attempts'] if stats['attempts'] else 0.0,
+            'fast_ms': fast_ms,
+            'generic_ms': generic_ms,
+            'cpu_saved_seconds': max(0.0, generic_ms - fast_ms) * stats['hits'] / 1000 if generic_ms else 0.0,
+        }
@@ -9,6 +9,8 @@ import time
 import hashlib
 from datetime import datetime, timezone
 
+from .http_retry import create_session
+
 logger = logging.getLogger(__name__)
 
 NS = {"ns":"http://www.sitemaps.org/schemas/sitemap/0.9",
@@ -118,8 +120,7 @@ def normalize_item(raw: dict) -> dict:
 
 class FeedReader:
     def __init__(self, user_agent: str):
-        self.session = requests.Session()
-        self.session.headers.update({'User-Agent': user_agent})
+        self.session = create_session(headers={'User-Agent': user_agent})
 
     def _fetch_content(self, url: str) -> Optional[bytes]:
         try:
@@ -0,0 +1,204 @@
+"""
+Disk-backed cache of fetched article HTML.
+
+Pages are stored zlib-compressed under the SHA-256 of their content, so the
+same HTML reached through several URLs is stored once. A small SQLite index
+maps each canonical URL to its blob with a fetch time (for the TTL) and a
+last-access time (for LRU eviction once the cache exceeds its size cap).
+
+Writes stay O(1): each instance keeps a running total of the blob bytes and
+only runs the full eviction pass when that total crosses the cap, and every
+EVICT_EVERY_WRITES writes to pick up what other processes stored. Expired
+entries are also swept by the periodic cleanup job (cleanup.CleanupManager).
+"""
+
+import hashlib
+import logging
+import os
+import sqlite3
+import time
+import zlib
+from pathlib import Path
+from typing import Optional
+from urllib.parse import parse_qsl, urlencode, urlparse, urlunparse
+
+from .config import HTML_CACHE_CONFIG
+from .store import get_connection
+
+logger = logging.getLogger(__name__)
+
+# Query parameters that never change the page content.
+TRACKING_PARAM_PREFIXES = ('utm_', 'fbclid', 'gclid', 'mc_', 'ref_src', 'cmpid')
+
+# last_access is only rewritten when older than this, to keep cache hits read-only.
+ACCESS_TOUCH_SECONDS = 60
+
+# Writes between full eviction passes even while under the cap (the running total
+# only sees this process's writes; pool workers share the cache).
+EVICT_EVERY_WRITES = 200
+
+
+def canonical_url(url: str) -> str:
+    """Normalizes a URL for use as a cache key (case, default ports, fragment, tracking params)."""
+    p = urlparse(url.strip())
+    scheme = p.scheme.lower()
+    netloc = p.netloc.lower()
+    if (scheme, netloc.rsplit(':', 1)[-1]) in (('http', '80'), ('https', '443')):
+        netloc = netloc.rsplit(':', 1)[0]
+    query = sorted(
+        (k, v) for k, v in parse_qsl(p.query, keep_blank_values=True)
+        if not k.lower().startswith(TRACKING_PARAM_PREFIXES)
+    )
+    return urlunparse((scheme, netloc, p.path or '/', p.params, urlencode(query), ''))
+
+
+class HtmlCache:
+    """Compressed, content-addressed HTML store with a TTL and an LRU size cap."""
+
+    def __init__(
+        self,
+        directory: str = HTML_CACHE_CONFIG['directory'],
+        ttl_seconds: float = HTML_CACHE_CONFIG['ttl_seconds'],
+        max_bytes: int = HTML_CACHE_CONFIG['max_bytes'],
+    ):
+        self.directory = Path(directory)
+        self.ttl_seconds = ttl_seconds
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self._schema_ready = False
+        # Blob bytes in the cache as far as this instance knows; None until first needed.
+        self._total_bytes: Optional[int] = None
+        self._writes_since_evict = 0
+
+    def _conn(self) -> sqlite3.Connection:
+        # Created lazily so importing the extractor never touches the disk.
+        self.directory.mkdir(parents=True, exist_ok=True)
+        conn = get_connection(str(self.directory / 'index.db'))
+        if self._schema_ready:
+            return conn
+        conn.execute('''
+            CREATE TABLE IF NOT EXISTS html_cache (
+                url TEXT PRIMARY KEY,
+                content_hash TEXT NOT NULL,
+                size INTEGER NOT NULL,
+                fetched_at REAL NOT NULL,
+                last_access REAL NOT NULL
+            )
+        ''')
+        conn.execute("CREATE INDEX IF NOT EXISTS idx_html_cache_access ON html_cache (last_access)")
+        conn.execute("CREATE INDEX IF NOT EXISTS idx_html_cache_hash ON html_cache (content_hash)")
+        conn.commit()
+        self._schema_ready = True
+        return conn
+
+    def _blob_path(self, content_hash: str) -> Path:
+        return self.directory / 'blobs' / content_hash[:2] / f"{content_hash}.z"
+
+    def get(self, url: str) -> Optional[str]:
+        """Returns the cached HTML for `url`, or None when absent, expired or unreadable."""
+        key = canonical_url(url)
+        now = time.time()
+        try:
+            conn = self._conn()
+            row = conn.execute(
+                "SELECT content_hash, fetched_at, last_access FROM html_cache WHERE url = ?", (key,)
+            ).fetchone()
+            if row is None or now - row['fetched_at'] >= self.ttl_seconds:
+                self.misses += 1
+                return None
+            html = zlib.decompress(self._blob_path(row['content_hash']).read_bytes()).decode('utf-8')
+            if now - row['last_access'] >= ACCESS_TOUCH_SECONDS:
+                conn.execute("UPDATE html_cache SET last_access = ? WHERE url = ?", (now, key))
+                conn.commit()
+        except (sqlite3.Error, OSError, zlib.error, UnicodeDecodeError) as e:
+            logger.warning(f"HTML cache read failed for {url}: {e}")
+            self.misses += 1
+            return None
+        self.hits += 1
+        return html
+
+    def _stored_bytes(self, conn: sqlite3.Connection) -> int:
+        # A blob shared by several URLs counts once.
+        return conn.execute(
+            "SELECT COALESCE(SUM(size), 0) FROM (SELECT MAX(size) AS size FROM html_cache GROUP BY content_hash)"
+        ).fetchone()[0]
+
+    def set(self, url: str, html: str) -> None:
+        """Stores the HTML fetched for `url`, evicting least recently used pages once over the cap."""
+        raw = html.encode('utf-8')
+        content_hash = hashlib.sha256(raw).hexdigest()
+        key = canonical_url(url)
+        now = time.time()
+        try:
+            conn = self._conn()
+            if self._total_bytes is None:
+                self._total_bytes = self._stored_bytes(conn)
+            blob = self._blob_path(content_hash)
+            if not blob.exists():
+                blob.parent.mkdir(parents=True, exist_ok=True)
+                tmp = blob.with_suffix(f".{os.getpid()}.tmp")
+                tmp.write_bytes(zlib.compress(raw, 6))
+                os.replace(tmp, blob)
+                self._total_bytes += blob.stat().st_size
+            previous = conn.execute("SELECT content_hash, size FROM html_cache WHERE url = ?", (key,)).fetchone()
+            conn.execute(
+                "INSERT INTO html_cache (url, content_hash, size, fetched_at, last_access) VALUES (?, ?, ?, ?, ?) "
+                "ON CONFLICT(url) DO UPDATE SET content_hash = excluded.content_hash, size = excluded.size, "
+                "fetched_at = excluded.fetched_at, last_access = excluded.last_access",
+                (key, content_hash, blob.stat().st_size, now, now)
+            )
+            conn.commit()
+            if previous is not None and previous['content_hash'] != content_hash:
+                # The page changed: drop its old blob unless another URL still uses it.
+                if self._unlink_unreferenced(conn, previous['content_hash']):
+                    self._total_bytes -= previous['size']
+
+            self._writes_since_evict += 1
+            if self._total_bytes > self.max_bytes or self._writes_since_evict >= EVICT_EVERY_WRITES:
+                self.evict()
+        except (sqlite3.Error, OSError) as e:
+            logger.warning(f"HTML cache write failed for {url}: {e}")
+
+    def _unlink_unreferenced(self, conn: sqlite3.Connection, content_hash: str) -> bool:
+        """Deletes the blob of `content_hash` if no entry refers to it; True when it was deleted."""
+        if conn.execute("SELECT 1 FROM html_cache WHERE content_hash = ? LIMIT 1", (content_hash,)).fetchone():
+            return False
+        try:
+            self._blob_path(content_hash).unlink()
+        except FileNotFoundError:
+            return False
+        return True
+
+    def evict(self) -> int:
+        """
+        Drops expired entries, then the least recently used pages until the blobs
+        fit in `max_bytes`, and deletes blobs no longer referenced. Returns entries dropped.
+        """
+        conn = self._conn()
+        cutoff = time.time() - self.ttl_seconds
+        touched = {row['content_hash'] for row in conn.execute(
+            "SELECT DISTINCT content_hash FROM html_cache WHERE fetched_at <= ?", (cutoff,))}
+        dropped = conn.execute("DELETE FROM html_cache WHERE fetched_at <= ?", (cutoff,)).rowcount
+
+        # A blob shared by several URLs counts once and is as recent as its latest use.
+        blobs = conn.execute(
+            "SELECT content_hash, MAX(size) AS size FROM html_cache "
+            "GROUP BY content_hash ORDER BY MAX(last_access)"
+        ).fetchall()
+        total = sum(row['size'] for row in blobs)
+        for row in blobs:
+            if total <= self.max_bytes:
+                break
+            dropped += conn.execute("DELETE FROM html_cache WHERE content_hash = ?", (row['content_hash'],)).rowcount
+            touched.add(row['content_hash'])
+            total -= row['size']
+        conn.commit()
+        self._total_bytes = total
+        self._writes_since_evict = 0
+
+        for content_hash in touched:
+            self._unlink_unreferenced(conn, content_hash)
+        if dropped:
+            logger.debug(f"HTML cache evicted {dropped} entries.")
+        return dropped
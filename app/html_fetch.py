@@ -0,0 +1,145 @@
+"""
+Streaming read of article pages.
+
+`read_html(resp)` consumes a `stream=True` response chunk by chunk instead of
+`resp.text`: the body is capped at `max_bytes`, reading stops early once the
+article that holds the story and the page's JSON-LD blocks have closed (the
+rest is footer, related links and scripts the extractor throws away), and the bytes
+are decoded once with the charset from the Content-Type header, else from a
+<meta> tag in the first bytes, else UTF-8 — never with requests' detection
+over the whole body. A read that stopped early or was cut at `max_bytes` comes
+back as PartialHtml, so callers can keep it out of caches.
+"""
+
+import codecs
+import logging
+import re
+from typing import Optional
+
+import requests
+
+from .config import HTML_FETCH_CONFIG
+
+logger = logging.getLogger(__name__)
+
+# <meta charset="x"> ou <meta http-equiv="Content-Type" content="text/html; charset=x">
+_META_CHARSET_RX = re.compile(rb'<meta[^>]+charset\s*=\s*["\']?\s*([a-zA-Z0-9_.:-]+)', re.I)
+_HEADER_CHARSET_RX = re.compile(r'charset\s*=\s*["\']?([a-zA-Z0-9_.:-]+)', re.I)
+# Bytes where the <meta> charset must appear (HTML spec: first 1024; we allow some slack).
+META_SNIFF_BYTES = 4096
+
+# The lookahead keeps custom elements (<article-card>, <script-x>) out.
+_TAG_RX = re.compile(rb'<(/?)(article|script|p)(?=[\s/>])([^>]*)>', re.I)
+# <p> an <article> must open to count as the story and not a teaser or related card.
+MIN_BODY_PARAGRAPHS = 3
+# Tail rescanned on the next chunk, so a tag split between chunks is still seen.
+_SCAN_OVERLAP = 512
+
+
+def _codec(name: Optional[str]) -> Optional[str]:
+    if not name:
+        return None
+    try:
+        return codecs.lookup(name).name
+    except LookupError:
+        return None
+
+
+def detect_charset(content_type: Optional[str], head: bytes) -> str:
+    """Charset from the Content-Type header, then a <meta> in `head`, then UTF-8."""
+    match = _HEADER_CHARSET_RX.search(content_type or '')
+    charset = _codec(match.group(1)) if match else None
+    if charset is None:
+        match = _META_CHARSET_RX.search(head[:META_SNIFF_BYTES])
+        charset = _codec(match.group(1).decode('ascii', 'ignore')) if match else None
+    return charset or 'utf-8'
+
+
+class PartialHtml(str):
+    """HTML whose read stopped before the end of the page (ArticleEndScanner or the size cap)."""
+
+
+class ArticleEndScanner:
+    """
+    Tracks, over the bytes read so far, whether the story's <article> and every
+    application/ld+json <script> opened has been closed. `done` turns true once
+    at least one of each has closed and none is open; a top-level <article>
+    counts as the story only when it opened `min_paragraphs` <p> tags, so
+    teaser and related cards ahead of it do not end the read. Scripts are
+    skipped whole, so markup inside JavaScript strings is not counted.
+    """
+
+    def __init__(self, min_paragraphs: int = MIN_BODY_PARAGRAPHS):
+        self.min_paragraphs = min_paragraphs
+        self.article_depth = 0
+        self.article_paragraphs = 0
+        self.body_articles_closed = 0
+        self.json_ld_closed = 0
+        self.in_script = False
+        self.in_json_ld = False
+        self._pos = 0
+
+    @property
+    def done(self) -> bool:
+        return (self.body_articles_closed > 0 and self.json_ld_closed > 0
+                and self.article_depth == 0 and not self.in_script)
+
+    def feed(self, buf: bytes) -> bool:
+        """Scans what was appended to `buf` since the last call; returns `done`."""
+        end = self._pos
+        for match in _TAG_RX.finditer(buf, self._pos):
+            end = match.end()
+            closing, name = match.group(1), match.group(2).lower()
+            if self.in_script:
+                if closing and name == b'script':
+                    self.json_ld_closed += self.in_json_ld
+                    self.in_script = self.in_json_ld = False
+            elif name == b'script':
+                if not closing:
+                    self.in_script = True
+                    self.in_json_ld = b'ld+json' in match.group(3).lower()
+            elif name == b'p':
+                if not closing and self.article_depth > 0:
+                    self.article_paragraphs += 1
+            elif closing:
+                if self.article_depth > 0:
+                    self.article_depth -= 1
+                    if self.article_depth == 0:
+                        if self.article_paragraphs >= self.min_paragraphs:
+                            self.body_articles_closed += 1
+                        self.article_paragraphs = 0
+            else:
+                self.article_depth += 1
+            if self.done:
+                return True
+        self._pos = max(end, len(buf) - _SCAN_OVERLAP, self._pos)
+        return False
+
+
+def read_html(
+    resp: requests.Response,
+    max_bytes: int = HTML_FETCH_CONFIG['max_bytes'],
+    early_stop: bool = HTML_FETCH_CONFIG['early_stop'],
+    chunk_size: int = HTML_FETCH_CONFIG['chunk_size'],
+) -> str:
+    """Reads and decodes a streamed HTML response, then closes it; PartialHtml if it stopped early or was truncated."""
+    buf = bytearray()
+    scanner = ArticleEndScanner() if early_stop else None
+    partial = False
+    try:
+        for chunk in resp.iter_content(chunk_size):
+            buf += chunk
+            if len(buf) > max_bytes:
+                logger.warning(f"HTML of {resp.url} exceeds {max_bytes} bytes; truncating.")
+                del buf[max_bytes:]
+                partial = True
+                break
+            if scanner is not None and scanner.feed(buf):
+                logger.debug(f"Article of {resp.url} closed after {len(buf)} bytes; stopping read.")
+                partial = True
+                break
+    finally:
+        resp.close()
+    data = bytes(buf)
+    html = data.decode(detect_charset(resp.headers.get('Content-Type'), data), errors='replace')
+    return PartialHtml(html) if partial else html
@@ -3,10 +3,12 @@ import json
 import html
 import re
 import logging
-from typing import List, Dict, Optional, Any
+from typing import List, Dict, Optional, Any, Union
 from bs4 import BeautifulSoup, Tag, NavigableString, ResultSet
 from urllib.parse import urlparse, parse_qs, urlsplit, urlunsplit
 
+from .site_rules import rules_for_host
+
 logger = logging.getLogger(__name__)
 
 # =========================
@@ -196,46 +198,12 @@ def _norm_key(u: str) -> str:
         return u.split('?')[0].split('#')[0].rstrip('/').lower()
 
 # --- New Lance-specific helpers ---
-LANCE_KILL_TEXTS = [
-    r'\bRelacionad[oa]s?\b', r'\bFique por dentro\b', r'\bMais notícias\b',
-    r'\bÚltimas notícias\b', r'\bLeia também\b', r'\bVeja também\b',
-    r'\bVer mais notícias\b', r'\bTudo sobre\b', r'\bSiga o Lance!\b'
-]
-LANCE_KILL_SELECTORS = [
-    # containers de navegação/rodapé/sidebars/carrosséis
-    'nav', 'aside', 'footer',
-    '[class*="swiper"]', '[class*="carousel"]', '[class*="carrossel"]',
-    '[class*="related"]', '[class*="relacionad"]',
-    '[class*="mais-noticias"]', '[data-qa*="related"]', '[aria-label*="Relacionad"]'
-]
-
 def _is_lance(url: str) -> bool:
     return 'lance.com.br' in (url or '')
 
 def remove_lance_widgets(soup: BeautifulSoup) -> None:
-    # 1) remove por seletor
-    for sel in LANCE_KILL_SELECTORS:
-        for el in soup.select(sel):
-            el.decompose()
-
-    # 2) remove por texto-sentinela
-    rx = re.compile('|'.join(LANCE_KILL_TEXTS), flags=re.I)
-    # Iterate over a copy of the list, as we are modifying the tree
-    for txt in list(soup.find_all(string=rx)):
-        from bs4 import Tag
-        # Defensive check for parent attribute, as reported in logs
-        if not hasattr(txt, 'parent') or not txt.parent:
-            continue
-        node = txt.parent
-
-        kill = node
-        for _ in range(5):
-            if not kill or not isinstance(kill, Tag) or kill.name in ('body', 'main', 'article'):
-                break
-            if len(kill.find_all('a')) >= 3 or len(kill.find_all('img')) >= 2:
-                kill.decompose()
-                break
-            kill = kill.parent
+    """Aplica as regras do Lance (seletores e textos-sentinela de site_rules)."""
+    rules_for_host('lance.com.br').clean(soup)
 
 def strip_lance_cdn(url: str) -> str:
     if not url:
@@ -477,17 +445,24 @@ def normalize_images_with_captions(html: str, *, source_url: str = "") -> str:
     if not html:
         return ""
     soup = BeautifulSoup(html, "lxml")
+    normalize_image_containers(soup, soup, source_url=source_url)
+    return str(soup)
 
+def normalize_image_containers(root: Union[BeautifulSoup, Tag], soup: BeautifulSoup, *, source_url: str = "") -> None:
+    """
+    In-place version of normalize_images_with_captions for a subtree of an
+    already parsed document; `soup` is the document that owns `root`.
+    """
     is_lance_source = _is_lance(source_url)
     if is_lance_source:
-        remove_lance_widgets(soup) # Mantém a limpeza específica do Lance
+        remove_lance_widgets(root) # Mantém a limpeza específica do Lance
 
     # Aplica a nova limpeza de blocos relacionados para todas as fontes
-    _remove_related_content_blocks(soup)
+    _remove_related_content_blocks(root)
 
     seen_images = set()
     # Itera sobre potenciais contêineres de imagem para ser mais robusto
-    for container in list(soup.select('figure, picture, img')):
+    for container in list(root.select('figure, picture, img')):
         try:
             if is_lance_source:
                 if container.find_parent(['nav','aside','footer']):
@@ -582,8 +557,6 @@ def normalize_images_with_captions(html: str, *, source_url: str = "") -> str:
             logger.warning(f"Error normalizing an image container: {e}. Skipping.", exc_info=False)
             continue
 
-    return str(soup)
-
 def collapse_h2_headings(html: str, keep_first: int = 1) -> str:
     """Converts all <h2> tags after the first 'keep_first' into <p><strong>...</strong></p>."""
     if not html: return html
@@ -0,0 +1,148 @@
+"""
+Shared HTTP retry policy for every requests.Session the app creates.
+
+Retries happen in one place, the session's adapter, instead of being stacked
+by hand around calls, and they draw on a per-host retry budget: retries to a
+host may not exceed `budget_ratio` of the requests sent to it over the last
+`budget_window_seconds` (plus a small floor, so a quiet host can still retry
+once in a while). During an origin outage the first failures are retried as
+usual, then requests fail fast instead of multiplying into a retry storm.
+
+403 is never retried (it is a refusal, see extractor.FETCH_STRATEGIES) and
+neither is POST (not idempotent). A Retry-After of up to
+`max_retry_after_seconds` is waited out; a longer one ends the retries and the
+response is returned as is.
+"""
+
+import logging
+import threading
+import time
+from collections import defaultdict, deque
+from typing import Deque, Dict, Optional
+from urllib.parse import urlparse
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.exceptions import MaxRetryError, ResponseError
+from urllib3.util.retry import Retry
+
+from .config import HTTP_RETRY_CONFIG
+
+logger = logging.getLogger(__name__)
+
+RETRY_STATUSES = (429, 500, 502, 503, 504)
+
+
+class RetryBudget:
+    """
+    Per-host retry allowance: at most `ratio` retries per request sent over the
+    sliding window, and never fewer than `min_retries` in that window.
+    """
+
+    def __init__(
+        self,
+        ratio: float = HTTP_RETRY_CONFIG['budget_ratio'],
+        min_retries: int = HTTP_RETRY_CONFIG['budget_min_retries'],
+        window_seconds: float = HTTP_RETRY_CONFIG['budget_window_seconds'],
+    ):
+        self.ratio = ratio
+        self.min_retries = min_retries
+        self.window_seconds = window_seconds
+        self._requests: Dict[str, Deque[float]] = defaultdict(deque)
+        self._retries: Dict[str, Deque[float]] = defaultdict(deque)
+        self._lock = threading.Lock()
+        self.denied = 0
+
+    def _prune(self, events: Deque[float], now: float) -> None:
+        while events and events[0] <= now - self.window_seconds:
+            events.popleft()
+
+    def record_request(self, host: str) -> None:
+        with self._lock:
+            now = time.monotonic()
+            events = self._requests[host.lower()]
+            self._prune(events, now)
+            events.append(now)
+
+    def try_spend(self, host: str) -> bool:
+        """Takes one retry from the host's budget; False (and nothing taken) when it is spent."""
+        with self._lock:
+            now = time.monotonic()
+            requests_sent, retries = self._requests[host.lower()], self._retries[host.lower()]
+            self._prune(requests_sent, now)
+            self._prune(retries, now)
+            if len(retries) >= max(self.min_retries, self.ratio * len(requests_sent)):
+                self.denied += 1
+                return False
+            retries.append(now)
+            return True
+
+
+RETRY_BUDGET = RetryBudget()
+
+
+class BudgetedRetry(Retry):
+    """urllib3 Retry that spends the host's RETRY_BUDGET on every retry; redirects are free."""
+
+    max_retry_after_seconds = HTTP_RETRY_CONFIG['max_retry_after_seconds']
+
+    def increment(self, method=None, url=None, response=None, error=None, _pool=None, _stacktrace=None):
+        new_retry = super().increment(method=method, url=url, response=response, error=error,
+                                      _pool=_pool, _stacktrace=_stacktrace)
+        if response is not None and response.get_redirect_location():
+            return new_retry
+
+        host = getattr(_pool, 'host', None) or ''
+        reason = error or ResponseError(f"too many {response.status} error responses" if response is not None
+                                        else "retry not allowed")
+        if response is not None and self.respect_retry_after_header:
+            retry_after = self.get_retry_after(response)
+            if retry_after is not None and retry_after > self.max_retry_after_seconds:
+                logger.warning(f"{host} asked to retry after {retry_after:.0f}s; not retrying {method} {url}.")
+                raise MaxRetryError(_pool, url, reason)
+        if not RETRY_BUDGET.try_spend(host):
+            logger.warning(f"Retry budget for {host} is spent; not retrying {method} {url}.")
+            raise MaxRetryError(_pool, url, reason)
+        return new_retry
+
+
+class BudgetedHTTPAdapter(HTTPAdapter):
+    """Counts every request per host, which is what the retry budget is a share of."""
+
+    def send(self, request, *args, **kwargs):
+        RETRY_BUDGET.record_request(urlparse(request.url).hostname or '')
+        return super().send(request, *args, **kwargs)
+
+
+def retry_policy(total: int = HTTP_RETRY_CONFIG['total']) -> BudgetedRetry:
+    return BudgetedRetry(
+        total=total,
+        backoff_factor=HTTP_RETRY_CONFIG['backoff_factor'],
+        status_forcelist=RETRY_STATUSES,
+        respect_retry_after_header=True,
+        # Out of retries, the last response is returned for the caller's raise_for_status().
+        raise_on_status=False,
+    )
+
+
+def create_session(headers: Optional[Dict[str, str]] = None,
+                   total: int = HTTP_RETRY_CONFIG['total']) -> requests.Session:
+    """A requests.Session whose http(s) adapters follow the shared retry policy."""
+    session = requests.Session()
+    adapter = BudgetedHTTPAdapter(max_retries=retry_policy(total))
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    if headers:
+        session.headers.update(headers)
+    return session
+
+
+_shared_session: Optional[requests.Session] = None
+
+
+def get_shared_session() -> requests.Session:
+    """A process-wide session for one-off requests that need no auth or special headers."""
+    global _shared_session
+    if _shared_session is None:
+        _shared_session = create_session()
+    return _shared_session
@@ -0,0 +1,182 @@
+"""
+Per-domain content-root selectors learned from generic extractions.
+
+When trafilatura succeeds on a page, the container the generic finder chose
+as the article root is described by a stable CSS selector (tag plus id, or tag
+plus classes without digits) and counted as a confirmation for its domain.
+Once a selector has enough confirmations and few enough failures, later pages
+of that domain go straight to it: the extractor validates the node cheaply and
+uses it as the body, falling back to the full generic path when it does not
+validate. Counts live in SQLite (the learned_selectors table, see
+store.SCHEMA_MIGRATIONS), so they survive restarts and are shared by the
+extraction pool workers; each process buffers its counts and adds them in one
+transaction every `flush_batch_size` pages or `flush_interval_seconds`.
+"""
+
+import logging
+import re
+import sqlite3
+import threading
+import time
+from typing import Dict, List, Optional, Tuple
+from urllib.parse import urlparse
+
+import soupsieve
+from bs4 import BeautifulSoup, Tag
+
+from .config import DATABASE_CONFIG, LEARNED_SELECTORS_CONFIG
+from .store import get_connection
+
+logger = logging.getLogger(__name__)
+
+# Ids/classes with digits are usually per-article or generated (post-1234, css-1x2y3z).
+_UNSTABLE_TOKEN_RX = re.compile(r"\d")
+
+
+def domain_of(url: str) -> str:
+    host = (urlparse(url or '').hostname or '').lower()
+    return host[4:] if host.startswith('www.') else host
+
+
+def _own_selector(node: Tag) -> Optional[str]:
+    node_id = node.get('id')
+    if isinstance(node_id, str) and node_id and not _UNSTABLE_TOKEN_RX.search(node_id):
+        return f"{node.name}#{soupsieve.escape(node_id)}"
+    classes = [c for c in node.get('class', []) if not _UNSTABLE_TOKEN_RX.search(c)]
+    if classes:
+        return node.name + "".join(f".{soupsieve.escape(c)}" for c in sorted(classes))
+    return None
+
+
+def _matches_only(soup: BeautifulSoup, selector: str, node: Tag) -> bool:
+    matches = soup.select(selector, limit=2)
+    return len(matches) == 1 and matches[0] is node
+
+
+def stable_selector(node: Tag, soup: BeautifulSoup) -> Optional[str]:
+    """
+    A selector that matches `node` and nothing else in `soup`, built from the
+    node's own id/classes, prefixed by its parent's when that alone is ambiguous.
+    None for the document itself and for nodes without stable attributes.
+    """
+    if node is soup or node.name in ('html', 'body') or node.parent is None:
+        return None
+    selector = _own_selector(node)
+    if selector is None:
+        return None
+    if _matches_only(soup, selector, node):
+        return selector
+    parent = _own_selector(node.parent) if node.parent is not soup else None
+    if parent is not None:
+        selector = f"{parent} > {selector}"
+        if _matches_only(soup, selector, node):
+            return selector
+    return None
+
+
+_UPSERT_SQL = (
+    "INSERT INTO learned_selectors (domain, selector, confirmations, failures, updated_at) VALUES (?, ?, ?, ?, ?) "
+    "ON CONFLICT(domain, selector) DO UPDATE SET confirmations = confirmations + excluded.confirmations, "
+    "failures = failures + excluded.failures, updated_at = excluded.updated_at"
+)
+
+
+class LearnedSelectors:
+    """Confirmation/failure counts of content-root selectors per domain, in SQLite (write-behind)."""
+
+    def __init__(
+        self,
+        db_path: str = DATABASE_CONFIG['path'],
+        min_confirmations: int = LEARNED_SELECTORS_CONFIG['min_confirmations'],
+        min_confidence: float = LEARNED_SELECTORS_CONFIG['min_confidence'],
+        flush_interval_seconds: float = LEARNED_SELECTORS_CONFIG['flush_interval_seconds'],
+        flush_batch_size: int = LEARNED_SELECTORS_CONFIG['flush_batch_size'],
+    ):
+        self.db_path = db_path
+        self.min_confirmations = min_confirmations
+        self.min_confidence = min_confidence
+        self.flush_interval_seconds = flush_interval_seconds
+        self.flush_batch_size = flush_batch_size
+        # (domain, selector) -> [confirmations, failures] not yet written.
+        self._pending: Dict[Tuple[str, str], List[int]] = {}
+        self._pending_pages = 0
+        self._lock = threading.Lock()
+        self._last_flush = time.monotonic()
+
+    def _conn(self) -> sqlite3.Connection:
+        # Fetched lazily so building an extractor never touches the disk. Flushes run
+        # inside extract(), so they commit and roll back on their own pooled connection,
+        # never on the pipeline's.
+        return get_connection(self.db_path, owner='learned_selectors')
+
+    def selector_for(self, domain: str) -> Optional[str]:
+        """The most confirmed selector of `domain` that is trusted enough to bypass the generic path."""
+        try:
+            rows = self._conn().execute(
+                "SELECT selector, confirmations, failures FROM learned_selectors WHERE domain = ?", (domain,)
+            ).fetchall()
+        except sqlite3.Error as e:
+            logger.warning(f"Learned selector lookup failed for {domain}: {e}")
+            return None
+        counts = {row['selector']: [row['confirmations'], row['failures']] for row in rows}
+        with self._lock:
+            for (pending_domain, selector), (confirmations, failures) in self._pending.items():
+                if pending_domain == domain:
+                    total = counts.setdefault(selector, [0, 0])
+                    total[0] += confirmations
+                    total[1] += failures
+        trusted = [
+            (confirmations, selector) for selector, (confirmations, failures) in counts.items()
+            if confirmations >= self.min_confirmations
+            and confirmations >= self.min_confidence * (confirmations + failures)
+        ]
+        return max(trusted)[1] if trusted else None
+
+    def confirm(self, domain: str, selector: str) -> None:
+        """Counts one page of `domain` whose article root `selector` matched."""
+        self._record(domain, selector, 0)
+
+    def fail(self, domain: str, selector: str) -> None:
+        """Counts one page of `domain` where `selector` missed or did not validate."""
+        self._record(domain, selector, 1)
+
+    def _record(self, domain: str, selector: str, column: int) -> None:
+        with self._lock:
+            self._pending.setdefault((domain, selector), [0, 0])[column] += 1
+            self._pending_pages += 1
+            due = (self._pending_pages >= self.flush_batch_size or
+                   time.monotonic() - self._last_flush >= self.flush_interval_seconds)
+        if due:
+            self.flush()
+
+    def flush(self) -> int:
+        """Adds all buffered counts in one transaction. Returns how many selectors were written."""
+        with self._lock:
+            pending, self._pending, self._pending_pages = self._pending, {}, 0
+            self._last_flush = time.monotonic()
+        if not pending:
+            return 0
+        now = time.time()
+        conn = self._conn()
+        try:
+            conn.executemany(
+                _UPSERT_SQL,
+                [(domain, selector, confirmations, failures, now)
+                 for (domain, selector), (confirmations, failures) in pending.items()]
+            )
+            conn.commit()
+            return len(pending)
+        except sqlite3.Error as e:
+            logger.warning(f"Could not record {len(pending)} learned selector counts: {e}")
+            conn.rollback()
+            with self._lock:
+                # Retried on the next flush, added to anything counted since.
+                for key, (confirmations, failures) in pending.items():
+                    counts = self._pending.setdefault(key, [0, 0])
+                    counts[0] += confirmations
+                    counts[1] += failures
+            return 0
+
+    def close(self) -> None:
+        """Flushes any buffered counts."""
+        self.flush()
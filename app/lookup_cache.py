@@ -0,0 +1,108 @@
+"""
+In-process LRU cache with TTL, negative caching and singleflight loading.
+
+Used to keep repeated WordPress taxonomy lookups (slug -> category,
+name -> tag) off the network within and across pipeline cycles.
+"""
+
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Hashable, Optional, Tuple
+
+
+class _InFlight:
+    """A lookup currently being loaded by one thread, awaited by the others."""
+
+    def __init__(self):
+        self.event = threading.Event()
+        self.value: Any = None
+        self.error: Optional[BaseException] = None
+
+
+class LookupCache:
+    """
+    Thread-safe LRU cache whose entries expire after a TTL.
+
+    `None` values are cached as "not found" with a shorter TTL, so a missing
+    term is not looked up on every article but appears soon after it is created.
+    Concurrent `get_or_load` calls for the same key share one loader call.
+    Exceptions raised by the loader are never cached.
+    """
+
+    def __init__(self, maxsize: int = 1024, ttl_seconds: float = 3600, negative_ttl_seconds: float = 60):
+        self.maxsize = maxsize
+        self.ttl_seconds = ttl_seconds
+        self.negative_ttl_seconds = negative_ttl_seconds
+        self._entries: "OrderedDict[Hashable, Tuple[Any, float]]" = OrderedDict()
+        self._inflight: Dict[Hashable, _InFlight] = {}
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key: Hashable) -> Tuple[bool, Any]:
+        """Returns (found, value); `found` is False for absent or expired keys."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return False, None
+            value, expires_at = entry
+            if expires_at <= time.monotonic():
+                del self._entries[key]
+                self.misses += 1
+                return False, None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return True, value
+
+    def set(self, key: Hashable, value: Any) -> None:
+        """Stores a value; `None` is stored as a negative entry."""
+        ttl = self.negative_ttl_seconds if value is None else self.ttl_seconds
+        with self._lock:
+            self._entries[key] = (value, time.monotonic() + ttl)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    def invalidate(self, key: Hashable) -> None:
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self.hits = self.misses = 0
+
+    def get_or_load(self, key: Hashable, loader: Callable[[], Any]) -> Any:
+        """
+        Returns the cached value for `key`, calling `loader` at most once across
+        threads when it is missing.
+        """
+        found, value = self.get(key)
+        if found:
+            return value
+
+        with self._lock:
+            call = self._inflight.get(key)
+            leader = call is None
+            if leader:
+                call = self._inflight[key] = _InFlight()
+
+        if not leader:
+            call.event.wait()
+            if call.error is not None:
+                raise call.error
+            return call.value
+
+        try:
+            call.value = loader()
+            self.set(key, call.value)
+            return call.value
+        except BaseException as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                self._inflight.pop(key, None)
+            call.event.set()
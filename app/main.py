@@ -5,6 +5,7 @@ from datetime import datetime, timezone
 from apscheduler.schedulers.blocking import BlockingScheduler
 
 from app.pipeline import run_pipeline_cycle
+from app.cleanup import CleanupManager, run_counter_reconciliation
 from app.store import Database
 from app.config import SCHEDULE_CONFIG
 from app.logging_conf import setup_logging
@@ -56,6 +57,27 @@ def main():
         # Executa o ciclo uma vez imediatamente e depois a cada `interval` minutos.
         scheduler.add_job(run_pipeline_cycle, 'interval', minutes=interval, next_run_time=datetime.now(timezone.utc))
 
+        # Limpeza em lotes num job separado: roda em outra thread do scheduler e
+        # libera o lock de escrita entre lotes, sem travar o pipeline.
+        cleanup_manager = CleanupManager(
+            cleanup_after_hours=SCHEDULE_CONFIG.get('cleanup_after_hours', 72),
+            batch_size=SCHEDULE_CONFIG.get('cleanup_batch_size', 500),
+        )
+        cleanup_interval = SCHEDULE_CONFIG.get('cleanup_interval_minutes', 60)
+        scheduler.add_job(
+            cleanup_manager.run_cleanup, 'interval', minutes=cleanup_interval,
+            max_instances=1, coalesce=True,
+        )
+        logger.info(f"Limpeza do banco agendada a cada {cleanup_interval} minutos.")
+
+        # Os contadores do dashboard são mantidos por triggers; a reconciliação só corrige desvios.
+        reconcile_interval = SCHEDULE_CONFIG.get('counter_reconcile_interval_minutes', 360)
+        scheduler.add_job(
+            run_counter_reconciliation, 'interval', minutes=reconcile_interval,
+            max_instances=1, coalesce=True,
+        )
+        logger.info(f"Reconciliação dos contadores agendada a cada {reconcile_interval} minutos.")
+
         logger.info("Pressione Ctrl+C para sair.")
         try:
             scheduler.start()
@@ -13,6 +13,7 @@ from PIL import Image
 import io
 
 from . import wordpress
+from .http_retry import create_session
 
 logger = logging.getLogger(__name__)
 
@@ -23,8 +24,7 @@ class MediaHandler:
     def __init__(self, pipeline_config: Dict[str, Any], wp_client: 'wordpress.WordPressClient'):
         self.config = pipeline_config
         self.wp_client = wp_client
-        self.session = requests.Session()
-        self.session.headers.update({
+        self.session = create_session(headers={
             'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
         })
     
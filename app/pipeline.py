@@ -18,7 +18,9 @@ from .config import (
 from .store import Database
 from .store import TaxonomyCache 
 from .feeds import FeedReader
+from .retry import RetryScheduler
 from .extractor import ContentExtractor
+from .extraction_pool import ExtractionPool, get_extraction_pool
 from .ai_processor import AIProcessor
 from .wordpress import WordPressClient
 from .store import Database # Ensure Database is imported
@@ -138,16 +140,22 @@ def is_allowed_by_source_rules(source_key: str, url: str) -> bool:
     except Exception:
         return True # Em caso de erro na verificação, não bloqueia
 
+def _elapsed_ms(started: float) -> int:
+    """Milliseconds since a `time.monotonic()` reading, for article_events."""
+    return int((time.monotonic() - started) * 1000)
+
 def run_pipeline_cycle():
     """Executes a full cycle of the content processing pipeline."""
     logger.info("Starting new pipeline cycle.")
 
     db = Database()
     feed_reader = FeedReader(user_agent=PIPELINE_CONFIG.get('publisher_name', 'Bot'))
-    extractor = ContentExtractor()
+    # Pool of warm worker processes when configured; otherwise extract on this thread.
+    extractor = get_extraction_pool() or ContentExtractor()
     wp_client = WordPressClient(config=WORDPRESS_CONFIG, categories_map=WORDPRESS_CATEGORIES)
     ai_processor = AIProcessor()
     tax_cache = TaxonomyCache()
+    retry_scheduler = RetryScheduler(db)
     processed_articles_in_cycle = 0
 
     try:
@@ -172,19 +180,37 @@ def run_pipeline_cycle():
                 feed_items = feed_reader.read_feeds(feed_config, source_id)
                 new_articles = db.filter_new_articles(source_id, feed_items)
 
-                if not new_articles:
+                # The batch comes from the store: deferred articles whose backoff has
+                # elapsed go ahead of NEW ones, and NEW ones that do not fit are picked
+                # up next cycle. Fresh feed items replace their rows (richer data).
+                max_articles = SCHEDULE_CONFIG.get('max_articles_per_feed', 3)
+                fresh_items = {a['db_id']: a for a in new_articles}
+                batch = [fresh_items.get(a['db_id'], a) for a in retry_scheduler.next_batch(source_id, max_articles)]
+
+                if not batch:
                     logger.info(f"No new articles found for {source_id}.")
                     continue
 
-                logger.info(f"Found {len(new_articles)} new articles for {source_id}")
-
-                for article_data in new_articles[:SCHEDULE_CONFIG.get('max_articles_per_feed', 3)]:
+                retries = sum(1 for a in batch if a.get('fail_count'))
+                logger.info(f"Found {len(new_articles)} new articles for {source_id}; "
+                            f"processing {len(batch)} ({retries} ready retries)")
+                extraction_profile = feed_config.get('extraction_profile')
+                if isinstance(extractor, ExtractionPool):
+                    # Fresh articles are extracted in parallel while the loop below
+                    # rewrites and publishes them one by one.
+                    extractor.prefetch((
+                        url for url in (_get_article_url(a) for a in batch if not a.get('fail_count'))
+                        if url and not is_blocked_url(url) and is_allowed_by_source_rules(source_id, url)
+                    ), profile=extraction_profile)
+
+                for article_data in batch:
                     article_db_id = article_data['db_id']
+                    stage = 'claim'  # Stage in progress, for the event logged on unexpected errors
                     try:
                         article_url_to_process = _get_article_url(article_data)
                         if not article_url_to_process:
                             logger.warning(f"Skipping article {article_data.get('id')} - missing/invalid URL.")
-                            db.update_article_status(article_db_id, 'FAILED', reason="Missing/invalid URL")
+                            retry_scheduler.record_failure(article_data, "Missing/invalid URL")
                             continue
 
                         if is_blocked_url(article_url_to_process):
@@ -198,38 +224,64 @@ def run_pipeline_cycle():
                             continue
 
                         logger.info(f"Processing article: {article_data.get('title', 'N/A')} (DB ID: {article_db_id}) from {source_id}")
-                        db.update_article_status(article_db_id, 'PROCESSING')
-                        
-                        extracted_data = extractor.extract(article_url_to_process)
-                        if not extracted_data or not extracted_data.get('content'):
-                            logger.warning(f"Failed to extract content from {article_data['url']}")
-                            db.update_article_status(article_db_id, 'FAILED', reason="Extraction failed")
-                            continue
+                        # Claim is flushed synchronously; other transitions are written behind.
+                        db.update_article_status(article_db_id, 'PROCESSING', sync=True)
+                        db.record_event(article_db_id, source_id, 'claim', 'started')
+
+                        # Stage outputs of an earlier attempt; completed stages are not paid for twice.
+                        checkpoints = db.load_checkpoints(article_db_id) if article_data.get('fail_count') else {}
+                        if checkpoints:
+                            logger.info(f"Resuming article DB ID {article_db_id} with checkpoints: {', '.join(sorted(checkpoints))}")
+
+                        stage = 'extract'
+                        extracted_data = checkpoints.get('extracted')
+                        if extracted_data:
+                            db.record_event(article_db_id, source_id, stage, 'resumed')
+                        else:
+                            started = time.monotonic()
+                            extracted_data = extractor.extract(article_url_to_process, profile=extraction_profile)
+                            if not extracted_data or not extracted_data.get('content'):
+                                logger.warning(f"Failed to extract content from {article_data['url']}")
+                                db.record_event(article_db_id, source_id, stage, 'failed',
+                                                duration_ms=_elapsed_ms(started), error_class='empty_content')
+                                retry_scheduler.record_failure(article_data, "Extraction failed")
+                                continue
+                            db.record_event(article_db_id, source_id, stage, 'ok', duration_ms=_elapsed_ms(started),
+                                            size_bytes=len(extracted_data['content'].encode('utf-8')))
+                            db.save_checkpoint(article_db_id, 'extracted', extracted_data)
 
                         # Step 2: Rewrite content with AI
-                        rewritten_data, failure_reason = ai_processor.rewrite_content(
-                            title=extracted_data.get('title'),
-                            content_html=extracted_data.get('content'),
-                            source_url=article_url_to_process,
-                            category=category,
-                            videos=extracted_data.get('videos', []),
-                            images=extracted_data.get('images', []),
-                            tags=[],  # Tags are generated by the AI in this flow
-                            source_name=feed_config.get('source_name', ''),
-                            domain=wp_client.get_domain(),
-                            schema_original=extracted_data.get('schema_original')
-                        )
+                        stage = 'rewrite'
+                        started = time.monotonic()
+                        rewritten_data, failure_reason = checkpoints.get('rewritten'), None
+                        if rewritten_data:
+                            db.record_event(article_db_id, source_id, stage, 'resumed')
+                        else:
+                            rewritten_data, failure_reason = ai_processor.rewrite_content(
+                                title=extracted_data.get('title'),
+                                content_html=extracted_data.get('content'),
+                                source_url=article_url_to_process,
+                                category=category,
+                                videos=extracted_data.get('videos', []),
+                                images=extracted_data.get('images', []),
+                                tags=[],  # Tags are generated by the AI in this flow
+                                source_name=feed_config.get('source_name', ''),
+                                domain=wp_client.get_domain(),
+                                schema_original=extracted_data.get('schema_original')
+                            )
 
                         if not rewritten_data:
                             reason = failure_reason or "AI processing failed"
                             # Check for the specific case where the key pool for the category is exhausted
                             if "pool is exhausted" in reason:
                                 logger.warning(
-                                    f"{feed_config['category']} pool exhausted → marking article FAILED → moving on."
+                                    f"{feed_config['category']} pool exhausted → deferring article → moving on."
                                 )
                             else:
-                                logger.warning(f"Article '{article_data.get('title', 'N/A')}' marked as FAILED (Reason: {reason}). Continuing to next article.")
-                            db.update_article_status(article_db_id, 'FAILED', reason=reason)
+                                logger.warning(f"Article '{article_data.get('title', 'N/A')}' failed AI processing (Reason: {reason}). Continuing to next article.")
+                            db.record_event(article_db_id, source_id, stage, 'failed',
+                                            duration_ms=_elapsed_ms(started), error_class='ai_error')
+                            retry_scheduler.record_failure(article_data, reason)
                             continue
 
                         # Step 3: Validate AI output and prepare content
@@ -238,8 +290,14 @@ def run_pipeline_cycle():
 
                         if not title or not content_html:
                             logger.error(f"AI output for {article_url_to_process} missing required fields (titulo_final/conteudo_final).")
-                            db.update_article_status(article_db_id, 'FAILED', reason="AI output missing required fields")
+                            db.record_event(article_db_id, source_id, stage, 'failed',
+                                            duration_ms=_elapsed_ms(started), error_class='ai_invalid_output')
+                            retry_scheduler.record_failure(article_data, "AI output missing required fields")
                             continue
+                        if 'rewritten' not in checkpoints:
+                            db.record_event(article_db_id, source_id, stage, 'ok', duration_ms=_elapsed_ms(started),
+                                            size_bytes=len(content_html.encode('utf-8')))
+                            db.save_checkpoint(article_db_id, 'rewritten', rewritten_data)
 
                         # Step 3.1: HTML Processing and Cleanup
                         # Defensive cleanup of common AI errors (e.g., leftover placeholders)
@@ -273,9 +331,14 @@ def run_pipeline_cycle():
                             if img_data.get('src') and not is_blocked_url(img_data['src']) and is_valid_upload_candidate(img_data['src'])
                         ]
 
-                        uploaded_media_data = {}
+                        # Images uploaded by an earlier attempt are reused, not uploaded again.
+                        uploaded_media_data = checkpoints.get('media') or {}
+                        images_to_upload = [img for img in images_to_upload if _norm_key(img['src']) not in uploaded_media_data]
+                        stage = 'media'
+                        started = time.monotonic()
                         if images_to_upload:
                             logger.info(f"Attempting to upload {len(images_to_upload)} image(s).")
+                            failed_uploads = 0
                             for img_data in images_to_upload:
                                 original_url = img_data['src']
                                 media = wp_client.upload_media_from_url(original_url, title)
@@ -287,6 +350,18 @@ def run_pipeline_cycle():
                                     # Armazena todos os dados para a reescrita do bloco Gutenberg
                                     k = _norm_key(original_url)
                                     uploaded_media_data[k] = {**img_data, 'id': media_id, 'source_url': media["source_url"]}
+                                    db.save_checkpoint(article_db_id, 'media', uploaded_media_data)
+                                else:
+                                    failed_uploads += 1
+                            if not failed_uploads:
+                                db.record_event(article_db_id, source_id, stage, 'ok', duration_ms=_elapsed_ms(started))
+                            else:
+                                # 'failed' when nothing was uploaded, 'partial' otherwise; the class carries the count.
+                                logger.warning(f"{failed_uploads} of {len(images_to_upload)} image upload(s) failed.")
+                                db.record_event(article_db_id, source_id, stage,
+                                                'failed' if failed_uploads == len(images_to_upload) else 'partial',
+                                                duration_ms=_elapsed_ms(started),
+                                                error_class=f'upload_failed:{failed_uploads}/{len(images_to_upload)}')
                         
                         # 3.4: Rewrite image tags into Gutenberg blocks
                         content_html = rewrite_img_srcs_with_wp(content_html, uploaded_media_data)
@@ -368,9 +443,12 @@ def run_pipeline_cycle():
                             'meta': yoast_meta,
                         }
 
+                        stage = 'publish'
+                        started = time.monotonic()
                         wp_post_id = wp_client.create_post(post_payload)
 
                         if wp_post_id:
+                            db.record_event(article_db_id, source_id, stage, 'ok', duration_ms=_elapsed_ms(started))
                             db.save_processed_post(article_db_id, wp_post_id)
                             logger.info(f"Successfully published post {wp_post_id} for article DB ID {article_db_id}")
                             
@@ -385,7 +463,9 @@ def run_pipeline_cycle():
                             processed_articles_in_cycle += 1
                         else:
                             logger.error(f"Failed to publish post for {article_url_to_process}")
-                            db.update_article_status(article_db_id, 'FAILED', reason="WordPress publishing failed")
+                            db.record_event(article_db_id, source_id, stage, 'failed',
+                                            duration_ms=_elapsed_ms(started), error_class='publish_failed')
+                            retry_scheduler.record_failure(article_data, "WordPress publishing failed")
 
                         # Per-article delay to respect API rate limits and avoid being predictable
                         base_delay = SCHEDULE_CONFIG.get('per_article_delay_seconds', 8)
@@ -396,7 +476,8 @@ def run_pipeline_cycle():
 
                     except Exception as e:
                         logger.error(f"Error processing article {article_url_to_process or article_data.get('title', 'N/A')}: {e}", exc_info=True)
-                        db.update_article_status(article_db_id, 'FAILED', reason=str(e))
+                        db.record_event(article_db_id, source_id, stage, 'failed', error_class=type(e).__name__)
+                        retry_scheduler.record_failure(article_data, str(e))
 
                 # If we reach here without a feed-level exception, the processing was successful
                 db.reset_consecutive_failures(source_id)
@@ -414,5 +495,8 @@ def run_pipeline_cycle():
 
     finally:
         logger.info(f"Pipeline cycle completed. Processed {processed_articles_in_cycle} articles.")
+        tax_cache.close()
+        if isinstance(extractor, ContentExtractor):
+            extractor.close()
         db.close()
         wp_client.close()
\ No newline at end of file
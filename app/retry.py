@@ -0,0 +1,121 @@
+"""
+Retry scheduling for articles that failed for transient reasons.
+
+Failure reasons are classified as transient (quota/rate limits, timeouts,
+upstream 5xx, extraction or publishing hiccups) or permanent (invalid URL,
+content rejected by the AI). Transient failures are DEFERRED with an
+exponential backoff plus jitter; once an article runs out of attempts or is
+no longer fresh it is marked FAILED for good.
+"""
+
+import logging
+import random
+import re
+from datetime import datetime, timedelta
+from typing import Any, Dict, List, Optional
+
+from .config import RETRY_CONFIG
+from .store import Database
+
+logger = logging.getLogger(__name__)
+
+TRANSIENT_REASON_PATTERN = re.compile(
+    r"quota|rate.?limit|\b429\b|exhausted|keys are currently unavailable|after trying available keys"
+    r"|time(?:d)?.?out|temporar|unavailable|connection|\b50[234]\b"
+    r"|wordpress publishing failed|extraction failed",
+    re.IGNORECASE,
+)
+
+
+def is_transient_failure(reason: Optional[str]) -> bool:
+    """Returns True when a failure reason looks like a short outage worth retrying."""
+    return bool(reason) and TRANSIENT_REASON_PATTERN.search(reason) is not None
+
+
+def _parse_db_timestamp(value: Any) -> Optional[datetime]:
+    if isinstance(value, datetime):
+        return value
+    if not value:
+        return None
+    try:
+        return datetime.fromisoformat(str(value))
+    except ValueError:
+        return None
+
+
+class RetryScheduler:
+    """Decides whether a failed article is retried, and when."""
+
+    def __init__(
+        self,
+        db: Database,
+        max_attempts: int = RETRY_CONFIG['max_attempts'],
+        base_delay_seconds: float = RETRY_CONFIG['base_delay_seconds'],
+        max_delay_seconds: float = RETRY_CONFIG['max_delay_seconds'],
+        jitter: float = RETRY_CONFIG['jitter'],
+        max_age_hours: float = RETRY_CONFIG['max_age_hours'],
+    ):
+        self.db = db
+        self.max_attempts = max_attempts
+        self.base_delay_seconds = base_delay_seconds
+        self.max_delay_seconds = max_delay_seconds
+        self.jitter = jitter
+        self.max_age = timedelta(hours=max_age_hours)
+
+    def backoff_delay(self, attempt: int) -> timedelta:
+        """Delay before retry number `attempt + 1`: base * 2^attempt, capped, with +/- jitter."""
+        delay = min(self.max_delay_seconds, self.base_delay_seconds * (2 ** attempt))
+        delay *= random.uniform(1 - self.jitter, 1 + self.jitter)
+        return timedelta(seconds=delay)
+
+    def _is_fresh(self, article_data: Dict[str, Any], now: datetime) -> bool:
+        # Articles straight from the feed have no inserted_at yet and are fresh by definition.
+        inserted_at = _parse_db_timestamp(article_data.get('inserted_at'))
+        return inserted_at is None or now - inserted_at < self.max_age
+
+    def record_failure(self, article_data: Dict[str, Any], reason: str) -> str:
+        """
+        Marks an article DEFERRED (with retry_at) or FAILED depending on the reason,
+        the attempts already made and its age. Returns the status that was set.
+        """
+        article_db_id = article_data['db_id']
+        attempts = article_data.get('fail_count') or 0
+        now = datetime.utcnow()
+
+        if (is_transient_failure(reason) and attempts + 1 < self.max_attempts
+                and self._is_fresh(article_data, now)):
+            retry_at = now + self.backoff_delay(attempts)
+            self.db.update_article_status(article_db_id, 'DEFERRED', retry_at=retry_at, reason=reason)
+            logger.info(
+                f"Article DB ID {article_db_id} deferred (attempt {attempts + 1}/{self.max_attempts}), "
+                f"retry at {retry_at:%H:%M:%S} UTC. Reason: {reason}"
+            )
+            return 'DEFERRED'
+
+        self.db.update_article_status(article_db_id, 'FAILED', reason=reason)
+        return 'FAILED'
+
+    def next_batch(self, source_id: str, limit: int) -> List[Dict[str, Any]]:
+        """
+        Returns up to `limit` articles of a feed to process, shaped like feed items:
+        deferred articles whose retry_at has passed first, then NEW ones (including
+        those a full batch left behind in earlier cycles). Articles that are no
+        longer fresh are given up on first.
+        """
+        expired = self.db.expire_stale_articles(source_id, datetime.utcnow() - self.max_age)
+        if expired:
+            logger.info(f"Gave up on {expired} stale article(s) for {source_id}.")
+        if limit <= 0:
+            return []
+
+        return [
+            {
+                'db_id': row['id'],
+                'id': row['external_id'],
+                'url': row['url'],
+                'title': row['url'],
+                'fail_count': row['fail_count'],
+                'inserted_at': row['inserted_at'],
+            }
+            for row in self.db.get_articles_to_process(source_id, limit)
+        ]
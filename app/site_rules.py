@@ -0,0 +1,184 @@
+"""
+Declarative per-site extraction rules.
+
+Each entry in SITE_RULES describes, as plain data, what to strip from a
+site's pages and where its article lives. The rules are compiled once at
+import into one grouped CSS selector and one combined text pattern per site,
+so cleaning a page is a single selector pass plus a single text pass, and
+they are dispatched by an exact host-suffix lookup. Adding a site means
+adding an entry here; only sites that need logic beyond these keys also
+register a cleaner in extractor.CLEANER_REGISTRY.
+
+Keys (all optional):
+    remove          CSS selectors removed from the page before extraction.
+    drop_image_src  Substrings that disqualify an <img> by its src/data-src.
+    kill_texts      Regexes for widget headings ("Relacionadas"); the widget
+                    around the text (3+ links or 2+ images, up to 5 levels up) goes.
+    drop_texts      Regexes for stray lines ("Continua após a publicidade");
+                    the element holding the text goes.
+    extract         {'title', 'content', 'junk'} selectors for the site-specific
+                    extractor, tried before the generic trafilatura path.
+    json_ld_body    True when the site's NewsArticle JSON-LD carries the full
+                    articleBody: the article is built from the schema alone,
+                    before any cleaning, when the body is long enough.
+"""
+
+import logging
+import re
+from typing import Any, Dict, Optional
+from urllib.parse import urlparse
+
+import soupsieve
+from bs4 import BeautifulSoup, Tag
+
+logger = logging.getLogger(__name__)
+
+VIDEO_HOSTS = (
+    "youtube.com", "youtu.be", "player.vimeo.com", "vimeo.com",
+    "dailymotion.com", "player.dailymotion.com", "jwplayer", "brightcove",
+    "spotify.com", "soundcloud.com", "tiktok.com", "embed", "iframe",
+    "globo.com/play", "globoplay.globo.com", "tv.uol.com.br", "video"
+)
+
+SITE_RULES: Dict[str, Dict[str, Any]] = {
+    'lance.com.br': {
+        'remove': [
+            "header", "footer", "nav", "template", "script", "style", "svg",
+            # containers de navegação/rodapé/sidebars/carrosséis
+            'aside', '[class*="swiper"]', '[class*="carousel"]', '[class*="carrossel"]',
+            '[class*="related"]', '[class*="relacionad"]',
+            '[class*="mais-noticias"]', '[data-qa*="related"]', '[aria-label*="Relacionad"]',
+        ],
+        'kill_texts': [
+            r'\bRelacionad[oa]s?\b', r'\bFique por dentro\b', r'\bMais notícias\b',
+            r'\bÚltimas notícias\b', r'\bLeia também\b', r'\bVeja também\b',
+            r'\bVer mais notícias\b', r'\bTudo sobre\b', r'\bSiga o Lance!\b',
+        ],
+        'drop_texts': [r'continua\s+após\s+a\s+publicidade'],
+    },
+    'ge.globo.com': {
+        'remove': [
+            # Playlists and multicontent blocks
+            "div.show-multicontent-playlist-container",
+            "[data-block-type='playlist']",
+            "[data-track-category='multicontent'][data-track-action*='playlist']",
+            # Video players and wrappers
+            "article.content-video",
+            "div.cxm-video-block.content-video",
+            "div.content-media.content-video",
+            "div.content-video__video",
+            "div.poster.poster--hidden",
+            # Generic iframes/players
+            "iframe", "bs-player", "amp-iframe", "figure[class*='video']",
+            "div[class*='video']",
+            # Ads
+            "div.content-ads", "glb-ad",
+            # Text-based CTAs
+            "div.mc-column.content-text[data-block-type='unstyled']",
+        ],
+        'drop_image_src': VIDEO_HOSTS,
+        'drop_texts': [r'podcast ge corinthians', r'assista:? tudo sobre'],
+        'json_ld_body': True,
+    },
+    'infomoney.com.br': {
+        'remove': [
+            ".single__related", ".article__related", ".post-related", ".related-posts",
+            ".rm-related", ".block-related", ".single__sidebar", ".article__sidebar",
+            "section.single__see-also", ".wp-block-infomoney-blocks-infomoney-read-more",
+        ],
+        'extract': {
+            'title': 'h1.asset-title, h1.entry-title',
+            'content': 'div.article-content, div.entry-content',
+            'junk': ['.advertisement', '.leia-mais', '.box-leia-mais', '.box-newsletter', '.article-related-box'],
+        },
+    },
+    'estadao.com.br': {
+        'remove': [
+            ".links-relacionados", ".mat-relacionadas", ".es-relacionadas",
+            ".stories-related", ".see-also", ".link-relacionado", ".box-relacionadas",
+        ],
+        'extract': {
+            'title': 'h1.n--noticia__title, h1.entry-title',
+            'content': 'div.n--noticia__content.content, div.entry-content',
+            'junk': ['.veja-tambem', '.publicidade', '.box-relacionadas', '.posts-relacionados'],
+        },
+        'json_ld_body': True,
+    },
+}
+
+# Elementos inline sobem até o bloco que os contém ao aplicar drop_texts.
+_INLINE_TAGS = frozenset({"a", "b", "strong", "em", "i", "span", "small", "u"})
+
+
+class SiteRules:
+    """The rules of one site, compiled for a single matching pass per page."""
+
+    def __init__(self, domain: str, rules: Dict[str, Any]):
+        self.domain = domain
+        selectors = list(rules.get('remove', []))
+        for src in rules.get('drop_image_src', []):
+            selectors += [f'img[src*="{src}"]', f'img[data-src*="{src}"]']
+        self.remove = soupsieve.compile(", ".join(selectors)) if selectors else None
+
+        groups = []
+        if rules.get('kill_texts'):
+            groups.append("(?P<kill>" + "|".join(rules['kill_texts']) + ")")
+        if rules.get('drop_texts'):
+            groups.append("(?P<drop>" + "|".join(rules['drop_texts']) + ")")
+        self.text_rx = re.compile("|".join(groups), re.I) if groups else None
+
+        self.extract: Optional[Dict[str, Any]] = rules.get('extract')
+        self.json_ld_body: bool = bool(rules.get('json_ld_body'))
+
+    def clean(self, soup: BeautifulSoup) -> None:
+        """Applies the removal selectors, then the kill/drop texts, in place."""
+        logger.debug(f"Applying site rules for {self.domain}.")
+        if self.remove is not None:
+            for el in self.remove.select(soup):
+                if not el.decomposed:
+                    el.decompose()
+        if self.text_rx is None:
+            return
+
+        # Materializa a lista antes, pois a árvore é modificada durante o loop
+        for txt in list(soup.find_all(string=self.text_rx)):
+            # Defensive check for parent attribute: an earlier match may have removed it
+            node = getattr(txt, 'parent', None)
+            if node is None or node.decomposed:
+                continue
+            if self.text_rx.search(txt).lastgroup == 'kill':
+                _kill_widget(node)
+            else:
+                while node.parent is not None and node.name in _INLINE_TAGS:
+                    node = node.parent
+                node.decompose()
+
+
+def _kill_widget(node: Tag) -> None:
+    kill = node
+    for _ in range(5):
+        if not kill or not isinstance(kill, Tag) or kill.name in ('body', 'main', 'article'):
+            break
+        if len(kill.find_all('a')) >= 3 or len(kill.find_all('img')) >= 2:
+            kill.decompose()
+            break
+        kill = kill.parent
+
+
+COMPILED_SITE_RULES: Dict[str, SiteRules] = {
+    domain: SiteRules(domain, rules) for domain, rules in SITE_RULES.items()
+}
+
+
+def rules_for_host(host: str) -> Optional[SiteRules]:
+    """Returns the rules of the most specific registered domain `host` belongs to."""
+    labels = (host or '').lower().split(':', 1)[0].rstrip('.').split('.')
+    for i in range(len(labels) - 1):
+        rules = COMPILED_SITE_RULES.get('.'.join(labels[i:]))
+        if rules is not None:
+            return rules
+    return None
+
+
+def rules_for_url(url: str) -> Optional[SiteRules]:
+    return rules_for_host(urlparse(url or '').hostname or '')
@@ -7,36 +7,394 @@ import sqlite3
 import json
 import hashlib
 import logging
+import threading
+import time
+import zlib
 from datetime import datetime, timedelta
 from pathlib import Path
 from typing import List, Dict, Any, Optional
 
-from .config import PIPELINE_ORDER
+from .config import PIPELINE_ORDER, DATABASE_CONFIG
 
 logger = logging.getLogger(__name__)
 
+# Keeps every IN (...) list well below SQLite's bound-variable limit.
+SQL_IN_CHUNK_SIZE = 500
+
+
+def _chunks(values: List[Any], size: int):
+    """Yields successive slices of at most `size` elements."""
+    for start in range(0, len(values), size):
+        yield values[start:start + size]
+
+
+def connect(db_path: str = DATABASE_CONFIG['path'], readonly: bool = False,
+            check_same_thread: bool = True) -> sqlite3.Connection:
+    """
+    Opens a new SQLite connection tuned for concurrent use.
+
+    WAL lets the dashboard read while the pipeline writes, and `busy_timeout`
+    makes writers wait for each other instead of failing with "database is locked".
+    With `readonly=True` the file is opened with `mode=ro` and `query_only`, so
+    the connection can never take the write lock; the journal mode is left to
+    the pipeline, which owns the file. `check_same_thread=False` is for callers
+    that share one connection across threads behind their own lock.
+    """
+    if readonly:
+        target, uri = f"{Path(db_path).resolve().as_uri()}?mode=ro", True
+    else:
+        target, uri = db_path, False
+    conn = sqlite3.connect(
+        target,
+        detect_types=sqlite3.PARSE_DECLTYPES,
+        timeout=DATABASE_CONFIG['busy_timeout_ms'] / 1000,
+        uri=uri,
+        check_same_thread=check_same_thread,
+    )
+    conn.row_factory = sqlite3.Row
+    if readonly:
+        conn.execute("PRAGMA query_only=ON")
+    else:
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+    conn.execute(f"PRAGMA busy_timeout={int(DATABASE_CONFIG['busy_timeout_ms'])}")
+    conn.execute(f"PRAGMA mmap_size={int(DATABASE_CONFIG['mmap_size_bytes'])}")
+    # Negative values are interpreted by SQLite as KiB instead of pages.
+    conn.execute(f"PRAGMA cache_size=-{int(DATABASE_CONFIG['cache_size_kib'])}")
+    conn.execute("PRAGMA temp_store=MEMORY")
+    return conn
+
+
+_pool = threading.local()
+
+
+def get_connection(db_path: str = DATABASE_CONFIG['path'], readonly: bool = False,
+                   owner: str = 'store') -> sqlite3.Connection:
+    """
+    Returns the calling thread's pooled connection for `db_path`, opening it on first use.
+
+    sqlite3 connections may not cross threads, so the pool keeps one per thread,
+    database file, mode and `owner`. Each component that commits or rolls back
+    on its own (TaxonomyCache, LearnedSelectors) passes its own owner, so
+    ending one component's transaction never ends another's; pipeline cycles
+    and cleanup jobs on the same thread share the Database connection. (The
+    dashboard, whose requests each run on a new thread, keeps one shared
+    connection instead; see DashboardReader.)
+    """
+    key = f"{Path(db_path).resolve()}{'?mode=ro' if readonly else ''}#{owner}"
+    connections = getattr(_pool, 'connections', None)
+    if connections is None:
+        connections = _pool.connections = {}
+    conn = connections.get(key)
+    if conn is not None:
+        try:
+            conn.total_changes  # Raises if someone closed the pooled connection.
+        except sqlite3.ProgrammingError:
+            conn = None
+    if conn is None:
+        if not readonly:
+            Path(db_path).parent.mkdir(parents=True, exist_ok=True)
+        conn = connections[key] = connect(db_path, readonly=readonly)
+    return conn
+
+
+def close_thread_connections() -> None:
+    """Closes every pooled connection owned by the calling thread."""
+    connections = getattr(_pool, 'connections', None) or {}
+    while connections:
+        _, conn = connections.popitem()
+        try:
+            conn.close()
+        except sqlite3.Error as e:
+            logger.warning(f"Error closing pooled database connection: {e}")
+
+
+def archive_path_for(db_path: str) -> str:
+    """Returns where the cold archive of `db_path` lives (configured, or `<name>-archive.db` beside it)."""
+    if DATABASE_CONFIG['archive_path']:
+        return DATABASE_CONFIG['archive_path']
+    path = Path(db_path)
+    return str(path.with_name(f"{path.stem}-archive{path.suffix or '.db'}"))
+
+
+def _column_names(cursor: sqlite3.Cursor, table: str) -> set:
+    """Returns the column names currently defined on `table`."""
+    cursor.execute(f"PRAGMA table_info({table})")
+    return {row[1] for row in cursor.fetchall()}
+
+
+def _migration_add_fail_count(cursor: sqlite3.Cursor) -> None:
+    # update_article_status already increments this column on DEFERRED.
+    if 'fail_count' not in _column_names(cursor, 'seen_articles'):
+        cursor.execute("ALTER TABLE seen_articles ADD COLUMN fail_count INTEGER NOT NULL DEFAULT 0")
+
+
+def _migration_add_query_indexes(cursor: sqlite3.Cursor) -> None:
+    # get_articles_to_process: equality on source/status, rows come out already in
+    # published_at order and retry_at is checked from the index without a table lookup.
+    cursor.execute(
+        "CREATE INDEX IF NOT EXISTS idx_seen_articles_queue "
+        "ON seen_articles (source_id, status, published_at, retry_at)"
+    )
+    # cleanup_old_entries: covering for `status IN (...) AND inserted_at < ?` returning ids.
+    cursor.execute(
+        "CREATE INDEX IF NOT EXISTS idx_seen_articles_status_inserted "
+        "ON seen_articles (status, inserted_at)"
+    )
+    # Dashboard recency queries.
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_seen_articles_inserted ON seen_articles (inserted_at)")
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_seen_articles_url ON seen_articles (url)")
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_posts_seen_article ON posts (seen_article_id)")
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_posts_created ON posts (created_at)")
+
+
+def _migration_enable_incremental_vacuum(cursor: sqlite3.Cursor) -> None:
+    # Changing auto_vacuum on an existing file only takes effect after a full VACUUM,
+    # which cannot run inside a transaction. Runs once, before the scheduler starts.
+    if cursor.execute("PRAGMA auto_vacuum").fetchone()[0] != 2:
+        cursor.execute("PRAGMA auto_vacuum = INCREMENTAL")
+        cursor.execute("VACUUM")
+
+
+def _migration_add_taxonomy_cache(cursor: sqlite3.Cursor) -> None:
+    # Replaces data/taxonomy_cache.json; expires_at is a unix timestamp.
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS taxonomy_cache (
+            slug TEXT PRIMARY KEY,
+            data TEXT NOT NULL,
+            expires_at REAL NOT NULL
+        )
+    ''')
+
+
+# Tables whose total row count is kept in table_counters.
+COUNTED_TABLES = ('posts', 'failures')
+
+
+def _migration_add_counters(cursor: sqlite3.Cursor) -> None:
+    # Row counts maintained by triggers, so the dashboard never scans the big tables.
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS article_counters (
+            source_id TEXT NOT NULL,
+            status TEXT NOT NULL,
+            count INTEGER NOT NULL DEFAULT 0,
+            PRIMARY KEY (source_id, status)
+        ) WITHOUT ROWID
+    ''')
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS table_counters (
+            name TEXT PRIMARY KEY,
+            count INTEGER NOT NULL DEFAULT 0
+        ) WITHOUT ROWID
+    ''')
+
+    def bump(source, status, delta):
+        return (
+            f"INSERT INTO article_counters (source_id, status, count) "
+            f"VALUES ({source}.source_id, COALESCE({status}.status, 'NEW'), {delta}) "
+            f"ON CONFLICT(source_id, status) DO UPDATE SET count = count + ({delta});"
+        )
+
+    cursor.execute(f'''
+        CREATE TRIGGER IF NOT EXISTS trg_seen_articles_count_insert AFTER INSERT ON seen_articles
+        BEGIN {bump('NEW', 'NEW', 1)} END
+    ''')
+    cursor.execute(f'''
+        CREATE TRIGGER IF NOT EXISTS trg_seen_articles_count_delete AFTER DELETE ON seen_articles
+        BEGIN {bump('OLD', 'OLD', -1)} END
+    ''')
+    cursor.execute(f'''
+        CREATE TRIGGER IF NOT EXISTS trg_seen_articles_count_update AFTER UPDATE OF status, source_id ON seen_articles
+        WHEN OLD.status IS NOT NEW.status OR OLD.source_id IS NOT NEW.source_id
+        BEGIN {bump('OLD', 'OLD', -1)} {bump('NEW', 'NEW', 1)} END
+    ''')
+    for table in COUNTED_TABLES:
+        cursor.execute(f'''
+            CREATE TRIGGER IF NOT EXISTS trg_{table}_count_insert AFTER INSERT ON {table}
+            BEGIN
+                INSERT INTO table_counters (name, count) VALUES ('{table}', 1)
+                ON CONFLICT(name) DO UPDATE SET count = count + 1;
+            END
+        ''')
+        cursor.execute(f'''
+            CREATE TRIGGER IF NOT EXISTS trg_{table}_count_delete AFTER DELETE ON {table}
+            BEGIN
+                UPDATE table_counters SET count = count - 1 WHERE name = '{table}';
+            END
+        ''')
+    _recount(cursor)
+
+
+def _count_rows(cursor: sqlite3.Cursor) -> tuple:
+    """Counts seen_articles per (source_id, status) and the COUNTED_TABLES from scratch."""
+    cursor.execute(
+        "SELECT source_id, COALESCE(status, 'NEW') AS status, COUNT(*) AS count "
+        "FROM seen_articles GROUP BY 1, 2"
+    )
+    articles = {(row[0], row[1]): row[2] for row in cursor.fetchall()}
+    tables = {table: cursor.execute(f"SELECT COUNT(*) FROM {table}").fetchone()[0] for table in COUNTED_TABLES}
+    return articles, tables
+
+
+def _recount(cursor: sqlite3.Cursor) -> None:
+    articles, tables = _count_rows(cursor)
+    cursor.execute("DELETE FROM article_counters")
+    cursor.executemany(
+        "INSERT INTO article_counters (source_id, status, count) VALUES (?, ?, ?)",
+        [(source_id, status, count) for (source_id, status), count in articles.items()]
+    )
+    cursor.execute("DELETE FROM table_counters")
+    cursor.executemany("INSERT INTO table_counters (name, count) VALUES (?, ?)", tables.items())
+
+
+def read_counters(conn: sqlite3.Connection) -> Dict[str, Any]:
+    """
+    Reads the materialized row counts: totals plus seen_articles per status and per source.
+
+    Only the small counter tables are read, never seen_articles itself.
+    """
+    by_source: Dict[str, Dict[str, int]] = {}
+    by_status: Dict[str, int] = {}
+    for row in conn.execute("SELECT source_id, status, count FROM article_counters WHERE count != 0"):
+        by_source.setdefault(row[0], {})[row[1]] = row[2]
+        by_status[row[1]] = by_status.get(row[1], 0) + row[2]
+    tables = {row[0]: row[1] for row in conn.execute("SELECT name, count FROM table_counters")}
+    return {
+        'seen_articles': sum(by_status.values()),
+        'posts': tables.get('posts', 0),
+        'failures': tables.get('failures', 0),
+        'by_status': by_status,
+        'by_source': by_source,
+    }
+
+
+def _migration_add_article_checkpoints(cursor: sqlite3.Cursor) -> None:
+    # Stage outputs (zlib-compressed JSON) that let a retried article skip finished stages.
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS article_checkpoints (
+            seen_article_id INTEGER NOT NULL,
+            stage TEXT NOT NULL,
+            data BLOB NOT NULL,
+            updated_at DATETIME DEFAULT (strftime('%Y-%m-%d %H:%M:%f', 'now')),
+            PRIMARY KEY (seen_article_id, stage)
+        ) WITHOUT ROWID
+    ''')
+
+
+def _migration_add_article_events(cursor: sqlite3.Cursor) -> None:
+    # Append-only log of per-stage outcomes; never updated, only inserted and cleaned up.
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS article_events (
+            id INTEGER PRIMARY KEY,
+            seen_article_id INTEGER NOT NULL,
+            source_id TEXT NOT NULL,
+            stage TEXT NOT NULL,
+            status TEXT NOT NULL,
+            created_at DATETIME NOT NULL,
+            duration_ms INTEGER,
+            bytes INTEGER,
+            error_class TEXT
+        )
+    ''')
+    # Rollups scan one day range and group by source/stage.
+    cursor.execute(
+        "CREATE INDEX IF NOT EXISTS idx_article_events_created "
+        "ON article_events (created_at, source_id, stage, duration_ms)"
+    )
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_article_events_article ON article_events (seen_article_id)")
+
+
+def _migration_add_learned_selectors(cursor: sqlite3.Cursor) -> None:
+    # Per-domain content-root selectors and how often they held (see learned_selectors.py).
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS learned_selectors (
+            domain TEXT NOT NULL,
+            selector TEXT NOT NULL,
+            confirmations INTEGER NOT NULL DEFAULT 0,
+            failures INTEGER NOT NULL DEFAULT 0,
+            updated_at REAL NOT NULL,
+            PRIMARY KEY (domain, selector)
+        )
+    ''')
+
+
+def _migration_queue_index_newest_first(cursor: sqlite3.Cursor) -> None:
+    # get_articles_to_process takes the newest NEW rows first; with published_at
+    # descending in the index, that order still needs no sort.
+    cursor.execute("DROP INDEX IF EXISTS idx_seen_articles_queue")
+    cursor.execute(
+        "CREATE INDEX idx_seen_articles_queue "
+        "ON seen_articles (source_id, status, published_at DESC, retry_at)"
+    )
+
+
+# Ordered schema migrations: (version, description, function, transactional).
+# The applied version is stored in SQLite's `user_version` header field. Never
+# edit a released entry; append a new one instead.
+SCHEMA_MIGRATIONS = [
+    (1, "add seen_articles.fail_count", _migration_add_fail_count, True),
+    (2, "add indexes for queue, cleanup and dashboard queries", _migration_add_query_indexes, True),
+    (3, "enable incremental auto_vacuum", _migration_enable_incremental_vacuum, False),
+    (4, "add taxonomy_cache table", _migration_add_taxonomy_cache, True),
+    (5, "add trigger-maintained row counters", _migration_add_counters, True),
+    (6, "add article_checkpoints table", _migration_add_article_checkpoints, True),
+    (7, "add article_events log", _migration_add_article_events, True),
+    (8, "add learned_selectors table", _migration_add_learned_selectors, True),
+    (9, "order the queue index by newest published_at", _migration_queue_index_newest_first, True),
+]
+
+_TAXONOMY_UPSERT_SQL = (
+    "INSERT INTO taxonomy_cache (slug, data, expires_at) VALUES (?, ?, ?) "
+    "ON CONFLICT(slug) DO UPDATE SET data = excluded.data, expires_at = excluded.expires_at"
+)
+
+# Terminal statuses that cleanup is allowed to move to the archive.
+CLEANUP_STATUSES = ('PUBLISHED', 'FAILED')
+
+# Schema name the cold archive database is attached under.
+ARCHIVE_SCHEMA = 'archive'
+
+
 class Database:
     """Handles all database operations for the application."""
 
-    def __init__(self, db_path: str = 'data/app.db'):
+    def __init__(self, db_path: str = DATABASE_CONFIG['path'], archive_path: Optional[str] = None):
         """
         Initializes the database connection.
 
         Args:
             db_path: The path to the SQLite database file.
+            archive_path: The cold archive database; defaults to archive_path_for(db_path).
         """
-        db_file = Path(db_path)
-        db_file.parent.mkdir(parents=True, exist_ok=True)
-        
         self.db_path = db_path
+        self.archive_path = archive_path or archive_path_for(db_path)
         self.conn = None
+        # Write-behind buffer for update_article_status: (article_id, status, retry_at, reason).
+        self._pending_status: List[tuple] = []
+        self._last_status_flush = time.monotonic()
+        self.status_flush_batch_size = DATABASE_CONFIG['status_flush_batch_size']
+        self.status_flush_interval_seconds = DATABASE_CONFIG['status_flush_interval_seconds']
+        # Write-behind buffer for record_event, flushed on its own schedule.
+        self._pending_events: List[tuple] = []
+        self._last_event_flush = time.monotonic()
+        self.event_flush_batch_size = DATABASE_CONFIG['event_flush_batch_size']
+        self.event_flush_interval_seconds = DATABASE_CONFIG['event_flush_interval_seconds']
         try:
-            self.conn = sqlite3.connect(self.db_path, detect_types=sqlite3.PARSE_DECLTYPES, timeout=10)
-            self.conn.row_factory = sqlite3.Row
+            self.conn = get_connection(self.db_path)
+            self._attach_archive()
         except sqlite3.Error as e:
             logger.critical(f"Database connection error: {e}")
             raise
 
+    def _attach_archive(self):
+        """Attaches the archive database to the pooled connection, once per connection."""
+        attached = {row[1] for row in self.conn.execute("PRAGMA database_list")}
+        if ARCHIVE_SCHEMA in attached:
+            return
+        Path(self.archive_path).parent.mkdir(parents=True, exist_ok=True)
+        self.conn.execute(f"ATTACH DATABASE ? AS {ARCHIVE_SCHEMA}", (self.archive_path,))
+        self.conn.execute(f"PRAGMA {ARCHIVE_SCHEMA}.journal_mode=WAL")
+
     def _get_cursor(self):
         """Returns a cursor for the database connection."""
         if not self.conn:
@@ -82,6 +440,25 @@ class Database:
             ''')
             cursor.execute("INSERT OR IGNORE INTO pipeline_state (key, value) VALUES ('last_processed_feed_index', '-1')")
 
+            # Histórico frio de deduplicação: só o necessário para reconhecer um artigo já visto
+            cursor.execute(f'''
+                CREATE TABLE IF NOT EXISTS {ARCHIVE_SCHEMA}.seen_articles_archive (
+                    source_id TEXT NOT NULL,
+                    external_id TEXT NOT NULL,
+                    url TEXT,
+                    archived_at DATETIME DEFAULT (strftime('%Y-%m-%d %H:%M:%f', 'now')),
+                    PRIMARY KEY (source_id, external_id)
+                ) WITHOUT ROWID
+            ''')
+            cursor.execute(
+                f"CREATE INDEX IF NOT EXISTS {ARCHIVE_SCHEMA}.idx_seen_articles_archive_url "
+                f"ON seen_articles_archive (url)"
+            )
+            cursor.execute(
+                f"CREATE INDEX IF NOT EXISTS {ARCHIVE_SCHEMA}.idx_seen_articles_archive_archived "
+                f"ON seen_articles_archive (archived_at)"
+            )
+
             # Tabela para rastrear o estado do circuit breaker por feed
             cursor.execute('''
                 CREATE TABLE IF NOT EXISTS feed_status (
@@ -123,16 +500,59 @@ class Database:
                 )
             ''')
             self.conn.commit()
+            self.migrate()
             logger.info("Database initialized successfully.")
         except sqlite3.Error as e:
             logger.error(f"Database initialization failed: {e}", exc_info=True)
             raise
 
+    def get_schema_version(self) -> int:
+        """Returns the schema version recorded in the database file."""
+        return self._get_cursor().execute("PRAGMA user_version").fetchone()[0]
+
+    def migrate(self) -> int:
+        """
+        Applies pending SCHEMA_MIGRATIONS in order, each in its own transaction.
+
+        Returns:
+            The schema version after migrating.
+        """
+        cursor = self._get_cursor()
+        for version, description, migration, transactional in SCHEMA_MIGRATIONS:
+            if self.get_schema_version() >= version:
+                continue
+            try:
+                if not transactional:
+                    logger.info(f"Applying database migration {version}: {description}")
+                    migration(cursor)
+                    cursor.execute(f"PRAGMA user_version = {int(version)}")
+                    continue
+                cursor.execute("BEGIN IMMEDIATE")
+                # Re-check under the write lock: another process may have migrated meanwhile.
+                if self.get_schema_version() >= version:
+                    self.conn.rollback()
+                    continue
+                logger.info(f"Applying database migration {version}: {description}")
+                migration(cursor)
+                cursor.execute(f"PRAGMA user_version = {int(version)}")
+                self.conn.commit()
+            except sqlite3.Error as e:
+                logger.error(f"Database migration {version} failed: {e}", exc_info=True)
+                self.conn.rollback()
+                raise
+        return self.get_schema_version()
+
     def filter_new_articles(self, source_id: str, items: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
         """
         Filters a list of feed items, returning only those not already in the database.
         New articles are inserted into the 'seen_articles' table with 'NEW' status.
 
+        The whole batch is handled in a single write transaction: one chunked
+        `IN (...)` lookup for known ids, one `executemany` insert and one lookup
+        for the generated ids, regardless of how many items the feed returned.
+        Ids not found in the hot table are looked up in the archive before being
+        treated as new, so articles seen months ago are not ingested again.
+
         Args:
             source_id: The ID of the feed source.
             items: A list of normalized feed items.
@@ -140,30 +560,74 @@ class Database:
         Returns:
             A list of new articles that were added to the database.
         """
+        # Deduplicate the batch in Python first, keeping feed order (first occurrence wins).
+        candidates: Dict[str, Dict[str, Any]] = {}
+        for item in items:
+            ext_id = item.get("id")
+            # Defensive check: if 'id' is missing, generate it from the URL.
+            if not ext_id:
+                url = item.get("url") or ""
+                if url:
+                    ext_id = hashlib.sha256(url.encode("utf-8")).hexdigest()
+                    item["id"] = ext_id  # Add it back to the item for later use
+                    logger.warning(f"Item for source '{source_id}' missing 'id'. Generated from URL: {item.get('title')}")
+                else:
+                    logger.warning(f"Item for source '{source_id}' missing both 'id' and 'url', skipping: {item.get('title', 'No Title')}")
+                    continue
+            candidates.setdefault(ext_id, item)
+
+        if not candidates:
+            return []
+
         new_articles = []
         try:
             cursor = self._get_cursor()
-            for item in items:
-                ext_id = item.get("id")
-                # Defensive check: if 'id' is missing, generate it from the URL.
-                if not ext_id:
-                    url = item.get("url") or ""
-                    if url:
-                        ext_id = hashlib.sha256(url.encode("utf-8")).hexdigest()
-                        item["id"] = ext_id  # Add it back to the item for later use
-                        logger.warning(f"Item for source '{source_id}' missing 'id'. Generated from URL: {item.get('title')}")
-                    else:
-                        logger.warning(f"Item for source '{source_id}' missing both 'id' and 'url', skipping: {item.get('title', 'No Title')}")
-                        continue
-
-                cursor.execute("SELECT id FROM seen_articles WHERE source_id = ? AND external_id = ?", (source_id, ext_id))
-                if cursor.fetchone() is None:
-                    # Item is new, insert it.
+            # Take the write lock up front so a concurrent worker on the same feed
+            # cannot slip an insert between our lookup and our insert.
+            cursor.execute("BEGIN IMMEDIATE")
+
+            ext_ids = list(candidates)
+            existing = set()
+            for chunk in _chunks(ext_ids, SQL_IN_CHUNK_SIZE):
+                placeholders = ','.join('?' for _ in chunk)
+                cursor.execute(
+                    f"SELECT external_id FROM seen_articles WHERE source_id = ? AND external_id IN ({placeholders})",
+                    (source_id, *chunk)
+                )
+                existing.update(row['external_id'] for row in cursor.fetchall())
+
+            unseen = [ext_id for ext_id in ext_ids if ext_id not in existing]
+            for chunk in _chunks(unseen, SQL_IN_CHUNK_SIZE):
+                placeholders = ','.join('?' for _ in chunk)
+                cursor.execute(
+                    f"SELECT external_id FROM {ARCHIVE_SCHEMA}.seen_articles_archive "
+                    f"WHERE source_id = ? AND external_id IN ({placeholders})",
+                    (source_id, *chunk)
+                )
+                existing.update(row['external_id'] for row in cursor.fetchall())
+
+            fresh_ids = [ext_id for ext_id in unseen if ext_id not in existing]
+            if fresh_ids:
+                # sqlite3's executemany discards RETURNING rows, so the generated ids
+                # are read back with one lookup while the write lock is still held.
+                cursor.executemany(
+                    "INSERT INTO seen_articles (source_id, external_id, url, published_at) VALUES (?, ?, ?, ?) "
+                    "ON CONFLICT(source_id, external_id) DO NOTHING",
+                    [(source_id, ext_id, candidates[ext_id].get('url'), candidates[ext_id].get('published'))
+                     for ext_id in fresh_ids]
+                )
+                db_ids: Dict[str, int] = {}
+                for chunk in _chunks(fresh_ids, SQL_IN_CHUNK_SIZE):
+                    placeholders = ','.join('?' for _ in chunk)
                     cursor.execute(
-                        "INSERT INTO seen_articles (source_id, external_id, url, published_at) VALUES (?, ?, ?, ?)",
-                        (source_id, ext_id, item.get('url'), item.get('published'))
+                        f"SELECT id, external_id FROM seen_articles WHERE source_id = ? AND external_id IN ({placeholders})",
+                        (source_id, *chunk)
                     )
-                    item['db_id'] = cursor.lastrowid
+                    db_ids.update((row['external_id'], row['id']) for row in cursor.fetchall())
+
+                for ext_id in fresh_ids:
+                    item = candidates[ext_id]
+                    item['db_id'] = db_ids[ext_id]
                     new_articles.append(item)
             self.conn.commit()
         except sqlite3.Error as e:
@@ -178,9 +642,13 @@ class Database:
 
 
     def save_processed_post(self, article_db_id: int, wp_post_id: int) -> None:
-        """Saves a record of a successfully published post."""
+        """
+        Saves a record of a successfully published post.
+        Buffered status updates are written in the same transaction.
+        """
         try:
             cursor = self._get_cursor()
+            flushed = self._apply_pending_status(cursor)
             # First, update the article's status to 'PUBLISHED' and clear any previous failure reason
             cursor.execute(
                 "UPDATE seen_articles SET status = 'PUBLISHED', fail_reason = NULL WHERE id = ?",
@@ -191,7 +659,11 @@ class Database:
                 "INSERT INTO posts (seen_article_id, wp_post_id) VALUES (?, ?)",
                 (article_db_id, wp_post_id)
             )
+            # Published: the stage checkpoints will never be resumed from.
+            cursor.execute("DELETE FROM article_checkpoints WHERE seen_article_id = ?", (article_db_id,))
             self.conn.commit()
+            del self._pending_status[:flushed]
+            self._last_status_flush = time.monotonic()
             logger.info(f"Successfully recorded published post for article DB ID {article_db_id} (WP Post ID: {wp_post_id}).")
         except sqlite3.IntegrityError:
             logger.warning(f"Post record for article DB ID {article_db_id} already exists.")
@@ -219,6 +691,7 @@ class Database:
             self.conn.commit()
         except sqlite3.Error as e:
             logger.error(f"Failed to set pipeline state for key '{key}': {e}")
+            self.conn.rollback()
 
     def get_consecutive_failures(self, source_id: str) -> int:
         """Gets the consecutive failure count for a feed source."""
@@ -242,6 +715,7 @@ class Database:
             self.conn.commit()
         except sqlite3.Error as e:
             logger.error(f"Failed to increment consecutive failures for '{source_id}': {e}")
+            self.conn.rollback()
 
     def reset_consecutive_failures(self, source_id: str):
         """Resets the consecutive failure count for a feed source."""
@@ -251,11 +725,27 @@ class Database:
             self.conn.commit()
         except sqlite3.Error as e:
             logger.error(f"Failed to reset consecutive failures for '{source_id}': {e}")
+            self.conn.rollback()
 
-    def update_article_status(self, article_id: int, status: str, retry_at: datetime | None = None, reason: str | None = None):
-        """Updates the status of an article in the seen_articles table."""
-        try:
-            cursor = self._get_cursor()
+    def update_article_status(self, article_id: int, status: str, retry_at: datetime | None = None,
+                              reason: str | None = None, sync: bool = False):
+        """
+        Updates the status of an article in the seen_articles table.
+
+        Updates are buffered and written together in one transaction once
+        `status_flush_batch_size` accumulate or `status_flush_interval_seconds`
+        have passed. Pass `sync=True` for transitions that must be durable before
+        the caller continues (e.g. claiming an article).
+        """
+        self._pending_status.append((article_id, status, retry_at, reason))
+        if (sync or len(self._pending_status) >= self.status_flush_batch_size or
+                time.monotonic() - self._last_status_flush >= self.status_flush_interval_seconds):
+            self.flush_status_updates()
+
+    def _apply_pending_status(self, cursor: sqlite3.Cursor) -> int:
+        """Executes the buffered status updates on `cursor` without committing."""
+        pending = list(self._pending_status)
+        for article_id, status, retry_at, reason in pending:
             if status == 'DEFERRED':
                 cursor.execute(
                     "UPDATE seen_articles SET status = ?, retry_at = ?, fail_reason = ?, fail_count = fail_count + 1 WHERE id = ?",
@@ -268,20 +758,122 @@ class Database:
                         (status, reason, article_id))
                 else:
                     cursor.execute("UPDATE seen_articles SET status = ? WHERE id = ?", (status, article_id))
+        return len(pending)
+
+    def flush_status_updates(self) -> int:
+        """Writes all buffered status updates in a single transaction. Returns how many were written."""
+        if not self._pending_status:
+            return 0
+        flushed = 0
+        try:
+            cursor = self._get_cursor()
+            flushed = self._apply_pending_status(cursor)
             self.conn.commit()
         except sqlite3.Error as e:
-            logger.error(f"Failed to update article status for id {article_id}: {e}")
+            ids = [update[0] for update in self._pending_status]
+            logger.error(f"Failed to update article status for ids {ids}: {e}")
+            if self.conn:
+                self.conn.rollback()
+            flushed = len(self._pending_status)  # Dropped, as a failed direct update would be.
+        del self._pending_status[:flushed]
+        self._last_status_flush = time.monotonic()
+        return flushed
+
+    def record_event(self, article_id: int, source_id: str, stage: str, status: str,
+                     duration_ms: int | None = None, size_bytes: int | None = None,
+                     error_class: str | None = None) -> None:
+        """
+        Appends an entry to the article_events log.
+
+        Events are timestamped now but buffered, and written with one `executemany`
+        once `event_flush_batch_size` accumulate or `event_flush_interval_seconds`
+        have passed, so logging never adds a commit to the article's hot path.
+        """
+        created_at = datetime.utcnow().strftime('%Y-%m-%d %H:%M:%S.%f')[:-3]
+        self._pending_events.append(
+            (article_id, source_id, stage, status, created_at, duration_ms, size_bytes, error_class))
+        if (len(self._pending_events) >= self.event_flush_batch_size or
+                time.monotonic() - self._last_event_flush >= self.event_flush_interval_seconds):
+            self.flush_events()
+
+    def flush_events(self) -> int:
+        """Writes all buffered events in a single transaction. Returns how many were written."""
+        if not self._pending_events:
+            return 0
+        pending = list(self._pending_events)
+        try:
+            cursor = self._get_cursor()
+            cursor.executemany(
+                "INSERT INTO article_events (seen_article_id, source_id, stage, status, created_at, "
+                "duration_ms, bytes, error_class) VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                pending
+            )
+            self.conn.commit()
+        except sqlite3.Error as e:
+            # Analytics only: losing a batch must never disturb the pipeline.
+            logger.error(f"Failed to write {len(pending)} article events: {e}")
+            if self.conn:
+                self.conn.rollback()
+        del self._pending_events[:len(pending)]
+        self._last_event_flush = time.monotonic()
+        return len(pending)
+
+    def get_stage_latency_rollup(self, since: datetime, until: datetime | None = None) -> List[Dict[str, Any]]:
+        """
+        Summarizes stage durations per day, source and stage since `since` (UTC).
+
+        Percentiles use the nearest-rank method over the events that carry a
+        duration, computed with window functions so no rows leave SQLite.
+
+        Returns:
+            Dicts with day, source_id, stage, events, failures, p50_ms and p95_ms.
+        """
+        self.flush_events()
+        until = until or datetime.utcnow() + timedelta(days=1)
+        try:
+            cursor = self._get_cursor()
+            cursor.execute("""
+                WITH ranked AS (
+                    SELECT date(created_at) AS day, source_id, stage, status, duration_ms,
+                           ROW_NUMBER() OVER w AS rn,
+                           COUNT(duration_ms) OVER (PARTITION BY date(created_at), source_id, stage) AS n
+                    FROM article_events
+                    WHERE created_at >= ? AND created_at < ?
+                    WINDOW w AS (PARTITION BY date(created_at), source_id, stage
+                                 ORDER BY duration_ms IS NULL, duration_ms)
+                )
+                SELECT day, source_id, stage,
+                       COUNT(*) AS events,
+                       SUM(status = 'failed') AS failures,
+                       MAX(CASE WHEN rn = (n * 50 + 99) / 100 THEN duration_ms END) AS p50_ms,
+                       MAX(CASE WHEN rn = (n * 95 + 99) / 100 THEN duration_ms END) AS p95_ms
+                FROM ranked
+                GROUP BY day, source_id, stage
+                ORDER BY day, source_id, stage
+            """, (since.strftime('%Y-%m-%d %H:%M:%S'), until.strftime('%Y-%m-%d %H:%M:%S')))
+            return [dict(row) for row in cursor.fetchall()]
+        except sqlite3.Error as e:
+            logger.error(f"Failed to compute stage latency rollup: {e}")
+            return []
 
     def get_articles_to_process(self, source_id: str, limit: int) -> list:
-        """Gets new or deferred articles for a given feed source."""
+        """
+        Gets the next articles of a feed to work on: DEFERRED ones whose retry_at
+        has passed first, then NEW ones, newest published first within each status.
+
+        NEW rows left over from an earlier cycle (the batch was full) come back
+        here, so an article seen once in the feed is never lost.
+        """
+        self.flush_status_updates()
         try:
             cursor = self._get_cursor()
             now = datetime.utcnow()
-            # Prioritizes deferred articles that are ready for retry, then new ones.
+            # 'DEFERRED' < 'NEW' and the queue index keeps published_at descending,
+            # so retries come first and then the freshest stories, without a sort.
             cursor.execute("""
-                SELECT id, external_id, url, status FROM seen_articles
-                WHERE source_id = ? AND (status = 'NEW' OR (status = 'DEFERRED' AND retry_at < ?))
-                ORDER BY status DESC, published_at DESC
+                SELECT id, external_id, url, status, fail_count, fail_reason, inserted_at FROM seen_articles
+                WHERE source_id = ? AND status IN ('NEW', 'DEFERRED') AND (status = 'NEW' OR retry_at < ?)
+                ORDER BY status, published_at DESC
                 LIMIT ?
             """, (source_id, now, limit))
             return cursor.fetchall()
@@ -289,107 +881,404 @@ class Database:
             logger.error(f"Failed to get articles to process for source_id '{source_id}': {e}")
             return []
 
-    def cleanup_old_entries(self, cutoff_time: datetime) -> int:
+    def save_checkpoint(self, article_id: int, stage: str, data: Any) -> None:
         """
-        Deletes records from seen_articles and posts older than the cutoff time.
-        Only deletes articles with status 'PUBLISHED' or 'FAILED'.
+        Stores the output of a pipeline stage for an article, replacing any previous one.
 
-        Args:
-            cutoff_time: The datetime threshold. Records older than this will be deleted.
+        The data is JSON-encoded and zlib-compressed, and committed immediately so a
+        crash in a later stage cannot lose it.
+        """
+        payload = zlib.compress(json.dumps(data, ensure_ascii=False, default=str).encode('utf-8'))
+        try:
+            cursor = self._get_cursor()
+            cursor.execute(
+                "INSERT INTO article_checkpoints (seen_article_id, stage, data) VALUES (?, ?, ?) "
+                "ON CONFLICT(seen_article_id, stage) DO UPDATE SET data = excluded.data, "
+                "updated_at = strftime('%Y-%m-%d %H:%M:%f', 'now')",
+                (article_id, stage, payload)
+            )
+            self.conn.commit()
+        except sqlite3.Error as e:
+            logger.error(f"Failed to save '{stage}' checkpoint for article {article_id}: {e}")
+            self.conn.rollback()
+
+    def load_checkpoints(self, article_id: int) -> Dict[str, Any]:
+        """Returns the checkpointed stage outputs of an article, keyed by stage."""
+        try:
+            cursor = self._get_cursor()
+            cursor.execute(
+                "SELECT stage, data FROM article_checkpoints WHERE seen_article_id = ?", (article_id,))
+            checkpoints = {}
+            for row in cursor.fetchall():
+                try:
+                    checkpoints[row['stage']] = json.loads(zlib.decompress(row['data']).decode('utf-8'))
+                except (zlib.error, ValueError) as e:
+                    logger.warning(f"Ignoring corrupt '{row['stage']}' checkpoint for article {article_id}: {e}")
+            return checkpoints
+        except sqlite3.Error as e:
+            logger.error(f"Failed to load checkpoints for article {article_id}: {e}")
+            return {}
+
+    def expire_stale_articles(self, source_id: str, inserted_before: datetime) -> int:
+        """
+        Marks NEW and DEFERRED articles first seen before `inserted_before` as FAILED,
+        so a backlog of leftovers is not published long after the news broke.
 
         Returns:
-            The number of records deleted from seen_articles.
+            The number of articles that were given up on.
         """
+        self.flush_status_updates()
         try:
             cursor = self._get_cursor()
+            cursor.execute("""
+                UPDATE seen_articles
+                SET status = 'FAILED',
+                    fail_reason = CASE status WHEN 'NEW' THEN 'Expired before processing'
+                                  ELSE 'Retry window expired: ' || COALESCE(fail_reason, '') END
+                WHERE source_id = ? AND status IN ('NEW', 'DEFERRED') AND inserted_at < ?
+            """, (source_id, inserted_before))
+            self.conn.commit()
+            return cursor.rowcount
+        except sqlite3.Error as e:
+            logger.error(f"Failed to expire stale articles for source_id '{source_id}': {e}")
+            self.conn.rollback()
+            return 0
 
-            # Find IDs of old articles to delete
-            cursor.execute(
-                "SELECT id FROM seen_articles WHERE inserted_at < ? AND status IN ('PUBLISHED', 'FAILED')",
-                (cutoff_time,)
-            )
-            article_ids_to_delete = [row['id'] for row in cursor.fetchall()]
+    def cleanup_old_entries(self, cutoff_time: datetime, batch_size: int = 500, pause_seconds: float = 0.05) -> int:
+        """
+        Moves records older than the cutoff time out of the hot tables.
+        Only articles with status 'PUBLISHED' or 'FAILED' are moved.
 
-            if not article_ids_to_delete:
-                return 0
+        Each article's source, external id and URL are copied into the archive,
+        then its seen_articles, posts and article_checkpoints rows are deleted.
+        article_events are kept for analytics and pruned by prune_events. Rows are handled in
+        `id BETWEEN ? AND ?` windows of `batch_size` matching rows, found with a
+        keyset seek along the rowid, so each window is a rowid range scan and
+        ids that do not match add no windows and no pauses. Each window is
+        committed on its own, and the write lock is released for `pause_seconds`
+        after every window that deleted rows so the pipeline's writers never
+        wait behind a long cleanup.
 
-            placeholders = ','.join('?' for _ in article_ids_to_delete)
+        Args:
+            cutoff_time: The datetime threshold. Records older than this will be archived.
+            batch_size: How many matching rows each window covers.
+            pause_seconds: How long to yield the write lock between windows.
 
-            cursor.execute(f"DELETE FROM posts WHERE seen_article_id IN ({placeholders})", article_ids_to_delete)
-            cursor.execute(f"DELETE FROM seen_articles WHERE id IN ({placeholders})", article_ids_to_delete)
+        Returns:
+            The number of records removed from seen_articles.
+        """
+        status_placeholders = ','.join('?' for _ in CLEANUP_STATUSES)
+        match = f"status IN ({status_placeholders}) AND inserted_at < ?"
+        match_params = (*CLEANUP_STATUSES, cutoff_time)
+        # NOT INDEXED keeps SQLite on the rowid: the status index would make every
+        # window rescan and sort all the remaining matches.
+        hot = "seen_articles NOT INDEXED"
+        deleted_count = 0
+        try:
+            cursor = self._get_cursor()
+            lo, last_deleted = 0, 0
+            while True:
+                # The id of the batch_size-th match from lo bounds the window; past the
+                # last full batch, the window ends at the last match.
+                cursor.execute(
+                    f"SELECT id FROM {hot} WHERE id >= ? AND {match} ORDER BY id LIMIT 1 OFFSET ?",
+                    (lo, *match_params, batch_size - 1)
+                )
+                row = cursor.fetchone()
+                last = row is None
+                if last:
+                    cursor.execute(f"SELECT MAX(id) FROM {hot} WHERE id >= ? AND {match}", (lo, *match_params))
+                    hi = cursor.fetchone()[0]
+                    if hi is None:
+                        break
+                else:
+                    hi = row[0]
 
-            deleted_count = cursor.rowcount
-            self.conn.commit()
+                if last_deleted and pause_seconds:
+                    # Only between two windows, and only after one that removed rows.
+                    time.sleep(pause_seconds)
+                window = (lo, hi, *match_params)
+                # Archive first: if the delete is lost the rows are merely archived twice.
+                cursor.execute(
+                    f"INSERT OR IGNORE INTO {ARCHIVE_SCHEMA}.seen_articles_archive (source_id, external_id, url) "
+                    f"SELECT source_id, external_id, url FROM {hot} WHERE id BETWEEN ? AND ? AND {match}",
+                    window
+                )
+                for table in ('posts', 'article_checkpoints'):
+                    cursor.execute(
+                        f"DELETE FROM {table} WHERE seen_article_id IN "
+                        f"(SELECT id FROM {hot} WHERE id BETWEEN ? AND ? AND {match})",
+                        window
+                    )
+                cursor.execute(f"DELETE FROM {hot} WHERE id BETWEEN ? AND ? AND {match}", window)
+                last_deleted = cursor.rowcount
+                deleted_count += cursor.rowcount
+                self.conn.commit()
+                if last:
+                    break
+                lo = hi + 1
             return deleted_count
         except sqlite3.Error as e:
             logger.error(f"Error during database cleanup: {e}", exc_info=True)
             self.conn.rollback()
+            return deleted_count
+
+    def get_counters(self) -> Dict[str, Any]:
+        """Returns the materialized row counts (see read_counters)."""
+        self.flush_status_updates()
+        return read_counters(self.conn)
+
+    def reconcile_counters(self) -> int:
+        """
+        Recounts the counted tables and repairs any counter that drifted.
+
+        Returns:
+            The number of counters that had to be corrected.
+        """
+        try:
+            cursor = self._get_cursor()
+            # Under the write lock the triggers cannot move the counters while we compare.
+            cursor.execute("BEGIN IMMEDIATE")
+            articles, tables = _count_rows(cursor)
+            stored_articles = {
+                (row[0], row[1]): row[2]
+                for row in cursor.execute("SELECT source_id, status, count FROM article_counters WHERE count != 0")
+            }
+            stored_tables = {row[0]: row[1] for row in cursor.execute("SELECT name, count FROM table_counters")}
+            drift = sum(1 for key in set(articles) | set(stored_articles)
+                        if articles.get(key, 0) != stored_articles.get(key, 0))
+            drift += sum(1 for table in COUNTED_TABLES if tables[table] != stored_tables.get(table, 0))
+            if drift:
+                _recount(cursor)
+            self.conn.commit()
+            return drift
+        except sqlite3.Error as e:
+            logger.error(f"Error reconciling row counters: {e}", exc_info=True)
+            self.conn.rollback()
             return 0
 
+    def prune_archive(self, cutoff_time: datetime, batch_size: int = 5000) -> int:
+        """
+        Deletes archive entries archived before `cutoff_time` (UTC), `batch_size` rows per transaction.
+
+        Returns:
+            The number of archive entries deleted.
+        """
+        deleted = 0
+        try:
+            cursor = self._get_cursor()
+            while True:
+                cursor.execute(
+                    f"DELETE FROM {ARCHIVE_SCHEMA}.seen_articles_archive WHERE (source_id, external_id) IN "
+                    f"(SELECT source_id, external_id FROM {ARCHIVE_SCHEMA}.seen_articles_archive "
+                    f"WHERE archived_at < ? LIMIT ?)",
+                    (cutoff_time, batch_size)
+                )
+                self.conn.commit()
+                deleted += cursor.rowcount
+                if cursor.rowcount < batch_size:
+                    return deleted
+        except sqlite3.Error as e:
+            logger.error(f"Error pruning the article archive: {e}", exc_info=True)
+            self.conn.rollback()
+            return deleted
+
+    def prune_events(self, cutoff_time: datetime, batch_size: int = 5000) -> int:
+        """
+        Deletes article_events created before `cutoff_time` (UTC), `batch_size` rows per transaction.
+
+        Returns:
+            The number of events deleted.
+        """
+        self.flush_events()
+        cutoff = cutoff_time.strftime('%Y-%m-%d %H:%M:%S')
+        deleted = 0
+        try:
+            cursor = self._get_cursor()
+            while True:
+                cursor.execute(
+                    "DELETE FROM article_events WHERE id IN "
+                    "(SELECT id FROM article_events WHERE created_at < ? LIMIT ?)",
+                    (cutoff, batch_size)
+                )
+                self.conn.commit()
+                deleted += cursor.rowcount
+                if cursor.rowcount < batch_size:
+                    return deleted
+        except sqlite3.Error as e:
+            logger.error(f"Error pruning article events: {e}", exc_info=True)
+            self.conn.rollback()
+            return deleted
+
+    def reclaim_space(self, pages_per_step: int = 256, pause_seconds: float = 0.05) -> int:
+        """
+        Returns free pages to the filesystem with `PRAGMA incremental_vacuum`,
+        a bounded number of pages per write transaction.
+
+        Returns:
+            The number of pages released.
+        """
+        released = 0
+        try:
+            cursor = self._get_cursor()
+            while True:
+                free_pages = cursor.execute("PRAGMA freelist_count").fetchone()[0]
+                if not free_pages:
+                    break
+                step = min(free_pages, pages_per_step)
+                if self.conn.in_transaction:
+                    self.conn.commit()
+                # executescript steps the pragma to completion; execute() frees a single page.
+                self.conn.executescript(f"PRAGMA incremental_vacuum({int(step)})")
+                after = cursor.execute("PRAGMA freelist_count").fetchone()[0]
+                if after >= free_pages:
+                    # auto_vacuum is not INCREMENTAL on this file; nothing more to do.
+                    break
+                released += free_pages - after
+                if pause_seconds:
+                    time.sleep(pause_seconds)
+        except sqlite3.Error as e:
+            logger.error(f"Error reclaiming database space: {e}", exc_info=True)
+        return released
+
     def close(self):
-        """Closes the database connection."""
+        """Flushes buffered status updates and events and releases the pooled connection."""
         if self.conn:
-            self.conn.close()
+            self.flush_status_updates()
+            self.flush_events()
             self.conn = None
-            logger.info("Database connection closed.")
+            logger.info("Database connection released.")
 
 class TaxonomyCache:
-    """Manages a local JSON cache for WordPress category IDs with a TTL."""
+    """
+    Caches WordPress category data in the app database with a per-row TTL.
+
+    Lookups read a single row; writes are buffered in memory and flushed as one
+    batch of per-key upserts (write-behind), so concurrent processes never
+    overwrite each other's entries.
+    """
 
-    def __init__(self, cache_path: str = 'data/taxonomy_cache.json', ttl_hours: int = 24):
-        self.cache_file = Path(cache_path)
+    def __init__(
+        self,
+        db_path: str = DATABASE_CONFIG['path'],
+        ttl_hours: int = 24,
+        flush_interval_seconds: float = 5.0,
+        flush_batch_size: int = 20,
+        legacy_json_path: Optional[str] = 'data/taxonomy_cache.json',
+    ):
+        self.db_path = db_path
         self.ttl = timedelta(hours=ttl_hours)
-        self.cache: Dict[str, Dict[str, Any]] = self._load_cache()
-        self.cache_file.parent.mkdir(parents=True, exist_ok=True)
+        self.flush_interval_seconds = flush_interval_seconds
+        self.flush_batch_size = flush_batch_size
+        self._pending: Dict[str, tuple] = {}
+        self._lock = threading.Lock()
+        self._last_flush = time.monotonic()
+        if legacy_json_path:
+            self._import_legacy_json(Path(legacy_json_path))
 
-    def _load_cache(self) -> Dict[str, Dict[str, Any]]:
-        """Loads the cache from the JSON file."""
-        if not self.cache_file.exists():
-            return {}
-        try:
-            with open(self.cache_file, 'r', encoding='utf-8') as f:
-                data = json.load(f)
-                # Basic validation
-                if isinstance(data, dict):
-                    return data
-                return {}
-        except (json.JSONDecodeError, IOError):
-            logger.warning(f"Could not read or parse taxonomy cache file at {self.cache_file}. Starting fresh.")
-            return {}
+    def _conn(self) -> sqlite3.Connection:
+        # Its own pooled connection: a failed flush must not roll back the pipeline's work.
+        return get_connection(self.db_path, owner='taxonomy_cache')
 
-    def _save_cache(self):
-        """Saves the current cache state to the JSON file."""
+    def _import_legacy_json(self, cache_file: Path):
+        """Seeds an empty table from the old JSON cache file, keeping its timestamps."""
+        if not cache_file.exists():
+            return
         try:
-            with open(self.cache_file, 'w', encoding='utf-8') as f:
-                json.dump(self.cache, f, indent=2, ensure_ascii=False)
-        except IOError as e:
-            logger.error(f"Failed to write to taxonomy cache file at {self.cache_file}: {e}")
+            conn = self._conn()
+            if conn.execute("SELECT 1 FROM taxonomy_cache LIMIT 1").fetchone():
+                return
+            with open(cache_file, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            if not isinstance(data, dict):
+                return
+            now = time.time()
+            rows = []
+            for slug, item in data.items():
+                cached_time = datetime.fromisoformat(item.get('timestamp', '1970-01-01T00:00:00'))
+                expires_at = (cached_time + self.ttl).timestamp()
+                if expires_at > now and item.get('data') is not None:
+                    rows.append((slug, json.dumps(item['data'], ensure_ascii=False), expires_at))
+            if rows:
+                conn.executemany(_TAXONOMY_UPSERT_SQL, rows)
+                conn.commit()
+                logger.info(f"Imported {len(rows)} entries from legacy taxonomy cache {cache_file}.")
+        except (sqlite3.Error, json.JSONDecodeError, IOError, ValueError, AttributeError) as e:
+            logger.warning(f"Could not import legacy taxonomy cache file at {cache_file}: {e}")
 
     def get_category(self, slug: str) -> Optional[Dict[str, Any]]:
         """
         Retrieves a category from the cache if it exists and is not expired.
         """
-        if slug not in self.cache:
-            return None
-
-        cached_item = self.cache[slug]
-        cached_time = datetime.fromisoformat(cached_item.get('timestamp', '1970-01-01T00:00:00'))
+        with self._lock:
+            pending = self._pending.get(slug)
+        if pending is not None:
+            return json.loads(pending[0])
 
-        if datetime.now() - cached_time > self.ttl:
-            logger.info(f"Cache for category '{slug}' has expired. Removing from cache.")
-            del self.cache[slug]
-            self._save_cache()
+        try:
+            row = self._conn().execute(
+                "SELECT data, expires_at FROM taxonomy_cache WHERE slug = ?", (slug,)
+            ).fetchone()
+        except sqlite3.Error as e:
+            logger.error(f"Failed to read taxonomy cache for '{slug}': {e}")
             return None
-
-        return cached_item.get('data')
+        if row is None:
+            return None
+        if row['expires_at'] <= time.time():
+            # Expired rows are left for the next upsert or purge_expired(); reads never write.
+            logger.info(f"Cache for category '{slug}' has expired.")
+            return None
+        return json.loads(row['data'])
 
     def set_category(self, slug: str, category_data: Dict[str, Any]):
         """
         Adds or updates a category in the cache.
         """
-        self.cache[slug] = {
-            'timestamp': datetime.now().isoformat(),
-            'data': category_data
-        }
-        self._save_cache()
-        logger.debug(f"Updated cache for category '{slug}'.")
\ No newline at end of file
+        expires_at = time.time() + self.ttl.total_seconds()
+        with self._lock:
+            self._pending[slug] = (json.dumps(category_data, ensure_ascii=False), expires_at)
+            due = (len(self._pending) >= self.flush_batch_size or
+                   time.monotonic() - self._last_flush >= self.flush_interval_seconds)
+        logger.debug(f"Updated cache for category '{slug}'.")
+        if due:
+            self.flush()
+
+    def flush(self) -> int:
+        """Writes all buffered entries in one transaction. Returns how many were written."""
+        with self._lock:
+            pending, self._pending = self._pending, {}
+            self._last_flush = time.monotonic()
+        if not pending:
+            return 0
+        conn = self._conn()
+        try:
+            conn.executemany(
+                _TAXONOMY_UPSERT_SQL,
+                [(slug, data, expires_at) for slug, (data, expires_at) in pending.items()]
+            )
+            conn.commit()
+            return len(pending)
+        except sqlite3.Error as e:
+            logger.error(f"Failed to flush taxonomy cache: {e}")
+            conn.rollback()
+            with self._lock:
+                # Keep anything written since, but retry the failed entries on the next flush.
+                for slug, value in pending.items():
+                    self._pending.setdefault(slug, value)
+            return 0
+
+    def purge_expired(self) -> int:
+        """Deletes expired rows. Returns the number of rows removed."""
+        conn = self._conn()
+        try:
+            cursor = conn.execute("DELETE FROM taxonomy_cache WHERE expires_at <= ?", (time.time(),))
+            conn.commit()
+            return cursor.rowcount
+        except sqlite3.Error as e:
+            logger.error(f"Failed to purge expired taxonomy cache entries: {e}")
+            conn.rollback()
+            return 0
+
+    def close(self):
+        """Flushes any buffered entries."""
+        self.flush()
@@ -7,13 +7,15 @@ from urllib.parse import urljoin, urlparse
 from datetime import datetime, timezone
 from email.utils import format_datetime
 
+from .http_retry import get_shared_session
+
 logger = logging.getLogger(__name__)
 
 DEFAULT_UA = 'Mozilla/5.0 (Windows NT 10.0; Win64; x64)'
 
 def _request(url, timeout=15):
     """Makes a request with a default user-agent."""
-    return requests.get(url, timeout=timeout, headers={'User-Agent': DEFAULT_UA})
+    return get_shared_session().get(url, timeout=timeout, headers={'User-Agent': DEFAULT_UA})
 
 def _clean_url(url):
     """Removes common tracking parameters and fragments from a URL."""
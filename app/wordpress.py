@@ -1,13 +1,21 @@
 import logging
 import requests
-import time
 import json 
 import re 
 from typing import Dict, Any, Optional, List
 from urllib.parse import urlparse
 
+from .config import TAXONOMY_LOOKUP_CACHE
+from .http_retry import create_session, get_shared_session
+from .lookup_cache import LookupCache
+
 logger = logging.getLogger(__name__)
 
+# Shared by every WordPressClient in the process, so lookups survive across cycles.
+# Keys are (api_url, slug) for categories and (api_url, lowercased name) for tags.
+CATEGORY_LOOKUP_CACHE = LookupCache(**TAXONOMY_LOOKUP_CACHE)
+TAG_LOOKUP_CACHE = LookupCache(**TAXONOMY_LOOKUP_CACHE)
+
 def _slugify(name: str) -> str:
     """Creates a simple, WordPress-compatible slug from a string."""
     s = name.strip().lower()
@@ -28,7 +36,9 @@ class WordPressClient:
         self.user = config.get('user')
         self.password = config.get('password')
         self.categories_map = categories_map
-        self.session = requests.Session()
+        self.session = create_session()
+        # Images come from third-party hosts: downloaded without the WordPress auth.
+        self.download_session = get_shared_session()
         if self.user and self.password:
             self.session.auth = (self.user, self.password)
         self.session.headers.update({'User-Agent': 'VocMoney-Pipeline/1.0'})
@@ -42,25 +52,30 @@ class WordPressClient:
 
     def _get_existing_tag_id(self, name: str) -> Optional[int]:
         """Searches for an existing tag by name or slug and returns its ID."""
+        key = (self.api_url, name.strip().lower())
+        try:
+            return TAG_LOOKUP_CACHE.get_or_load(key, lambda: self._fetch_tag_id(name))
+        except requests.RequestException as e:
+            logger.error(f"Error searching for tag '{name}': {e}")
+            return None
+
+    def _fetch_tag_id(self, name: str) -> Optional[int]:
+        """Queries the REST API for a tag; raises on transport/HTTP errors so they are not cached."""
         slug = _slugify(name)
         tags_endpoint = f"{self.api_url}/tags"
         params = {"search": name, "per_page": 100}
 
-        try:
-            r = self.session.get(tags_endpoint, params=params, timeout=20)
-            r.raise_for_status()
-            items = r.json()
-            
-            # WordPress search can be broad, so we verify the match
-            for item in items:
-                if item.get('name', '').strip().lower() == name.strip().lower():
-                    return int(item['id'])
-            for item in items:
-                if item.get('slug') == slug:
-                    return int(item['id'])
-        except requests.RequestException as e:
-            logger.error(f"Error searching for tag '{name}': {e}")
-        
+        r = self.session.get(tags_endpoint, params=params, timeout=20)
+        r.raise_for_status()
+        items = r.json()
+
+        # WordPress search can be broad, so we verify the match
+        for item in items:
+            if item.get('name', '').strip().lower() == name.strip().lower():
+                return int(item['id'])
+        for item in items:
+            if item.get('slug') == slug:
+                return int(item['id'])
         return None
 
     def _create_tag(self, name: str) -> Optional[int]:
@@ -74,11 +89,13 @@ class WordPressClient:
             if r.status_code in (200, 201):
                 tag_id = int(r.json()['id'])
                 logger.info(f"Created new tag '{name}' with ID {tag_id}.")
+                TAG_LOOKUP_CACHE.set((self.api_url, name.strip().lower()), tag_id)
                 return tag_id
             
             # Handle race condition where tag was created between search and post
             if r.status_code == 400 and isinstance(r.json(), dict) and r.json().get("code") == "term_exists":
                 logger.warning(f"Tag '{name}' already exists (race condition). Re-fetching ID.")
+                TAG_LOOKUP_CACHE.invalidate((self.api_url, name.strip().lower()))
                 return self._get_existing_tag_id(name)
             
             r.raise_for_status()
@@ -136,42 +153,35 @@ class WordPressClient:
                         tag_ids.append(new_id)
         return tag_ids
 
-    def upload_media_from_url(self, image_url: str, alt_text: str = "", max_attempts: int = 3) -> Optional[Dict[str, Any]]:
+    def upload_media_from_url(self, image_url: str, alt_text: str = "") -> Optional[Dict[str, Any]]:
         """
-        Downloads an image and uploads it to WordPress with a retry mechanism.
+        Downloads an image and uploads it to WordPress.
+
+        Retries come from the shared policy (http_retry): the download is retried
+        on 5xx/429 and network errors within the image host's retry budget; the
+        upload POST only on connection errors, so an image is never sent twice.
         """
-        last_err = None
-        for attempt in range(1, max_attempts + 1):
-            try:
-                # 1. Download the image with a reasonable timeout
-                img_response = requests.get(image_url, timeout=25)
-                img_response.raise_for_status()
-                content_type = img_response.headers.get('Content-Type', 'image/jpeg')
-                # Sanitize filename
-                filename = (urlparse(image_url).path.split('/')[-1] or "image.jpg").split("?")[0]
-
-                # 2. Upload to WordPress
-                media_endpoint = f"{self.api_url}/media"
-                headers = {
-                    'Content-Disposition': f'attachment; filename="{filename}"',
-                    'Content-Type': content_type,
-                }
-                wp_response = self.session.post(media_endpoint, headers=headers, data=img_response.content, timeout=40)
-                wp_response.raise_for_status()
-                logger.info(f"Successfully uploaded image: {image_url}")
-                return wp_response.json() # Success
-
-            except (requests.Timeout, requests.ConnectionError) as e:
-                last_err = e
-                logger.warning(f"Upload attempt {attempt}/{max_attempts} for '{image_url}' failed with network error: {e}. Retrying in {2*attempt}s...")
-                time.sleep(2 * attempt)  # Simple backoff
-            except Exception as e:
-                last_err = e
-                logger.error(f"Upload of '{image_url}' failed with non-retriable error: {e}")
-                break # Don't retry on WP errors (4xx, 5xx) or other issues
-
-        logger.error(f"Final failure to upload image '{image_url}' after {attempt} attempt(s): {last_err}")
-        return None
+        try:
+            # 1. Download the image with a reasonable timeout (no WordPress credentials)
+            img_response = self.download_session.get(image_url, timeout=25)
+            img_response.raise_for_status()
+            content_type = img_response.headers.get('Content-Type', 'image/jpeg')
+            # Sanitize filename
+            filename = (urlparse(image_url).path.split('/')[-1] or "image.jpg").split("?")[0]
+
+            # 2. Upload to WordPress
+            media_endpoint = f"{self.api_url}/media"
+            headers = {
+                'Content-Disposition': f'attachment; filename="{filename}"',
+                'Content-Type': content_type,
+            }
+            wp_response = self.session.post(media_endpoint, headers=headers, data=img_response.content, timeout=40)
+            wp_response.raise_for_status()
+            logger.info(f"Successfully uploaded image: {image_url}")
+            return wp_response.json() # Success
+        except Exception as e:
+            logger.error(f"Upload of '{image_url}' failed: {e}")
+            return None
 
     def update_media_details(self, media_id: int, alt_text: Optional[str] = None, caption: Optional[str] = None, description: Optional[str] = None) -> bool:
         """Sets metadata (alt text, caption, description) for a media item in WordPress."""
@@ -252,25 +262,32 @@ class WordPressClient:
 
     def get_category_by_slug(self, slug: str) -> Optional[Dict[str, Any]]:
         """Searches for an existing category by slug and returns its data."""
-        endpoint = f"{self.api_url}/categories"
-        params = {"slug": slug, "per_page": 1}
         try:
-            r = self.session.get(endpoint, params=params, timeout=20)
-            r.raise_for_status()
-            items = r.json()
-            if items and isinstance(items, list):
-                # Ensure we have an exact slug match
-                for item in items:
-                    if item.get('slug') == slug:
-                        logger.debug(f"Found category by slug '{slug}' with ID {item['id']}.")
-                        return {
-                            'id': item['id'],
-                            'name': item['name'],
-                            'slug': item['slug'],
-                            'parent': item.get('parent', 0)
-                        }
+            cat = CATEGORY_LOOKUP_CACHE.get_or_load((self.api_url, slug), lambda: self._fetch_category_by_slug(slug))
         except requests.RequestException as e:
             logger.error(f"Error searching for category with slug '{slug}': {e}")
+            return None
+        # Callers get their own copy so the cached entry can't be mutated.
+        return dict(cat) if cat else None
+
+    def _fetch_category_by_slug(self, slug: str) -> Optional[Dict[str, Any]]:
+        """Queries the REST API for a category; raises on transport/HTTP errors so they are not cached."""
+        endpoint = f"{self.api_url}/categories"
+        params = {"slug": slug, "per_page": 1}
+        r = self.session.get(endpoint, params=params, timeout=20)
+        r.raise_for_status()
+        items = r.json()
+        if items and isinstance(items, list):
+            # Ensure we have an exact slug match
+            for item in items:
+                if item.get('slug') == slug:
+                    logger.debug(f"Found category by slug '{slug}' with ID {item['id']}.")
+                    return {
+                        'id': item['id'],
+                        'name': item['name'],
+                        'slug': item['slug'],
+                        'parent': item.get('parent', 0)
+                    }
         return None
 
     def create_category(self, name: str, slug: str, parent_slug: Optional[str] = None) -> Optional[Dict[str, Any]]:
@@ -291,15 +308,19 @@ class WordPressClient:
             if r.status_code in (200, 201):
                 data = r.json()
                 logger.info(f"Created new category '{name}' (slug: {slug}) with ID {data['id']}.")
-                return {
+                created = {
                     'id': data['id'],
                     'name': data['name'],
                     'slug': data['slug'],
                     'parent': data.get('parent', 0)
                 }
+                # Replaces the negative entry left by the lookup that preceded creation.
+                CATEGORY_LOOKUP_CACHE.set((self.api_url, slug), created)
+                return dict(created)
             
             if r.status_code == 400 and isinstance(r.json(), dict) and r.json().get("code") == "term_exists":
                 logger.warning(f"Category '{name}' already exists (race condition). Re-fetching by slug.")
+                CATEGORY_LOOKUP_CACHE.invalidate((self.api_url, slug))
                 return self.get_category_by_slug(slug)
             
             r.raise_for_status()
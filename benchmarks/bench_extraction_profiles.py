@@ -0,0 +1,127 @@
+#!/usr/bin/env python3
+"""
+Benchmark: speed and quality of each extraction profile.
+
+Extracts the same pages with every profile in EXTRACTION_PROFILES and reports
+pages per second next to how close each profile's output is to the
+'thorough' one: word-level text similarity (difflib ratio) and the share of
+the thorough images found. Pages are synthetic by default; --html-dir runs
+saved pages instead (*.html, extracted as if served from --base-url).
+
+Every profile first extracts all pages once untimed, so imports and caches are
+warm, then runs --repeats timed passes; the order of the profiles is rotated
+on every pass and the median pass is reported, so no profile pays the cold
+start or always runs first.
+
+    python -m benchmarks.bench_extraction_profiles [--articles 30] [--paragraphs 40] [--repeats 5]
+    python -m benchmarks.bench_extraction_profiles --html-dir pages/ --base-url https://ge.globo.com/
+"""
+
+import argparse
+import difflib
+import logging
+import os
+import statistics
+import sys
+import time
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from bs4 import BeautifulSoup
+
+from app.extractor import EXTRACTION_PROFILES, ContentExtractor
+from benchmarks.bench_extractor_parse import build_article
+
+REFERENCE = 'thorough'
+
+
+def _words(result: Optional[Dict]) -> List[str]:
+    if not result:
+        return []
+    return BeautifulSoup(result['content'], 'lxml').get_text(' ').split()
+
+
+def _images(result: Optional[Dict]) -> set:
+    if not result:
+        return set()
+    return {img['src'] for img in result['images']} | {result['featured_image_url']} - {None}
+
+
+def run_profile(profile: str, pages: List[Tuple[str, str]],
+                extractor: Optional[ContentExtractor] = None) -> Tuple[List[Optional[Dict]], float]:
+    """Extracts every (url, html) page with `profile`; returns the results and the wall time."""
+    extractor = extractor or ContentExtractor(html_cache=False, learned_selectors=False)
+    current = {}
+    extractor._fetch_html = lambda url: current['html']
+    results = []
+    started = time.perf_counter()
+    for url, html in pages:
+        current['html'] = html
+        results.append(extractor.extract(url, profile=profile))
+    return results, time.perf_counter() - started
+
+
+def run_profiles(pages: List[Tuple[str, str]], repeats: int) -> Dict[str, Tuple[List[Optional[Dict]], float]]:
+    """
+    Times every profile `repeats` times after one untimed warm-up pass each,
+    rotating which profile goes first. Returns each profile's results and
+    median wall time.
+    """
+    names = list(EXTRACTION_PROFILES)
+    extractors = {name: ContentExtractor(html_cache=False, learned_selectors=False) for name in names}
+    results = {name: run_profile(name, pages, extractors[name])[0] for name in names}
+    walls: Dict[str, List[float]] = {name: [] for name in names}
+    for n in range(repeats):
+        shift = n % len(names)
+        for name in names[shift:] + names[:shift]:
+            results[name], wall = run_profile(name, pages, extractors[name])
+            walls[name].append(wall)
+    return {name: (results[name], statistics.median(walls[name])) for name in names}
+
+
+def load_pages(args: argparse.Namespace) -> List[Tuple[str, str]]:
+    if args.html_dir:
+        files = sorted(Path(args.html_dir).glob('*.html'))
+        return [(args.base_url.rstrip('/') + '/' + f.stem, f.read_text(encoding='utf-8', errors='replace'))
+                for f in files]
+    return [(f"https://www.example.com/artigo-{i}", build_article(i, args.paragraphs))
+            for i in range(args.articles)]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--articles", type=int, default=30)
+    parser.add_argument("--paragraphs", type=int, default=40)
+    parser.add_argument("--repeats", type=int, default=5, help="timed passes per profile (median reported)")
+    parser.add_argument("--html-dir", help="directory of saved article pages (*.html)")
+    parser.add_argument("--base-url", default="https://www.example.com/")
+    args = parser.parse_args()
+
+    logging.disable(logging.CRITICAL)
+    pages = load_pages(args)
+    if not pages:
+        sys.exit("no pages to extract")
+
+    runs = run_profiles(pages, max(1, args.repeats))
+    reference = runs[REFERENCE][0]
+
+    print(f"pages: {len(pages)} ({sum(len(h) for _, h in pages) // len(pages)} bytes avg); "
+          f"reference: {REFERENCE}; median of {max(1, args.repeats)} passes")
+    print(f"{'profile':<10}{'pages/s':>9}{'ms/page':>9}{'extracted':>11}{'text sim':>10}{'images':>8}")
+    for name, (results, wall) in runs.items():
+        similarity, image_recall = [], []
+        for result, ref in zip(results, reference):
+            similarity.append(difflib.SequenceMatcher(None, _words(result), _words(ref), autojunk=False).ratio())
+            ref_images = _images(ref)
+            if ref_images:
+                image_recall.append(len(_images(result) & ref_images) / len(ref_images))
+        extracted = sum(1 for r in results if r)
+        print(f"{name:<10}{len(pages) / wall:>9.1f}{wall * 1000 / len(pages):>9.1f}"
+              f"{extracted:>6}/{len(pages):<4}{sum(similarity) / len(similarity):>10.3f}"
+              f"{(sum(image_recall) / len(image_recall)) if image_recall else 1.0:>8.2f}")
+
+
+if __name__ == "__main__":
+    main()
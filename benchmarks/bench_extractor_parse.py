@@ -0,0 +1,114 @@
+#!/usr/bin/env python3
+"""
+Benchmark: DOM parses and CPU time per article in ContentExtractor.extract().
+
+Runs the generic (trafilatura) extraction path over synthetic article pages and
+counts every BeautifulSoup construction plus every HTML parse done inside
+trafilatura, so the effect of changes to the extractor's parsing is measurable.
+
+    python -m benchmarks.bench_extractor_parse [--articles 50] [--paragraphs 40]
+"""
+
+import argparse
+import logging
+import os
+import sys
+import time
+from collections import Counter
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import bs4
+import trafilatura.core
+
+from app.extractor import ContentExtractor
+
+PARSES: Counter = Counter()
+
+
+def _count_parses() -> None:
+    """Wraps the two parse entry points so each call is tallied."""
+    soup_init = bs4.BeautifulSoup.__init__
+    load_html = trafilatura.core.load_html
+
+    def counting_soup_init(self, markup="", features=None, *args, **kwargs):
+        PARSES[f"BeautifulSoup({features})"] += 1
+        soup_init(self, markup, features, *args, **kwargs)
+
+    def counting_load_html(*args, **kwargs):
+        PARSES["trafilatura.load_html"] += 1
+        return load_html(*args, **kwargs)
+
+    bs4.BeautifulSoup.__init__ = counting_soup_init
+    trafilatura.core.load_html = counting_load_html
+
+
+def build_article(index: int, paragraphs: int) -> str:
+    """A news page with navigation, related blocks, figures and lazy-loaded images."""
+    body = []
+    for n in range(paragraphs):
+        body.append(f"<p>Parágrafo {n} do artigo {index}. " + "Texto de exemplo sobre futebol. " * 8 + "</p>")
+        if n % 8 == 0:
+            body.append(
+                f'<figure><img src="https://cdn.example.com/uploads/{index}/foto-{n}-1200x800.jpg" alt="Foto {n}">'
+                f'<figcaption>Legenda {n} (Foto: Agência)</figcaption></figure>'
+            )
+        if n % 10 == 5:
+            body.append(
+                f'<noscript>&lt;img src="https://cdn.example.com/uploads/{index}/lazy-{n}-1200x800.jpg"&gt;</noscript>'
+            )
+    related = "".join(f'<li><a href="/noticia-{k}">Notícia {k}</a></li>' for k in range(12))
+    return f"""<!DOCTYPE html>
+<html lang="pt-BR"><head>
+<title>Artigo {index}</title>
+<meta property="og:title" content="Artigo {index}">
+<meta property="og:image" content="https://cdn.example.com/uploads/{index}/capa-1200x630.jpg">
+<meta name="description" content="Resumo do artigo {index}">
+<script type="application/ld+json">{{"@type": "NewsArticle", "headline": "Artigo {index}"}}</script>
+</head><body>
+<header><nav><ul>{related}</ul></nav></header>
+<main><article class="post">
+<h1>Artigo {index}</h1>
+<div class="entry-content">{''.join(body)}
+<div class="related"><h3>Relacionadas</h3><ul>{related}</ul></div>
+</div></article>
+<aside class="sidebar"><ul>{related}</ul></aside>
+</main><footer><ul>{related}</ul></footer>
+</body></html>"""
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--articles", type=int, default=50)
+    parser.add_argument("--paragraphs", type=int, default=40)
+    args = parser.parse_args()
+
+    logging.disable(logging.CRITICAL)
+    _count_parses()
+
+    pages = [build_article(i, args.paragraphs) for i in range(args.articles)]
+    extractor = ContentExtractor(html_cache=False, learned_selectors=False)
+    current = {}
+    extractor._fetch_html = lambda url: current["html"]
+
+    extracted = 0
+    cpu_start = time.process_time()
+    wall_start = time.perf_counter()
+    for i, page in enumerate(pages):
+        current["html"] = page
+        if extractor.extract(f"https://www.example.com/artigo-{i}"):
+            extracted += 1
+    cpu = time.process_time() - cpu_start
+    wall = time.perf_counter() - wall_start
+
+    n = len(pages)
+    print(f"articles:           {n} ({extracted} extracted, {sum(map(len, pages)) // n} bytes avg)")
+    for name, count in sorted(PARSES.items()):
+        print(f"{name + ':':<20}{count / n:.1f} per article")
+    print(f"{'total parses:':<20}{sum(PARSES.values()) / n:.1f} per article")
+    print(f"{'cpu:':<20}{cpu * 1000 / n:.1f} ms per article")
+    print(f"{'wall:':<20}{wall * 1000 / n:.1f} ms per article")
+
+
+if __name__ == "__main__":
+    main()
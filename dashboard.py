@@ -5,7 +5,6 @@ Dashboard web para o sistema de automação RSS-para-WordPress
 
 import os
 import sys
-import sqlite3
 import json
 from datetime import datetime, timedelta, timezone
 from pathlib import Path
@@ -51,6 +50,8 @@ except ImportError:
     print("="*80)
     RSS_FEEDS, PIPELINE_ORDER, SCHEDULE_CONFIG = {}, [], {}
 
+from app.dashboard_data import DashboardReader
+
 app = Flask(__name__)
 app.secret_key = os.environ.get('SECRET_KEY', 'dev-secret-key-change-in-production')
 
@@ -58,75 +59,36 @@ BASE_DIR = Path(__file__).resolve().parent
 DB_PATH = BASE_DIR / 'data' / 'app.db'
 LOG_FILE_PATH = BASE_DIR / 'logs' / 'app.log'
 
+dashboard_reader = DashboardReader(str(DB_PATH))
+
 def get_db_stats():
     """Get statistics from database"""
     try:
         if not DB_PATH.exists():
             raise FileNotFoundError(f"Database not found at {DB_PATH}")
-        conn = sqlite3.connect(DB_PATH)
-        cursor = conn.cursor()
-
-        # Get article counts
-        cursor.execute('SELECT COUNT(*) FROM seen_articles')
-        seen_count = cursor.fetchone()[0]
-
-        cursor.execute('SELECT COUNT(*) FROM posts')
-        published_count = cursor.fetchone()[0]
-
-        cursor.execute('SELECT COUNT(*) FROM failures')
-        failure_count = cursor.fetchone()[0]
-
-        # Get recent posts
-        cursor.execute('''
-            SELECT source_id, external_id, wp_post_id, created_at 
-            FROM posts 
-            ORDER BY created_at DESC 
-            LIMIT 10
-        ''')
-        recent_posts = cursor.fetchall()
-
-        # Get API usage stats
-        cursor.execute('''
-            SELECT api_type, SUM(usage_count) as usage_count
-            FROM api_usage 
-            WHERE last_used > datetime('now', '-24 hours')
-            GROUP BY api_type
-        ''')
-        api_usage = cursor.fetchall()
-
-        # Calculate next cycle time based on last activity or 15 minutes from now
-        cursor.execute('''
-            SELECT MAX(inserted_at) FROM seen_articles 
-            WHERE inserted_at > datetime('now', '-2 hours')
-        ''')
-        row = cursor.fetchone()
-        last_activity = row[0] if row and row[0] else None
+        # Read-only snapshot: dashboard requests never take the pipeline's write lock.
+        data = dashboard_reader.get_stats()
+        counters = data['counters']
 
         check_interval = SCHEDULE_CONFIG.get('check_interval_minutes', 15)
+        now = datetime.now(timezone.utc)
+        next_cycle = now + timedelta(minutes=check_interval)
+        if data['last_activity']:
+            # SQLite timestamps are stored in UTC, as per main.py
+            last_cycle = data['last_activity'].replace(tzinfo=timezone.utc) + timedelta(minutes=check_interval)
+            # If the next cycle is in the past, schedule it `check_interval` minutes from now
+            if last_cycle >= now:
+                next_cycle = last_cycle
 
-        if last_activity:
-            try:
-                # SQLite datetime is 'YYYY-MM-DD HH:MM:SS', assume UTC as per main.py
-                last_time = datetime.strptime(last_activity, '%Y-%m-%d %H:%M:%S').replace(tzinfo=timezone.utc)
-                next_cycle = last_time + timedelta(minutes=check_interval)
-                # If next cycle is in the past, schedule for 15 minutes from now
-                if next_cycle < datetime.now(timezone.utc):
-                    next_cycle = datetime.now(timezone.utc) + timedelta(minutes=check_interval)
-            except (ValueError, TypeError):
-                next_cycle = datetime.now(timezone.utc) + timedelta(minutes=check_interval)
-        else:
-            next_cycle = datetime.now(timezone.utc) + timedelta(minutes=check_interval)
-            
         next_cycle_str = next_cycle.astimezone().strftime('%H:%M:%S')
 
-        conn.close()
-
         return {
-            'seen_articles': seen_count,
-            'published_posts': published_count,
-            'failures': failure_count,
-            'recent_posts': recent_posts,
-            'api_usage': dict(api_usage),
+            'seen_articles': counters['seen_articles'],
+            'published_posts': counters['posts'],
+            'failures': counters['failures'],
+            'articles_by_status': counters['by_status'],
+            'recent_posts': data['recent_posts'],
+            'api_usage': data['api_usage'],
             'next_cycle': next_cycle_str
         }
     except Exception as e:
@@ -135,6 +97,7 @@ def get_db_stats():
             'seen_articles': 0,
             'published_posts': 0,
             'failures': 0,
+            'articles_by_status': {},
             'recent_posts': [],
             'api_usage': {},
             'next_cycle': 'N/A'
@@ -331,36 +294,19 @@ def feeds_page():
     """Feeds management page"""
     feed_stats = []
     try:
-        conn = sqlite3.connect(DB_PATH)
-        cursor = conn.cursor()
-
-        for source_id in PIPELINE_ORDER:
-            config = RSS_FEEDS.get(source_id)
-            if not config:
-                continue
-
-            cursor.execute('''
-                SELECT COUNT(*) FROM seen_articles 
-                WHERE source_id = ? AND inserted_at > datetime('now', '-24 hours')
-            ''', (source_id,))
-            recent_count = cursor.fetchone()[0]
-
-            cursor.execute('''
-                SELECT COUNT(*) FROM posts 
-                WHERE source_id = ?
-            ''', (source_id,))
-            published_count = cursor.fetchone()[0]
+        source_ids = [source_id for source_id in PIPELINE_ORDER if RSS_FEEDS.get(source_id)]
+        counts = dashboard_reader.get_feed_stats(source_ids)
 
+        for source_id in source_ids:
+            config = RSS_FEEDS[source_id]
             feed_stats.append({
                 'id': source_id,
                 'name': source_id.replace('_', ' ').title(),
                 'url': config.get('urls', ['N/A'])[0],
                 'category': config['category'],
-                'recent_articles': recent_count,
-                'published_posts': published_count
+                'recent_articles': counts[source_id]['recent_articles'],
+                'published_posts': counts[source_id]['published_posts']
             })
-
-        conn.close()
     except Exception as e:
         logging.error(f"Error getting feed stats: {e}")
         # Fallback with no stats on DB error
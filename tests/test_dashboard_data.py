@@ -0,0 +1,91 @@
+"""
+Unit tests for the dashboard_data module
+"""
+
+import os
+import shutil
+import sqlite3
+import tempfile
+import threading
+import unittest
+from unittest import mock
+
+from app.dashboard_data import DashboardReader
+from app import dashboard_data
+from app.store import Database, close_thread_connections
+
+
+class TestDashboardReader(unittest.TestCase):
+    """Test cases for the read-only DashboardReader"""
+
+    def setUp(self):
+        self.tmp_dir = tempfile.mkdtemp()
+        self.db_path = os.path.join(self.tmp_dir, 'app.db')
+        self.db = Database(self.db_path)
+        self.db.initialize()
+        items = [{'id': i, 'url': f'https://example.com/{i}', 'title': i} for i in ('a', 'b')]
+        self.articles = self.db.filter_new_articles('feed', items)
+        self.db.save_processed_post(self.articles[0]['db_id'], 42)
+        self.reader = DashboardReader(self.db_path)
+
+    def tearDown(self):
+        self.reader.close()
+        self.db.close()
+        close_thread_connections()
+        shutil.rmtree(self.tmp_dir, ignore_errors=True)
+
+    def test_get_stats_joins_posts_with_articles(self):
+        """Test that recent posts carry the source and external id of their article"""
+        stats = self.reader.get_stats()
+        self.assertEqual(stats['counters']['seen_articles'], 2)
+        self.assertEqual(stats['counters']['posts'], 1)
+        self.assertEqual([post[:3] for post in stats['recent_posts']], [('feed', 'a', 42)])
+        # inserted_at has milliseconds, which the old strptime format rejected.
+        self.assertIsNotNone(stats['last_activity'])
+
+    def test_get_feed_stats(self):
+        """Test per-feed recent and published counts"""
+        self.assertEqual(
+            self.reader.get_feed_stats(['feed', 'other']),
+            {'feed': {'recent_articles': 2, 'published_posts': 1},
+             'other': {'recent_articles': 0, 'published_posts': 0}},
+        )
+
+    def test_connection_is_read_only(self):
+        """Test that the dashboard connection cannot write"""
+        with self.reader.snapshot() as cursor:
+            self.assertIsNot(cursor.connection, self.db.conn)
+            with self.assertRaises(sqlite3.Error):
+                cursor.execute("DELETE FROM posts")
+
+    def test_one_connection_shared_across_threads(self):
+        """Test that snapshots taken on different threads reuse a single connection"""
+        connections = []
+        with mock.patch.object(dashboard_data, 'connect', wraps=dashboard_data.connect) as connect:
+            def read():
+                with self.reader.snapshot() as cursor:
+                    connections.append(cursor.connection)
+                    cursor.execute("SELECT COUNT(*) FROM posts")
+            threads = [threading.Thread(target=read) for _ in range(2)]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+        self.assertEqual(connect.call_count, 1)
+        self.assertEqual(len(connections), 2)
+        self.assertIs(connections[0], connections[1])
+
+    def test_reads_while_pipeline_holds_write_lock(self):
+        """Test that dashboard reads proceed under a concurrent write transaction"""
+        self.db.conn.execute("BEGIN IMMEDIATE")
+        self.db.conn.execute("UPDATE seen_articles SET status = 'FAILED' WHERE id = ?", (self.articles[1]['db_id'],))
+        try:
+            stats = self.reader.get_stats()
+            # The uncommitted update is invisible to the snapshot.
+            self.assertEqual(stats['counters']['by_status'], {'NEW': 1, 'PUBLISHED': 1})
+        finally:
+            self.db.conn.rollback()
+
+
+if __name__ == '__main__':
+    unittest.main()
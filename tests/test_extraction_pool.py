@@ -0,0 +1,80 @@
+"""
+Unit tests for the extraction_pool module
+"""
+
+import os
+import time
+import unittest
+
+from app.extraction_pool import ExtractionPool
+
+
+class FakeExtractor:
+    """Stands in for ContentExtractor inside the worker processes."""
+
+    def extract(self, url, profile=None):
+        if 'hang' in url:
+            time.sleep(60)
+        if 'slow' in url:
+            time.sleep(0.5)
+        if 'crash' in url:
+            os._exit(1)
+        if 'error' in url:
+            raise ValueError('bad page')
+        return {'url': url, 'pid': os.getpid(), 'profile': profile}
+
+
+class TestExtractionPool(unittest.TestCase):
+    """Test cases for the ExtractionPool class"""
+
+    def _pool(self, **kwargs):
+        options = dict(workers=2, timeout_seconds=2, max_tasks_per_worker=100, max_rss_mb=1024)
+        options.update(kwargs)
+        pool = ExtractionPool(extractor_factory=FakeExtractor, **options)
+        self.addCleanup(pool.close)
+        return pool
+
+    def test_prefetched_batch_runs_on_all_workers(self):
+        pool = self._pool()
+        urls = [f'https://example.com/slow/{i}' for i in range(6)]
+        pool.prefetch(urls)
+        results = [pool.extract(url) for url in urls]
+        self.assertEqual([r['url'] for r in results], urls)
+        self.assertEqual(len({r['pid'] for r in results}), 2)
+        self.assertNotIn(os.getpid(), {r['pid'] for r in results})
+
+    def test_profile_reaches_the_worker(self):
+        pool = self._pool(workers=1)
+        pool.prefetch(['https://example.com/a'], profile='fast')
+        self.assertEqual(pool.extract('https://example.com/a')['profile'], 'fast')
+        self.assertEqual(pool.extract('https://example.com/b', profile='thorough')['profile'], 'thorough')
+
+    def test_hung_page_times_out_and_worker_is_replaced(self):
+        pool = self._pool(workers=1)
+        started = time.monotonic()
+        self.assertIsNone(pool.extract('https://example.com/hang'))
+        self.assertLess(time.monotonic() - started, 10)
+        self.assertEqual(pool.timeouts, 1)
+        self.assertEqual(pool.extract('https://example.com/ok')['url'], 'https://example.com/ok')
+
+    def test_errors_and_crashes_fail_only_their_article(self):
+        pool = self._pool(workers=1)
+        self.assertIsNone(pool.extract('https://example.com/error'))
+        self.assertIsNone(pool.extract('https://example.com/crash'))
+        self.assertIsNotNone(pool.extract('https://example.com/ok'))
+
+    def test_workers_are_recycled_after_max_tasks(self):
+        pool = self._pool(workers=1, max_tasks_per_worker=2)
+        pids = [pool.extract(f'https://example.com/{i}')['pid'] for i in range(4)]
+        self.assertEqual(pids[0], pids[1])
+        self.assertNotEqual(pids[1], pids[2])
+        self.assertEqual(pool.recycled, 2)
+
+    def test_workers_are_recycled_above_rss_limit(self):
+        pool = self._pool(workers=1, max_rss_mb=0)
+        pids = [pool.extract(f'https://example.com/{i}')['pid'] for i in range(2)]
+        self.assertNotEqual(pids[0], pids[1])
+
+
+if __name__ == '__main__':
+    unittest.main()
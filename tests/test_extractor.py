@@ -0,0 +1,300 @@
+"""
+Unit tests for the extractor module
+"""
+
+import io
+import json
+import time
+import unittest
+from unittest import mock
+
+import requests
+import trafilatura
+from bs4 import BeautifulSoup
+
+from app.extractor import (
+    _BAD_SECTION_RX,
+    EXTRACTION_PROFILES,
+    FETCH_STRATEGY_CACHE,
+    ContentExtractor,
+    _article_body_index,
+    _find_article_body,
+    _forget_article_body_index,
+    collect_images_from_article,
+    get_extraction_profile,
+)
+from app.html_utils import normalize_image_containers, normalize_images_with_captions
+
+ARTICLE_HTML = """
+<html><head>
+<meta property="og:title" content="Título">
+<meta property="og:image" content="https://cdn.example.com/uploads/capa-1200x630.jpg">
+</head><body>
+<nav><a href="/">Home</a></nav>
+<article><div class="entry-content">
+<h1>Título</h1>
+<p>Primeiro parágrafo do artigo com texto suficiente para a extração funcionar bem.</p>
+<img src="https://cdn.example.com/uploads/foto-1200x800.jpg" alt="Foto">
+<noscript>&lt;img src="https://cdn.example.com/uploads/lazy-a-1200x800.jpg"&gt;</noscript>
+<p>Segundo parágrafo do artigo com texto suficiente para a extração funcionar bem.</p>
+<noscript>&lt;img src="https://cdn.example.com/uploads/lazy-b-1200x800.jpg"&gt;</noscript>
+<p>Terceiro parágrafo do artigo com texto suficiente para a extração funcionar bem.</p>
+</div></article>
+</body></html>
+"""
+
+
+class TestContentExtractor(unittest.TestCase):
+    """Test cases for the ContentExtractor class"""
+
+    def setUp(self):
+        self.extractor = ContentExtractor(html_cache=False, learned_selectors=False)
+        self.extractor._fetch_html = lambda url: ARTICLE_HTML
+
+    def test_page_is_parsed_once(self):
+        """Test that the generic path reuses the page soup instead of reparsing it"""
+        with mock.patch('app.extractor.BeautifulSoup', wraps=BeautifulSoup) as soup_cls, \
+                mock.patch('app.html_utils.BeautifulSoup', wraps=BeautifulSoup) as utils_soup_cls:
+            result = self.extractor.extract('https://www.example.com/artigo')
+
+        self.assertIsNotNone(result)
+        self.assertIn('Segundo parágrafo', result['content'])
+        features = [c.args[1] for c in soup_cls.call_args_list]
+        # The page, the trafilatura output and one batch for all text <noscript>s.
+        self.assertEqual(sorted(features), ['html.parser', 'lxml', 'lxml'])
+        utils_soup_cls.assert_not_called()
+
+    def test_remove_forbidden_blocks(self):
+        """Test that infoboxes and comment UI go, while the article holding them stays"""
+        soup = BeautifulSoup(
+            '<div class="article">'
+            '<p>' + 'Release Date and Cast are discussed at length in this paragraph. ' * 3 + '</p>'
+            '<div class="infobox"><ul>'
+            '<li><span>Release Date</span><span>March 1, 2024</span></li>'
+            '<li><strong>Director:</strong> Denis Villeneuve</li>'
+            '</ul></div>'
+            '<p>Cast</p><p>Runtime:</p>'
+            '<div><p>Your comment has not been saved</p></div>'
+            '<p>Director</p><p>Writers</p>'
+            '</div>', 'lxml')
+        self.extractor._remove_forbidden_blocks(soup)
+
+        self.assertIsNotNone(soup.find('div', class_='article'))
+        self.assertIsNone(soup.find('ul'))
+        self.assertNotIn('Denis Villeneuve', str(soup))
+        self.assertNotIn('has not been saved', str(soup))
+        self.assertEqual([p.get_text() for p in soup.find_all('p')],
+                         ['Release Date and Cast are discussed at length in this paragraph. ' * 3])
+
+    def test_profiles_choose_trafilatura_options(self):
+        with mock.patch('app.extractor.trafilatura.extract', wraps=trafilatura.extract) as traf:
+            for name in ('fast', 'balanced', 'thorough'):
+                self.assertIsNotNone(self.extractor.extract('https://www.example.com/artigo', profile=name))
+        fast, balanced, thorough = (call.kwargs for call in traf.call_args_list)
+        self.assertTrue(fast['fast'])
+        self.assertTrue(fast['favor_precision'])
+        self.assertNotIn('fast', balanced)
+        self.assertNotIn('favor_recall', balanced)
+        self.assertTrue(thorough['favor_recall'])
+
+    def test_thorough_profile_skips_learned_selectors(self):
+        learned = mock.Mock()
+        learned.selector_for.return_value = None
+        self.extractor.learned_selectors = learned
+        self.extractor.extract('https://www.example.com/artigo', profile='thorough')
+        learned.selector_for.assert_not_called()
+        self.extractor.extract('https://www.example.com/artigo', profile='fast')
+        learned.selector_for.assert_called_once_with('example.com')
+
+    def test_unknown_profile_falls_back_to_balanced(self):
+        self.assertIs(get_extraction_profile('nope'), EXTRACTION_PROFILES['balanced'])
+
+    def test_text_noscript_images_are_collected(self):
+        soup = BeautifulSoup(ARTICLE_HTML, 'lxml')
+        srcs = [img['src'] for img in collect_images_from_article(soup, 'https://www.example.com/artigo')]
+        self.assertIn('https://cdn.example.com/uploads/lazy-a-1200x800.jpg', srcs)
+        self.assertIn('https://cdn.example.com/uploads/lazy-b-1200x800.jpg', srcs)
+
+
+def _response(status, body=b'<html><body><p>ok</p></body></html>'):
+    resp = requests.Response()
+    resp.status_code = status
+    resp.url = 'https://blocked.example.com/a'
+    resp.headers['Content-Type'] = 'text/html; charset=utf-8'
+    resp.raw = io.BytesIO(body)
+    return resp
+
+
+class TestFetchStrategies(unittest.TestCase):
+    """Test cases for the per-host fetch strategy memory"""
+
+    def setUp(self):
+        FETCH_STRATEGY_CACHE.clear()
+        self.addCleanup(FETCH_STRATEGY_CACHE.clear)
+        self.extractor = ContentExtractor(html_cache=False, learned_selectors=False)
+
+    def _get(self, statuses):
+        """Session.get answering by the User-Agent of each strategy: browser UAs vs the fixed one."""
+        def get(url, headers=None, **kwargs):
+            strategy = 'browser' if 'Referer' in headers else 'minimal'
+            return _response(statuses[strategy])
+        return mock.patch.object(self.extractor.session, 'get', side_effect=get)
+
+    def test_learns_the_strategy_that_works_per_host(self):
+        with self._get({'browser': 403, 'minimal': 200}) as get:
+            self.assertIn('ok', self.extractor._download_html('https://blocked.example.com/a'))
+            self.assertEqual(get.call_count, 2)
+            self.assertIn('ok', self.extractor._download_html('https://blocked.example.com/b'))
+            self.assertEqual(get.call_count, 3)
+            self.assertNotIn('Referer', get.call_args.kwargs['headers'])
+
+    def test_falls_back_to_trafilatura_and_remembers_it(self):
+        with self._get({'browser': 403, 'minimal': 403}) as get, \
+                mock.patch('app.extractor.trafilatura.fetch_url', return_value='<p>via trafilatura</p>') as fetch:
+            self.extractor._download_html('https://blocked.example.com/a')
+            self.assertEqual(self.extractor._download_html('https://blocked.example.com/b'), '<p>via trafilatura</p>')
+        self.assertEqual(get.call_count, 2)
+        self.assertEqual(fetch.call_count, 2)
+
+    def test_decision_expires(self):
+        with self._get({'browser': 403, 'minimal': 200}):
+            self.extractor._download_html('https://blocked.example.com/a')
+        later = time.monotonic() + FETCH_STRATEGY_CACHE.ttl_seconds + 1
+        with self._get({'browser': 200, 'minimal': 200}) as get, \
+                mock.patch('app.lookup_cache.time.monotonic', return_value=later):
+            self.extractor._download_html('https://blocked.example.com/b')
+        self.assertIn('Referer', get.call_args.kwargs['headers'])
+
+    def test_other_errors_do_not_switch_strategy(self):
+        with self._get({'browser': 404, 'minimal': 200}) as get:
+            self.assertIsNone(self.extractor._download_html('https://blocked.example.com/a'))
+        self.assertEqual(get.call_count, 1)
+
+    def test_403_is_not_retried_by_the_session(self):
+        self.assertNotIn(403, self.extractor.session.get_adapter('https://x').max_retries.status_forcelist)
+
+
+def _naive_find_article_body(soup):
+    """The previous selector + find_all implementation, kept as the reference."""
+    candidates = soup.select(
+        "article .entry-content, article .content, article [itemprop='articleBody'], "
+        ".post-content, .single-content, .post-body, "
+        "[itemprop='articleBody'], .article-body, .article-content, article"
+    ) or soup.find_all(True)
+    best, best_score = None, -1
+    for c in candidates:
+        if _BAD_SECTION_RX.search(" ".join(c.get("class", [])) + " " + (c.get("id") or "")):
+            continue
+        if c.name in ("header", "footer", "nav", "aside"):
+            continue
+        score = len(c.find_all("p")) + len(c.find_all("figure"))
+        if score > best_score:
+            best, best_score = c, score
+    return best or soup
+
+
+class TestFindArticleBody(unittest.TestCase):
+    """Test cases for the single-pass article body scoring"""
+
+    DOCUMENTS = [
+        # No body selector matches: every node is a candidate.
+        '<div id="a"><p>1</p></div><div class="main"><section><p>1</p><p>2</p><figure></figure></section></div>'
+        '<div class="sidebar"><p>1</p><p>2</p><p>3</p><p>4</p></div>',
+        # .content only counts inside an <article>.
+        '<div class="content"><p>1</p><p>2</p><p>3</p></div>'
+        '<article><div class="content"><p>1</p><p>2</p></div><div class="post-body"><p>1</p></div></article>',
+        '<article class="related"><p>1</p></article><div itemprop="articleBody"><p>1</p></div>',
+        '<p>Only text</p>',
+        '',
+    ]
+
+    def test_matches_reference_implementation(self):
+        for html in self.DOCUMENTS:
+            soup = BeautifulSoup(html, 'lxml')
+            self.assertIs(_find_article_body(soup), _naive_find_article_body(soup), html)
+            for node in soup.find_all(True):
+                self.assertIs(_find_article_body(node), _naive_find_article_body(node), html)
+
+    def test_index_is_shared_and_forgotten(self):
+        soup = BeautifulSoup(self.DOCUMENTS[0], 'lxml')
+        index = _article_body_index(soup)
+        self.assertIs(_article_body_index(soup.find(id='a')), index)
+
+        soup.find('section').decompose()
+        _forget_article_body_index(soup)
+        self.assertIsNot(_article_body_index(soup), index)
+        self.assertIs(_find_article_body(soup), _naive_find_article_body(soup))
+
+
+def _json_ld_page(body):
+    schema = {
+        '@context': 'https://schema.org', '@type': 'NewsArticle',
+        'headline': 'Corinthians vence o clássico', 'description': 'Resumo do jogo.',
+        'articleBody': body,
+        'image': {'@type': 'ImageObject', 'url': 'https://s2.glbimg.com/uploads/capa-1200x630.jpg'},
+        'associatedMedia': [
+            {'@type': 'ImageObject', 'contentUrl': 'https://s2.glbimg.com/uploads/lance-1200x800.jpg',
+             'caption': 'Gol do Corinthians'},
+            {'@type': 'VideoObject', 'contentUrl': 'https://s2.glbimg.com/uploads/video.mp4'},
+        ],
+    }
+    return ARTICLE_HTML.replace(
+        '</head>', f'<script type="application/ld+json">{json.dumps(schema)}</script></head>')
+
+
+class TestJsonLdFastPath(unittest.TestCase):
+    """Test cases for the JSON-LD articleBody fast path"""
+
+    LONG_BODY = 'Primeiro parágrafo &amp; lance decisivo. ' * 15 + '\n\n' + 'Segundo parágrafo <com> texto. ' * 15
+
+    def _extract(self, url, html):
+        extractor = ContentExtractor(html_cache=False, learned_selectors=False)
+        extractor._fetch_html = lambda _: html
+        with mock.patch('app.extractor.trafilatura.extract', wraps=trafilatura.extract) as traf:
+            result = extractor.extract(url)
+        return extractor, result, traf
+
+    def test_opted_in_site_skips_trafilatura(self):
+        extractor, result, traf = self._extract('https://ge.globo.com/futebol/jogo.ghtml',
+                                                _json_ld_page(self.LONG_BODY))
+        traf.assert_not_called()
+        self.assertEqual(result['title'], 'Corinthians vence o clássico')
+        self.assertEqual(result['excerpt'], 'Resumo do jogo.')
+        paragraphs = [p.get_text() for p in BeautifulSoup(result['content'], 'lxml').find_all('p')]
+        self.assertEqual(len(paragraphs), 2)
+        self.assertTrue(paragraphs[0].startswith('Primeiro parágrafo & lance'))
+        self.assertIn('<com>', paragraphs[1])
+        self.assertEqual(result['featured_image_url'], 'https://cdn.example.com/uploads/capa-1200x630.jpg')
+        self.assertEqual([img['src'] for img in result['images']], [
+            'https://s2.glbimg.com/uploads/capa-1200x630.jpg', 'https://s2.glbimg.com/uploads/lance-1200x800.jpg'])
+        self.assertEqual(result['images'][1]['caption'], 'Gol do Corinthians')
+        self.assertEqual((extractor.json_ld_stats['attempts'], extractor.json_ld_stats['hits']), (1, 1))
+        self.assertEqual(extractor.json_ld_summary()['hit_rate'], 1.0)
+
+    def test_short_body_falls_back_to_generic(self):
+        extractor, result, traf = self._extract('https://ge.globo.com/futebol/jogo.ghtml', _json_ld_page('Curto.'))
+        traf.assert_called()
+        self.assertIn('Segundo parágrafo do artigo', result['content'])
+        self.assertEqual((extractor.json_ld_stats['attempts'], extractor.json_ld_stats['hits']), (1, 0))
+        self.assertEqual(extractor.json_ld_stats['generic_runs'], 1)
+
+    def test_site_without_opt_in_uses_generic(self):
+        extractor, result, traf = self._extract('https://www.example.com/artigo', _json_ld_page(self.LONG_BODY))
+        traf.assert_called()
+        self.assertEqual(extractor.json_ld_stats['attempts'], 0)
+
+
+class TestNormalizeImageContainers(unittest.TestCase):
+    """Test cases for the in-place image normalization"""
+
+    def test_matches_string_version(self):
+        html = ('<div><img src="https://example.com/uploads/a.jpg"><p>Texto</p>'
+                '<img src="https://example.com/uploads/a.jpg"><img src="https://example.com/icons/x.png"></div>')
+        soup = BeautifulSoup(html, 'lxml')
+        normalize_image_containers(soup, soup)
+        self.assertEqual(str(soup), normalize_images_with_captions(html))
+        self.assertEqual(len(soup.find_all('figure')), 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
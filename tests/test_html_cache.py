@@ -0,0 +1,131 @@
+"""
+Unit tests for the html_cache module
+"""
+
+import io
+import os
+import shutil
+import tempfile
+import time
+import unittest
+from unittest.mock import patch
+
+import requests
+
+from app.extractor import ContentExtractor
+from app.html_cache import HtmlCache, canonical_url
+from app.html_fetch import PartialHtml, read_html
+from app.store import close_thread_connections
+
+
+class TestCanonicalUrl(unittest.TestCase):
+    """Test cases for canonical_url"""
+
+    def test_normalizes_case_port_fragment_and_tracking(self):
+        self.assertEqual(
+            canonical_url('HTTPS://GE.Globo.com:443/futebol/a.ghtml?utm_source=x&b=2&a=1#topo'),
+            'https://ge.globo.com/futebol/a.ghtml?a=1&b=2',
+        )
+        self.assertNotEqual(canonical_url('https://x.com/a?id=1'), canonical_url('https://x.com/a?id=2'))
+
+
+class TestHtmlCache(unittest.TestCase):
+    """Test cases for the HtmlCache class"""
+
+    def setUp(self):
+        self.tmp_dir = tempfile.mkdtemp()
+        self.cache = HtmlCache(self.tmp_dir, ttl_seconds=3600, max_bytes=10 * 1024 * 1024)
+
+    def tearDown(self):
+        close_thread_connections()
+        shutil.rmtree(self.tmp_dir, ignore_errors=True)
+
+    def _blobs(self):
+        return [f for _, _, files in os.walk(os.path.join(self.tmp_dir, 'blobs')) for f in files]
+
+    def test_round_trip_is_compressed_and_content_addressed(self):
+        html = '<html><body>' + '<p>futebol</p>' * 2000 + '</body></html>'
+        self.assertIsNone(self.cache.get('https://x.com/a'))
+        self.cache.set('https://x.com/a', html)
+        self.cache.set('https://x.com/a?utm_medium=rss', html)
+        self.cache.set('https://x.com/b', html)
+
+        self.assertEqual(self.cache.get('https://x.com/a#comentarios'), html)
+        self.assertEqual(self.cache.get('https://x.com/b'), html)
+        blobs = self._blobs()
+        self.assertEqual(len(blobs), 1)
+        self.assertLess(os.path.getsize(os.path.join(self.tmp_dir, 'blobs', blobs[0][:2], blobs[0])), len(html) // 10)
+
+    def test_expired_entries_are_misses(self):
+        self.cache.set('https://x.com/a', '<p>a</p>')
+        self.cache.ttl_seconds = 0
+        self.assertIsNone(self.cache.get('https://x.com/a'))
+        self.assertEqual(self.cache.evict(), 1)
+        self.assertEqual(self._blobs(), [])
+
+    def test_size_cap_evicts_least_recently_used(self):
+        pages = {name: os.urandom(3000).hex() for name in ('a', 'b', 'c')}
+        self.cache.max_bytes = 7000
+        self.cache.set('https://x.com/a', pages['a'])
+        self.cache.set('https://x.com/b', pages['b'])
+        conn = self.cache._conn()
+        conn.execute("UPDATE html_cache SET last_access = ? WHERE url LIKE '%/b'", (time.time() - 300,))
+        conn.commit()
+        self.cache.set('https://x.com/c', pages['c'])
+
+        self.assertIsNone(self.cache.get('https://x.com/b'))
+        self.assertEqual(self.cache.get('https://x.com/a'), pages['a'])
+        self.assertEqual(self.cache.get('https://x.com/c'), pages['c'])
+        self.assertEqual(len(self._blobs()), 2)
+
+    def test_writes_under_the_cap_do_not_run_eviction(self):
+        with patch.object(self.cache, 'evict', wraps=self.cache.evict) as evict:
+            for i in range(20):
+                self.cache.set(f'https://x.com/{i}', f'<p>{i}</p>')
+            evict.assert_not_called()
+            self.cache.max_bytes = self.cache._total_bytes
+            self.cache.set('https://x.com/extra', '<p>extra</p>')
+            evict.assert_called_once()
+        self.assertIsNone(self.cache.get('https://x.com/0'))
+        self.assertEqual(self.cache.get('https://x.com/extra'), '<p>extra</p>')
+        self.assertLessEqual(self.cache._total_bytes, self.cache.max_bytes)
+
+    def test_rewritten_page_releases_its_old_blob(self):
+        self.cache.set('https://x.com/a', '<p>v1</p>')
+        self.cache.set('https://x.com/a', '<p>v2</p>')
+        self.assertEqual(len(self._blobs()), 1)
+        self.assertEqual(self.cache._total_bytes, self.cache._stored_bytes(self.cache._conn()))
+
+    def test_extractor_fetches_through_cache(self):
+        extractor = ContentExtractor(html_cache=self.cache)
+        with patch.object(extractor, '_download_html', return_value='<p>oi</p>') as download:
+            self.assertEqual(extractor._fetch_html('https://x.com/a'), '<p>oi</p>')
+            self.assertEqual(extractor._fetch_html('https://x.com/a?utm_source=feed'), '<p>oi</p>')
+        download.assert_called_once()
+
+    def test_extractor_does_not_cache_early_stopped_reads(self):
+        extractor = ContentExtractor(html_cache=self.cache)
+        with patch.object(extractor, '_download_html', return_value=PartialHtml('<p>oi</p>')) as download:
+            extractor._fetch_html('https://x.com/a')
+            extractor._fetch_html('https://x.com/a')
+        self.assertEqual(download.call_count, 2)
+
+    def test_extractor_does_not_cache_truncated_reads(self):
+        def truncated(url):
+            resp = requests.Response()
+            resp.status_code = 200
+            resp.url = url
+            resp.headers['Content-Type'] = 'text/html'
+            resp.raw = io.BytesIO(b'<p>' + b'x' * 5000 + b'</p>')
+            return read_html(resp, max_bytes=1000, early_stop=False, chunk_size=256)
+
+        extractor = ContentExtractor(html_cache=self.cache)
+        with patch.object(extractor, '_download_html', side_effect=truncated) as download:
+            self.assertEqual(len(extractor._fetch_html('https://x.com/a')), 1000)
+            extractor._fetch_html('https://x.com/a')
+        self.assertEqual(download.call_count, 2)
+        self.assertIsNone(self.cache.get('https://x.com/a'))
+
+
+if __name__ == '__main__':
+    unittest.main()
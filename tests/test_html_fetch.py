@@ -0,0 +1,100 @@
+"""
+Unit tests for the html_fetch module
+"""
+
+import io
+import unittest
+
+import requests
+
+from app.html_fetch import ArticleEndScanner, PartialHtml, detect_charset, read_html
+
+
+def _response(body: bytes, content_type: str = 'text/html') -> requests.Response:
+    resp = requests.Response()
+    resp.status_code = 200
+    resp.url = 'https://example.com/materia'
+    resp.headers['Content-Type'] = content_type
+    resp.raw = io.BytesIO(body)
+    return resp
+
+
+PAGE = (
+    b'<html><head><script type="application/ld+json">{"@type": "NewsArticle"}</script>'
+    b'<script>var s = "<article>";</script></head><body>'
+    b'<article><p>Texto</p><p>Mais texto</p><article><p>Aninhado</p></article></article>'
+)
+JSON_LD = b'<script type="application/ld+json">{"@type": "NewsArticle"}</script>'
+
+FOOTER = b'<footer>' + b'<a href="/x">Relacionada</a>' * 2000 + b'</footer></body></html>'
+
+
+class TestDetectCharset(unittest.TestCase):
+    """Test cases for the charset fast path"""
+
+    def test_header_then_meta_then_utf8(self):
+        self.assertEqual(detect_charset('text/html; charset=ISO-8859-1', b'<meta charset="utf-8">'), 'iso8859-1')
+        self.assertEqual(detect_charset('text/html', b'<head><meta charset="windows-1252"></head>'), 'cp1252')
+        self.assertEqual(detect_charset(
+            'text/html', b'<meta http-equiv="Content-Type" content="text/html; charset=iso-8859-1">'), 'iso8859-1')
+        self.assertEqual(detect_charset(None, b'<html>'), 'utf-8')
+        self.assertEqual(detect_charset('text/html; charset=bogus', b''), 'utf-8')
+
+
+class TestReadHtml(unittest.TestCase):
+    """Test cases for the streaming read"""
+
+    def test_stops_after_article_and_json_ld(self):
+        resp = _response(PAGE + FOOTER)
+        html = read_html(resp, max_bytes=1024 * 1024, early_stop=True, chunk_size=64)
+        self.assertTrue(html.startswith(PAGE.decode()))
+        self.assertLess(len(html), len(PAGE) + 64)
+        self.assertIsInstance(html, PartialHtml)
+        self.assertTrue(resp.raw.closed)
+
+    def test_teaser_cards_before_the_story_do_not_stop_the_read(self):
+        story = b'<article class="story">' + b'<p>Corpo da materia.</p>' * 4 + b'</article>'
+        body = (b'<html><head>' + JSON_LD + b'</head><body>'
+                b'<article class="teaser"><p>Chamada</p></article>'
+                b'<article-card><p>a</p><p>b</p><p>c</p></article-card>' + story)
+        scanner = ArticleEndScanner()
+        self.assertFalse(scanner.feed(body[:body.index(b'<article class="story">') + 60]))
+        self.assertTrue(scanner.feed(body))
+
+        html = read_html(_response(body + FOOTER), early_stop=True, chunk_size=64)
+        self.assertIn('Corpo da materia.</p></article>', html)
+
+    def test_reads_everything_without_json_ld_or_when_disabled(self):
+        body = PAGE.replace(b'application/ld+json', b'text/plain') + FOOTER
+        html = read_html(_response(body), early_stop=True, chunk_size=64)
+        self.assertEqual(html, body.decode())
+        self.assertNotIsInstance(html, PartialHtml)
+        self.assertEqual(read_html(_response(PAGE + FOOTER), early_stop=False), (PAGE + FOOTER).decode())
+
+    def test_caps_body_size(self):
+        html = read_html(_response(b'<p>' + b'x' * 10000), max_bytes=1000, early_stop=False, chunk_size=256)
+        self.assertEqual(len(html), 1000)
+        self.assertIsInstance(html, PartialHtml)
+        # A body that fits the cap exactly was read whole.
+        html = read_html(_response(b'x' * 1000), max_bytes=1000, early_stop=False, chunk_size=256)
+        self.assertNotIsInstance(html, PartialHtml)
+
+    def test_decodes_with_meta_charset(self):
+        body = '<meta charset="iso-8859-1"><p>Atlético</p>'.encode('latin-1')
+        self.assertIn('Atlético', read_html(_response(body)))
+
+    def test_scanner_sees_tags_split_across_chunks(self):
+        scanner = ArticleEndScanner()
+        buf = bytearray()
+        done = False
+        for i in range(0, len(PAGE), 5):
+            buf += PAGE[i:i + 5]
+            done = scanner.feed(buf) or done
+            if done:
+                break
+        self.assertTrue(done)
+        self.assertEqual(len(buf), len(PAGE))
+
+
+if __name__ == '__main__':
+    unittest.main()
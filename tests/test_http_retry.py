@@ -0,0 +1,91 @@
+"""
+Unit tests for the http_retry module
+"""
+
+import threading
+import unittest
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from unittest import mock
+
+from app import http_retry
+from app.http_retry import RetryBudget, create_session
+
+
+class _Handler(BaseHTTPRequestHandler):
+    """Answers every request with the server's (status, headers) and counts the hits."""
+
+    def _answer(self):
+        self.server.hits += 1
+        status, headers = self.server.reply
+        self.send_response(status)
+        for name, value in headers.items():
+            self.send_header(name, value)
+        self.send_header('Content-Length', '2')
+        self.end_headers()
+        self.wfile.write(b'ok')
+
+    do_GET = do_POST = _answer
+
+    def log_message(self, *args):
+        pass
+
+
+class TestRetryBudget(unittest.TestCase):
+    """Test cases for the per-host budget arithmetic"""
+
+    def test_ratio_with_floor(self):
+        budget = RetryBudget(ratio=0.1, min_retries=2, window_seconds=60)
+        for _ in range(30):
+            budget.record_request('a.com')
+        self.assertEqual(sum(budget.try_spend('a.com') for _ in range(10)), 3)
+        self.assertEqual(sum(budget.try_spend('b.com') for _ in range(10)), 2)
+        self.assertEqual(budget.denied, 15)
+
+
+class TestSessionRetryPolicy(unittest.TestCase):
+    """Test cases for sessions created with the shared policy, against a local server"""
+
+    def setUp(self):
+        self.server = ThreadingHTTPServer(('127.0.0.1', 0), _Handler)
+        self.server.hits = 0
+        self.server.reply = (503, {})
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+        self.addCleanup(self.server.server_close)
+        self.addCleanup(self.server.shutdown)
+        self.url = f'http://127.0.0.1:{self.server.server_port}/x'
+
+        for patcher in (
+            mock.patch.object(http_retry, 'RETRY_BUDGET', RetryBudget(ratio=0.1, min_retries=3, window_seconds=60)),
+            mock.patch.dict(http_retry.HTTP_RETRY_CONFIG, {'backoff_factor': 0}),
+        ):
+            patcher.start()
+            self.addCleanup(patcher.stop)
+        self.session = create_session(total=3)
+
+    def test_budget_stops_a_retry_storm(self):
+        self.assertEqual(self.session.get(self.url).status_code, 503)
+        self.assertEqual(self.server.hits, 4)
+        for _ in range(5):
+            self.assertEqual(self.session.get(self.url).status_code, 503)
+        self.assertEqual(self.server.hits, 9)
+
+    def test_short_retry_after_is_honored_long_one_ends_retries(self):
+        self.server.reply = (429, {'Retry-After': '0'})
+        self.session.get(self.url)
+        self.assertEqual(self.server.hits, 4)
+
+        self.server.hits = 0
+        self.server.reply = (503, {'Retry-After': '3600'})
+        self.assertEqual(self.session.get(self.url).status_code, 503)
+        self.assertEqual(self.server.hits, 1)
+
+    def test_403_and_post_are_not_retried(self):
+        self.server.reply = (403, {})
+        self.assertEqual(self.session.get(self.url).status_code, 403)
+        self.server.reply = (503, {})
+        self.assertEqual(self.session.post(self.url, data=b'x').status_code, 503)
+        self.assertEqual(self.server.hits, 2)
+
+
+if __name__ == '__main__':
+    unittest.main()
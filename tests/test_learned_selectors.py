@@ -0,0 +1,141 @@
+"""
+Unit tests for the learned_selectors module
+"""
+
+import os
+import shutil
+import tempfile
+import unittest
+from unittest import mock
+
+import trafilatura
+from bs4 import BeautifulSoup
+
+from app.extractor import ContentExtractor
+from app.learned_selectors import LearnedSelectors, domain_of, stable_selector
+from app.store import Database, close_thread_connections
+
+PARAGRAPH = 'Texto da matéria com bastante conteúdo para a validação do nó aprendido. ' * 3
+
+
+def _page(paragraphs=4, root_class='article-body materia'):
+    body = ''.join(f'<p>{PARAGRAPH} Parte {i}.</p>' for i in range(paragraphs))
+    return (
+        '<html><head><meta property="og:title" content="Título"></head><body>'
+        '<nav><a href="/">Home</a><a href="/a">A</a></nav>'
+        f'<div class="layout"><div class="{root_class} post-4711">{body}</div>'
+        '<div class="sidebar"><p>Mais lidas</p></div></div>'
+        '</body></html>'
+    )
+
+
+class TestStableSelector(unittest.TestCase):
+    """Test cases for the selector derivation"""
+
+    def test_prefers_id_then_stable_classes(self):
+        soup = BeautifulSoup('<div id="conteudo" class="a"></div><section class="post-99 corpo texto"></section>'
+                             '<div id="post-1"><p>x</p></div>', 'lxml')
+        self.assertEqual(stable_selector(soup.find('div'), soup), 'div#conteudo')
+        self.assertEqual(stable_selector(soup.find('section'), soup), 'section.corpo.texto')
+        self.assertIsNone(stable_selector(soup.find(id='post-1'), soup))
+        self.assertIsNone(stable_selector(soup.body, soup))
+
+    def test_uses_parent_when_ambiguous(self):
+        soup = BeautifulSoup('<div class="box"><div class="txt">1</div></div>'
+                             '<main class="m"><div class="txt">2</div></main>', 'lxml')
+        node = soup.select('.txt')[1]
+        self.assertEqual(stable_selector(node, soup), 'main.m > div.txt')
+        self.assertIs(soup.select_one(stable_selector(node, soup)), node)
+
+    def test_domain_of(self):
+        self.assertEqual(domain_of('https://WWW.Example.com/a'), 'example.com')
+        self.assertEqual(domain_of('https://ge.globo.com/a'), 'ge.globo.com')
+
+
+class TestLearnedSelectors(unittest.TestCase):
+    """Test cases for the learned selector store and its use by the extractor"""
+
+    def setUp(self):
+        self.tmp_dir = tempfile.mkdtemp()
+        self.db = Database(os.path.join(self.tmp_dir, 'app.db'))
+        self.db.initialize()
+        self.learned = LearnedSelectors(self.db.db_path, min_confirmations=2, min_confidence=0.8,
+                                        flush_interval_seconds=3600, flush_batch_size=100)
+
+    def tearDown(self):
+        self.db.close()
+        close_thread_connections()
+        shutil.rmtree(self.tmp_dir, ignore_errors=True)
+
+    def test_trusted_after_confirmations_until_failures(self):
+        self.learned.confirm('example.com', 'div.corpo')
+        self.assertIsNone(self.learned.selector_for('example.com'))
+        self.learned.confirm('example.com', 'div.corpo')
+        self.assertEqual(self.learned.selector_for('example.com'), 'div.corpo')
+        self.assertIsNone(self.learned.selector_for('other.com'))
+        self.learned.fail('example.com', 'div.corpo')
+        self.assertIsNone(self.learned.selector_for('example.com'))
+
+    def test_counts_are_buffered_until_flush(self):
+        for _ in range(2):
+            self.learned.confirm('example.com', 'div.corpo')
+        count = "SELECT COUNT(*) FROM learned_selectors"
+        self.assertEqual(self.db.conn.execute(count).fetchone()[0], 0)
+
+        self.assertEqual(self.learned.flush(), 1)
+        self.learned.confirm('example.com', 'div.corpo')
+        self.learned.close()
+        row = self.db.conn.execute("SELECT confirmations, failures FROM learned_selectors").fetchone()
+        self.assertEqual((row['confirmations'], row['failures']), (3, 0))
+        self.assertEqual(self.learned.selector_for('example.com'), 'div.corpo')
+
+    def test_failed_flush_leaves_pipeline_transaction_open(self):
+        self.db.conn.execute(
+            "CREATE TRIGGER reject_selectors BEFORE INSERT ON learned_selectors "
+            "BEGIN SELECT RAISE(ABORT, 'rejected'); END"
+        )
+        self.db.conn.execute("BEGIN")
+        self.db.conn.execute("SELECT COUNT(*) FROM seen_articles").fetchone()
+        self.learned.confirm('example.com', 'div.corpo')
+
+        self.assertEqual(self.learned.flush(), 0)
+        self.assertTrue(self.db.conn.in_transaction)
+        self.db.conn.rollback()
+        # The counts stay buffered for the next flush.
+        self.assertEqual(self.learned._pending, {('example.com', 'div.corpo'): [1, 0]})
+
+    def _extract(self, html, url='https://www.example.com/noticia'):
+        extractor = ContentExtractor(html_cache=False, learned_selectors=self.learned)
+        extractor._fetch_html = lambda _: html
+        with mock.patch('app.extractor.trafilatura.extract', wraps=trafilatura.extract) as traf:
+            result = extractor.extract(url)
+        return result, traf.called
+
+    def test_extractor_learns_then_bypasses_trafilatura(self):
+        for _ in range(2):
+            result, used_trafilatura = self._extract(_page())
+            self.assertTrue(used_trafilatura)
+        self.assertEqual(self.learned.selector_for('example.com'), 'div.article-body.materia')
+
+        result, used_trafilatura = self._extract(_page(paragraphs=5))
+        self.assertFalse(used_trafilatura)
+        paragraphs = BeautifulSoup(result['content'], 'lxml').find_all('p')
+        self.assertEqual(len(paragraphs), 5)
+        self.assertNotIn('class=', result['content'])
+        self.assertNotIn('Mais lidas', result['content'])
+
+    def test_root_that_fails_validation_falls_back(self):
+        for _ in range(2):
+            self._extract(_page())
+        result, used_trafilatura = self._extract(_page(paragraphs=1))
+        self.assertTrue(used_trafilatura)
+        self.assertIn('Parte 0', result['content'])
+        self.learned.flush()
+        row = self.learned._conn().execute(
+            "SELECT failures FROM learned_selectors WHERE selector = ?", ('div.article-body.materia',)
+        ).fetchone()
+        self.assertEqual(row['failures'], 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,67 @@
+"""
+Unit tests for the lookup_cache module
+"""
+
+import threading
+import time
+import unittest
+
+from app.lookup_cache import LookupCache
+
+
+class TestLookupCache(unittest.TestCase):
+    """Test cases for the LookupCache class"""
+
+    def test_lru_eviction(self):
+        """Test that the least recently used key is evicted first"""
+        cache = LookupCache(maxsize=2)
+        cache.set('a', 1)
+        cache.set('b', 2)
+        cache.get('a')
+        cache.set('c', 3)
+        self.assertEqual(cache.get('a'), (True, 1))
+        self.assertEqual(cache.get('b'), (False, None))
+
+    def test_negative_entries_expire_sooner(self):
+        """Test that 'not found' results use the negative TTL"""
+        cache = LookupCache(ttl_seconds=60, negative_ttl_seconds=0.01)
+        cache.set('missing', None)
+        cache.set('present', {'id': 1})
+        self.assertEqual(cache.get('missing'), (True, None))
+        time.sleep(0.02)
+        self.assertEqual(cache.get('missing'), (False, None))
+        self.assertEqual(cache.get('present'), (True, {'id': 1}))
+
+    def test_loader_errors_are_not_cached(self):
+        """Test that a failing loader is retried on the next lookup"""
+        cache = LookupCache()
+        with self.assertRaises(RuntimeError):
+            cache.get_or_load('k', lambda: (_ for _ in ()).throw(RuntimeError('boom')))
+        self.assertEqual(cache.get_or_load('k', lambda: 5), 5)
+
+    def test_concurrent_lookups_share_one_load(self):
+        """Test that concurrent misses for the same key call the loader once"""
+        cache = LookupCache()
+        calls = []
+        release = threading.Event()
+
+        def loader():
+            calls.append(1)
+            release.wait(1)
+            return 'value'
+
+        results = []
+        threads = [threading.Thread(target=lambda: results.append(cache.get_or_load('k', loader))) for _ in range(5)]
+        for t in threads:
+            t.start()
+        time.sleep(0.05)
+        release.set()
+        for t in threads:
+            t.join()
+
+        self.assertEqual(len(calls), 1)
+        self.assertEqual(results, ['value'] * 5)
+
+
+if __name__ == '__main__':
+    unittest.main()
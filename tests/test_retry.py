@@ -0,0 +1,144 @@
+"""
+Unit tests for the retry module
+"""
+
+import os
+import shutil
+import tempfile
+import unittest
+from datetime import datetime, timedelta
+
+from app.retry import RetryScheduler, is_transient_failure
+from app.store import Database, close_thread_connections
+
+
+class TestFailureClassification(unittest.TestCase):
+    """Test cases for is_transient_failure"""
+
+    def test_transient_reasons(self):
+        for reason in (
+            "All API keys are currently unavailable.",
+            "futebol pool is exhausted",
+            "429 Resource has been exhausted (e.g. check quota).",
+            "HTTPSConnectionPool: Read timed out.",
+            "502 Server Error: Bad Gateway",
+            "WordPress publishing failed",
+            "Extraction failed",
+        ):
+            self.assertTrue(is_transient_failure(reason), reason)
+
+    def test_permanent_reasons(self):
+        for reason in (None, "", "Missing/invalid URL", "AI output missing required fields",
+                       "Conteúdo não é sobre futebol"):
+            self.assertFalse(is_transient_failure(reason), reason)
+
+
+class TestRetryScheduler(unittest.TestCase):
+    """Test cases for the RetryScheduler class"""
+
+    def setUp(self):
+        self.tmp_dir = tempfile.mkdtemp()
+        self.db = Database(os.path.join(self.tmp_dir, 'app.db'))
+        self.db.initialize()
+        self.scheduler = RetryScheduler(self.db, max_attempts=3, base_delay_seconds=60,
+                                        max_delay_seconds=300, jitter=0.0, max_age_hours=6)
+
+    def tearDown(self):
+        self.db.close()
+        close_thread_connections()
+        shutil.rmtree(self.tmp_dir, ignore_errors=True)
+
+    def _new_article(self, external_id='a', published=None):
+        items = [{'id': external_id, 'url': f'https://example.com/{external_id}', 'title': external_id,
+                  'published': published}]
+        return self.db.filter_new_articles('feed', items)[0]
+
+    def _row(self, db_id):
+        self.db.flush_status_updates()
+        return self.db.conn.execute(
+            'SELECT status, retry_at, fail_count FROM seen_articles WHERE id = ?', (db_id,)).fetchone()
+
+    def _make_ready(self, db_id):
+        self.db.flush_status_updates()
+        self.db.conn.execute('UPDATE seen_articles SET retry_at = ? WHERE id = ?',
+                             (datetime.utcnow() - timedelta(seconds=1), db_id))
+        self.db.conn.commit()
+
+    def test_backoff_delay_is_exponential_and_capped(self):
+        delays = [self.scheduler.backoff_delay(n).total_seconds() for n in range(5)]
+        self.assertEqual(delays, [60, 120, 240, 300, 300])
+
+    def test_backoff_delay_jitter_stays_in_bounds(self):
+        scheduler = RetryScheduler(self.db, base_delay_seconds=100, max_delay_seconds=1000, jitter=0.25)
+        for _ in range(50):
+            self.assertTrue(75 <= scheduler.backoff_delay(0).total_seconds() <= 125)
+
+    def test_permanent_failure_is_terminal(self):
+        article = self._new_article()
+        self.assertEqual(self.scheduler.record_failure(article, "Missing/invalid URL"), 'FAILED')
+        self.assertEqual(self._row(article['db_id'])['status'], 'FAILED')
+
+    def test_transient_failure_is_deferred_until_attempts_run_out(self):
+        article = self._new_article()
+        self.assertEqual(self.scheduler.record_failure(article, "WordPress publishing failed"), 'DEFERRED')
+        row = self._row(article['db_id'])
+        self.assertEqual(row['status'], 'DEFERRED')
+        self.assertEqual(row['fail_count'], 1)
+        self.assertIsNotNone(row['retry_at'])
+
+        # Not ready before the backoff elapses.
+        self.assertEqual(self.scheduler.next_batch('feed', 10), [])
+
+        statuses = []
+        for _ in range(2):
+            self._make_ready(article['db_id'])
+            retry = self.scheduler.next_batch('feed', 10)
+            self.assertEqual([r['db_id'] for r in retry], [article['db_id']])
+            self.assertEqual(retry[0]['url'], 'https://example.com/a')
+            statuses.append(self.scheduler.record_failure(retry[0], "Extraction failed"))
+
+        self.assertEqual(statuses, ['DEFERRED', 'FAILED'])
+        self.assertEqual(self._row(article['db_id'])['status'], 'FAILED')
+
+    def test_stale_deferred_articles_are_given_up(self):
+        article = self._new_article()
+        self.scheduler.record_failure(article, "Read timed out")
+        self._make_ready(article['db_id'])
+        self.db.conn.execute('UPDATE seen_articles SET inserted_at = ? WHERE id = ?',
+                             (datetime.utcnow() - timedelta(hours=7), article['db_id']))
+        self.db.conn.commit()
+
+        self.assertEqual(self.scheduler.next_batch('feed', 10), [])
+        self.assertEqual(self._row(article['db_id'])['status'], 'FAILED')
+
+    def test_leftover_new_articles_are_processed_next_cycle(self):
+        deferred = self._new_article('old')
+        self.scheduler.record_failure(deferred, "Read timed out")
+        self._make_ready(deferred['db_id'])
+        new = [self._new_article(ext_id, published)['db_id']
+               for ext_id, published in (('b', '2024-01-01 09:00:00'), ('c', '2024-01-01 10:00:00'))]
+
+        # Retries go first, then the newest NEW article; the older one stays queued.
+        batch = self.scheduler.next_batch('feed', 2)
+        self.assertEqual([a['db_id'] for a in batch], [deferred['db_id'], new[1]])
+        self.assertEqual(batch[0]['fail_count'], 1)
+        for article in batch:
+            self.db.save_processed_post(article['db_id'], article['db_id'])
+
+        batch = self.scheduler.next_batch('feed', 2)
+        self.assertEqual([a['db_id'] for a in batch], [new[0]])
+        self.assertEqual(batch[0]['url'], 'https://example.com/b')
+        self.assertEqual(batch[0]['fail_count'], 0)
+
+    def test_stale_new_articles_are_given_up(self):
+        article = self._new_article()
+        self.db.conn.execute('UPDATE seen_articles SET inserted_at = ? WHERE id = ?',
+                             (datetime.utcnow() - timedelta(hours=7), article['db_id']))
+        self.db.conn.commit()
+
+        self.assertEqual(self.scheduler.next_batch('feed', 10), [])
+        self.assertEqual(self._row(article['db_id'])['status'], 'FAILED')
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,68 @@
+"""
+Unit tests for the site_rules module
+"""
+
+import unittest
+
+from bs4 import BeautifulSoup
+
+from app.site_rules import COMPILED_SITE_RULES, SiteRules, rules_for_host, rules_for_url
+
+
+class TestRulesLookup(unittest.TestCase):
+    """Test cases for the host suffix dispatch"""
+
+    def test_matches_host_and_subdomains(self):
+        self.assertIs(rules_for_host('lance.com.br'), COMPILED_SITE_RULES['lance.com.br'])
+        self.assertIs(rules_for_host('WWW.Lance.com.br:443'), COMPILED_SITE_RULES['lance.com.br'])
+        self.assertIs(rules_for_url('https://ge.globo.com/futebol/x.ghtml'), COMPILED_SITE_RULES['ge.globo.com'])
+
+    def test_does_not_match_by_substring(self):
+        self.assertIsNone(rules_for_host('notlance.com.br'))
+        self.assertIsNone(rules_for_host('g1.globo.com'))
+        self.assertIsNone(rules_for_host('lance.com.br.example.org'))
+        self.assertIsNone(rules_for_url(''))
+
+
+class TestSiteRules(unittest.TestCase):
+    """Test cases for compiled rule application"""
+
+    def test_clean_applies_selectors_and_texts(self):
+        rules = SiteRules('example.com', {
+            'remove': ['nav', '.ad'],
+            'drop_image_src': ['youtube.com'],
+            'kill_texts': [r'\bRelacionadas\b'],
+            'drop_texts': [r'continua após a publicidade'],
+        })
+        soup = BeautifulSoup(
+            '<nav><a>x</a></nav><div class="ad"><div class="ad">y</div></div>'
+            '<article><p>Texto <strong>Continua após a publicidade</strong></p><p>Fica</p>'
+            '<img src="https://i.ytimg.com/youtube.com/a.jpg"><img src="https://cdn/b.jpg">'
+            '<div class="w"><h3>Relacionadas</h3><a>1</a><a>2</a><a>3</a></div></article>', 'lxml')
+        rules.clean(soup)
+
+        self.assertEqual([p.get_text() for p in soup.find_all('p')], ['Fica'])
+        self.assertEqual([img['src'] for img in soup.find_all('img')], ['https://cdn/b.jpg'])
+        self.assertIsNone(soup.find('nav'))
+        self.assertIsNone(soup.select_one('.ad, .w'))
+
+    def test_ge_cta_removes_only_its_paragraph(self):
+        soup = BeautifulSoup(
+            '<div class="materia"><p>Primeiro parágrafo.</p>'
+            '<p><strong>Assista: tudo sobre</strong> o Corinthians no ge</p>'
+            '<p>Segundo parágrafo.</p></div>', 'lxml')
+        rules_for_host('ge.globo.com').clean(soup)
+        self.assertEqual([p.get_text() for p in soup.find_all('p')],
+                         ['Primeiro parágrafo.', 'Segundo parágrafo.'])
+
+    def test_site_extractor_selectors(self):
+        self.assertEqual(rules_for_host('www.infomoney.com.br').extract['title'], 'h1.asset-title, h1.entry-title')
+        self.assertIsNone(rules_for_host('lance.com.br').extract)
+
+    def test_json_ld_body_opt_in(self):
+        self.assertTrue(rules_for_host('ge.globo.com').json_ld_body)
+        self.assertFalse(rules_for_host('lance.com.br').json_ld_body)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,425 @@
+"""
+Unit tests for the store module
+"""
+
+import json
+import os
+import shutil
+import tempfile
+import threading
+import unittest
+from datetime import datetime, timedelta
+from unittest.mock import patch
+
+from app.store import Database, SCHEMA_MIGRATIONS, TaxonomyCache, close_thread_connections, get_connection
+
+
+class TestDatabase(unittest.TestCase):
+    """Test cases for the Database class"""
+
+    def setUp(self):
+        """Create a fresh database file for every test"""
+        self.tmp_dir = tempfile.mkdtemp()
+        self.db_path = os.path.join(self.tmp_dir, 'app.db')
+        self.db = Database(self.db_path)
+        self.db.initialize()
+
+    def tearDown(self):
+        self.db.close()
+        close_thread_connections()
+        shutil.rmtree(self.tmp_dir, ignore_errors=True)
+
+    def _items(self, *ids):
+        return [{'id': i, 'url': f'https://example.com/{i}', 'title': i, 'published': None} for i in ids]
+
+    def test_filter_new_articles_inserts_only_unseen(self):
+        """Test that known ids are filtered out and new ones receive a db_id"""
+        first = self.db.filter_new_articles('feed', self._items('a', 'b'))
+        self.assertEqual([a['id'] for a in first], ['a', 'b'])
+        self.assertTrue(all(a['db_id'] for a in first))
+
+        second = self.db.filter_new_articles('feed', self._items('b', 'c', 'c'))
+        self.assertEqual([a['id'] for a in second], ['c'])
+
+        count = self.db.conn.execute('SELECT COUNT(*) FROM seen_articles').fetchone()[0]
+        self.assertEqual(count, 3)
+
+    def test_filter_new_articles_generates_id_from_url(self):
+        """Test that items without an id are keyed by the hash of their URL"""
+        items = [{'url': 'https://example.com/x', 'title': 'x'}, {'title': 'no url'}]
+        new = self.db.filter_new_articles('feed', items)
+        self.assertEqual(len(new), 1)
+        self.assertEqual(len(new[0]['id']), 64)
+
+    def test_filter_new_articles_concurrent_workers(self):
+        """Test that two workers racing on the same feed never both claim an item"""
+        items = [f'item-{i}' for i in range(200)]
+        results = []
+
+        def worker():
+            db = Database(self.db_path)
+            try:
+                results.append(db.filter_new_articles('feed', self._items(*items)))
+            finally:
+                db.close()
+                close_thread_connections()
+
+        threads = [threading.Thread(target=worker) for _ in range(2)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+
+        claimed = [a['id'] for batch in results for a in batch]
+        self.assertEqual(sorted(claimed), sorted(items))
+
+    def test_connection_is_pooled_and_tuned(self):
+        """Test that connections are reused per thread and opened in WAL mode"""
+        other = Database(self.db_path)
+        self.assertIs(other.conn, self.db.conn)
+        self.assertIs(get_connection(self.db_path), self.db.conn)
+        self.assertEqual(self.db.conn.execute('PRAGMA journal_mode').fetchone()[0], 'wal')
+        self.assertEqual(self.db.conn.execute('PRAGMA synchronous').fetchone()[0], 1)  # NORMAL
+
+        seen = []
+        thread = threading.Thread(target=lambda: seen.append(get_connection(self.db_path)))
+        thread.start()
+        thread.join()
+        self.assertIsNot(seen[0], self.db.conn)
+
+    def test_cleanup_old_entries_in_batches(self):
+        """Test that cleanup deletes only old terminal rows, across several windows"""
+        articles = self.db.filter_new_articles('feed', self._items(*[f'i{n}' for n in range(10)]))
+        ids = [a['db_id'] for a in articles]
+        statuses = ['PUBLISHED', 'FAILED', 'NEW', 'DEFERRED', 'PUBLISHED'] * 2
+        for article_id, status in zip(ids, statuses):
+            self.db.conn.execute(
+                "UPDATE seen_articles SET status = ?, inserted_at = '2000-01-01 00:00:00.000' WHERE id = ?",
+                (status, article_id)
+            )
+        self.db.conn.execute("UPDATE seen_articles SET inserted_at = '2999-01-01 00:00:00.000' WHERE id = ?", (ids[-1],))
+        self.db.conn.execute('INSERT INTO posts (seen_article_id, wp_post_id) VALUES (?, 1)', (ids[0],))
+        self.db.conn.commit()
+
+        deleted = self.db.cleanup_old_entries(datetime.now() - timedelta(hours=1), batch_size=3, pause_seconds=0)
+
+        self.assertEqual(deleted, 5)
+        remaining = {row['id'] for row in self.db.conn.execute('SELECT id FROM seen_articles')}
+        self.assertEqual(remaining, {ids[2], ids[3], ids[7], ids[8], ids[9]})
+        self.assertEqual(self.db.conn.execute('SELECT COUNT(*) FROM posts').fetchone()[0], 0)
+
+    def test_cleanup_windows_follow_matching_rows(self):
+        """Test that runs of non-matching ids add no windows and no pauses"""
+        articles = self.db.filter_new_articles('feed', self._items(*[f'i{n}' for n in range(40)]))
+        ids = [a['db_id'] for a in articles]
+        for article_id in ids[:2] + ids[-2:]:
+            self.db.conn.execute(
+                "UPDATE seen_articles SET status = 'PUBLISHED', inserted_at = '2000-01-01 00:00:00.000' WHERE id = ?",
+                (article_id,)
+            )
+        self.db.conn.commit()
+
+        with patch('app.store.time.sleep') as sleep:
+            deleted = self.db.cleanup_old_entries(datetime.now() - timedelta(hours=1), batch_size=2, pause_seconds=1)
+
+        self.assertEqual(deleted, 4)
+        # Two windows of two matches each; the pause only separates them.
+        self.assertEqual(sleep.call_count, 1)
+
+    def test_cleanup_moves_rows_to_archive(self):
+        """Test that archived articles stay out of the hot table and are not ingested again"""
+        articles = self.db.filter_new_articles('feed', self._items('old', 'kept'))
+        self.db.conn.execute(
+            "UPDATE seen_articles SET status = 'PUBLISHED', inserted_at = '2000-01-01 00:00:00.000' WHERE id = ?",
+            (articles[0]['db_id'],)
+        )
+        self.db.conn.commit()
+
+        self.assertEqual(self.db.cleanup_old_entries(datetime.now() - timedelta(hours=1), pause_seconds=0), 1)
+        self.assertTrue(os.path.exists(os.path.join(self.tmp_dir, 'app-archive.db')))
+        archived = self.db.conn.execute(
+            'SELECT source_id, external_id, url FROM archive.seen_articles_archive').fetchall()
+        self.assertEqual([tuple(row) for row in archived], [('feed', 'old', 'https://example.com/old')])
+
+        new = self.db.filter_new_articles('feed', self._items('old', 'kept', 'fresh'))
+        self.assertEqual([a['id'] for a in new], ['fresh'])
+        # The archive is keyed per feed, like the hot table.
+        self.assertEqual([a['id'] for a in self.db.filter_new_articles('other', self._items('old'))], ['old'])
+
+    def test_prune_archive(self):
+        """Test that archive entries past retention are deleted in batches"""
+        self.db.conn.executemany(
+            "INSERT INTO archive.seen_articles_archive (source_id, external_id, archived_at) VALUES ('feed', ?, ?)",
+            [(f'a{n}', '2000-01-01 00:00:00.000' if n < 5 else '2999-01-01 00:00:00.000') for n in range(8)]
+        )
+        self.db.conn.commit()
+
+        self.assertEqual(self.db.prune_archive(datetime.utcnow(), batch_size=2), 5)
+        remaining = self.db.conn.execute('SELECT COUNT(*) FROM archive.seen_articles_archive').fetchone()[0]
+        self.assertEqual(remaining, 3)
+
+    def test_reclaim_space_after_cleanup(self):
+        """Test that freed pages are returned to the filesystem incrementally"""
+        self.assertEqual(self.db.conn.execute('PRAGMA auto_vacuum').fetchone()[0], 2)  # INCREMENTAL
+        self.db.conn.executemany(
+            "INSERT INTO failures (source_id, error_message) VALUES ('feed', ?)",
+            [('x' * 2000,) for _ in range(200)]
+        )
+        self.db.conn.commit()
+        self.db.conn.execute('DELETE FROM failures')
+        self.db.conn.commit()
+
+        released = self.db.reclaim_space(pages_per_step=16, pause_seconds=0)
+
+        self.assertGreater(released, 0)
+        self.assertEqual(self.db.conn.execute('PRAGMA freelist_count').fetchone()[0], 0)
+
+    def _status(self, article_id):
+        return self.db.conn.execute('SELECT status FROM seen_articles WHERE id = ?', (article_id,)).fetchone()['status']
+
+    def test_status_updates_are_written_behind(self):
+        """Test that status changes are buffered until the batch size is reached"""
+        self.db.status_flush_batch_size = 3
+        self.db.status_flush_interval_seconds = 3600
+        ids = [a['db_id'] for a in self.db.filter_new_articles('feed', self._items('a', 'b', 'c'))]
+
+        self.db.update_article_status(ids[0], 'FAILED', reason='Extraction failed')
+        self.db.update_article_status(ids[1], 'SKIPPED', reason='Blocked domain')
+        self.assertEqual(self._status(ids[0]), 'NEW')
+
+        self.db.update_article_status(ids[2], 'FAILED')
+        self.assertEqual([self._status(i) for i in ids], ['FAILED', 'SKIPPED', 'FAILED'])
+
+    def test_sync_and_publish_flush_pending_updates(self):
+        """Test that critical transitions force buffered updates to disk"""
+        self.db.status_flush_interval_seconds = 3600
+        ids = [a['db_id'] for a in self.db.filter_new_articles('feed', self._items('a', 'b'))]
+
+        self.db.update_article_status(ids[0], 'FAILED')
+        self.db.update_article_status(ids[1], 'PROCESSING', sync=True)
+        self.assertEqual([self._status(i) for i in ids], ['FAILED', 'PROCESSING'])
+
+        self.db.update_article_status(ids[0], 'SKIPPED')
+        self.db.save_processed_post(ids[1], 42)
+        self.assertEqual([self._status(i) for i in ids], ['SKIPPED', 'PUBLISHED'])
+        self.assertEqual(self.db._pending_status, [])
+
+    def test_checkpoints_round_trip_and_clear_on_publish(self):
+        """Test that stage checkpoints are stored compressed, replaced, and dropped once published"""
+        article_id = self.db.filter_new_articles('feed', self._items('a'))[0]['db_id']
+        self.assertEqual(self.db.load_checkpoints(article_id), {})
+
+        extracted = {'title': 'Título', 'content': '<p>' + 'texto ' * 500 + '</p>', 'images': []}
+        self.db.save_checkpoint(article_id, 'extracted', extracted)
+        self.db.save_checkpoint(article_id, 'media', {'a.jpg': {'id': 1}})
+        self.db.save_checkpoint(article_id, 'media', {'a.jpg': {'id': 1}, 'b.jpg': {'id': 2}})
+
+        self.assertEqual(self.db.load_checkpoints(article_id), {
+            'extracted': extracted,
+            'media': {'a.jpg': {'id': 1}, 'b.jpg': {'id': 2}},
+        })
+        stored = self.db.conn.execute(
+            "SELECT length(data) FROM article_checkpoints WHERE stage = 'extracted'").fetchone()[0]
+        self.assertLess(stored, len(extracted['content']) // 10)
+
+        self.db.save_processed_post(article_id, 42)
+        self.assertEqual(self.db.load_checkpoints(article_id), {})
+
+    def test_events_are_buffered_and_rolled_up(self):
+        """Test that events are written in batches and summarized with p50/p95 per day, source and stage"""
+        self.db.event_flush_batch_size = 100
+        self.db.event_flush_interval_seconds = 3600
+        article_id = self.db.filter_new_articles('feed', self._items('a'))[0]['db_id']
+        for ms in range(1, 21):
+            self.db.record_event(article_id, 'feed', 'extract', 'ok', duration_ms=ms * 10, size_bytes=ms * 1000)
+        self.db.record_event(article_id, 'feed', 'extract', 'failed', error_class='empty_content')
+        self.db.record_event(article_id, 'other', 'publish', 'ok', duration_ms=500)
+        self.assertEqual(self.db.conn.execute('SELECT COUNT(*) FROM article_events').fetchone()[0], 0)
+
+        rollup = self.db.get_stage_latency_rollup(datetime.utcnow() - timedelta(days=1))
+
+        self.assertEqual(self.db.conn.execute('SELECT COUNT(*) FROM article_events').fetchone()[0], 22)
+        self.assertEqual(self.db.conn.execute('SELECT SUM(bytes) FROM article_events').fetchone()[0], 210000)
+        today = datetime.utcnow().strftime('%Y-%m-%d')
+        self.assertEqual(rollup, [
+            {'day': today, 'source_id': 'feed', 'stage': 'extract', 'events': 21, 'failures': 1,
+             'p50_ms': 100, 'p95_ms': 190},
+            {'day': today, 'source_id': 'other', 'stage': 'publish', 'events': 1, 'failures': 0,
+             'p50_ms': 500, 'p95_ms': 500},
+        ])
+
+    def test_prune_events(self):
+        """Test that events past retention are deleted while recent ones are kept"""
+        self.db.record_event(1, 'feed', 'claim', 'started')
+        self.db.flush_events()
+        self.db.conn.execute("INSERT INTO article_events (seen_article_id, source_id, stage, status, created_at) "
+                             "VALUES (1, 'feed', 'claim', 'started', '2000-01-01 00:00:00.000')")
+        self.db.conn.commit()
+
+        self.assertEqual(self.db.prune_events(datetime.utcnow() - timedelta(days=1)), 1)
+        self.assertEqual(self.db.conn.execute('SELECT COUNT(*) FROM article_events').fetchone()[0], 1)
+
+    def test_counters_follow_inserts_updates_and_deletes(self):
+        """Test that the trigger-maintained counters match the tables"""
+        ids = [a['db_id'] for a in self.db.filter_new_articles('feed', self._items('a', 'b', 'c'))]
+        self.db.filter_new_articles('other', self._items('a'))
+        self.db.update_article_status(ids[0], 'FAILED')
+        self.db.save_processed_post(ids[1], 42)
+        self.db.conn.execute("INSERT INTO failures (source_id, error_message) VALUES ('feed', 'x')")
+        self.db.conn.execute('DELETE FROM seen_articles WHERE id = ?', (ids[2],))
+        self.db.conn.commit()
+
+        counters = self.db.get_counters()
+        self.assertEqual(counters['seen_articles'], 3)
+        self.assertEqual(counters['posts'], 1)
+        self.assertEqual(counters['failures'], 1)
+        self.assertEqual(counters['by_status'], {'FAILED': 1, 'PUBLISHED': 1, 'NEW': 1})
+        self.assertEqual(counters['by_source'], {'feed': {'FAILED': 1, 'PUBLISHED': 1}, 'other': {'NEW': 1}})
+        self.assertEqual(self.db.reconcile_counters(), 0)
+
+    def test_reconcile_counters_repairs_drift(self):
+        """Test that reconciliation recounts counters that no longer match"""
+        self.db.filter_new_articles('feed', self._items('a', 'b'))
+        self.db.conn.execute("UPDATE article_counters SET count = 99")
+        self.db.conn.execute("UPDATE table_counters SET count = 5 WHERE name = 'posts'")
+        self.db.conn.commit()
+
+        self.assertEqual(self.db.reconcile_counters(), 2)
+        counters = self.db.get_counters()
+        self.assertEqual((counters['seen_articles'], counters['posts'], counters['failures']), (2, 0, 0))
+
+
+class TestSchemaMigrations(unittest.TestCase):
+    """Test cases for the versioned schema migrations and query plans"""
+
+    def setUp(self):
+        self.tmp_dir = tempfile.mkdtemp()
+        self.db = Database(os.path.join(self.tmp_dir, 'app.db'))
+        self.db.initialize()
+
+    def tearDown(self):
+        self.db.close()
+        close_thread_connections()
+        shutil.rmtree(self.tmp_dir, ignore_errors=True)
+
+    def _plan(self, sql, params=()):
+        rows = self.db.conn.execute(f'EXPLAIN QUERY PLAN {sql}', params).fetchall()
+        return ' | '.join(row['detail'] for row in rows)
+
+    def test_schema_version_recorded(self):
+        """Test that every migration is applied once and recorded"""
+        latest = SCHEMA_MIGRATIONS[-1][0]
+        self.assertEqual(self.db.get_schema_version(), latest)
+        self.assertEqual(self.db.migrate(), latest)
+
+    def test_fail_count_column_supports_deferred_status(self):
+        """Test that deferring an article increments the migrated fail_count column"""
+        article = self.db.filter_new_articles('feed', [{'id': 'a', 'url': 'https://example.com/a'}])[0]
+        self.db.update_article_status(article['db_id'], 'DEFERRED', retry_at=None, reason='quota', sync=True)
+        row = self.db.conn.execute('SELECT status, fail_count FROM seen_articles WHERE id = ?', (article['db_id'],)).fetchone()
+        self.assertEqual((row['status'], row['fail_count']), ('DEFERRED', 1))
+
+    def test_queue_query_uses_index(self):
+        """Test that get_articles_to_process is served by an index without sorting"""
+        plan = self._plan("""
+            SELECT id, external_id, url, status, fail_count, fail_reason, inserted_at FROM seen_articles
+            WHERE source_id = ? AND status IN ('NEW', 'DEFERRED') AND (status = 'NEW' OR retry_at < ?)
+            ORDER BY status, published_at DESC
+            LIMIT ?
+        """, ('feed', '2024-01-01', 10))
+        self.assertIn('idx_seen_articles_queue', plan)
+        self.assertNotIn('TEMP B-TREE', plan)
+
+    def test_cleanup_statements_seek_by_rowid(self):
+        """Test that every cleanup window reads seen_articles as a rowid range, without sorting"""
+        articles = self.db.filter_new_articles('feed', [{'id': f'i{n}', 'url': f'https://example.com/{n}'}
+                                                        for n in range(6)])
+        self.db.conn.execute("UPDATE seen_articles SET status = 'PUBLISHED', inserted_at = '2000-01-01 00:00:00.000'")
+        self.db.conn.commit()
+        statements = []
+        self.db.conn.set_trace_callback(statements.append)
+        try:
+            self.assertEqual(self.db.cleanup_old_entries(datetime.now(), batch_size=4, pause_seconds=0), len(articles))
+        finally:
+            self.db.conn.set_trace_callback(None)
+
+        cleanup = [sql for sql in statements if 'FROM seen_articles' in sql]
+        self.assertGreaterEqual(len(cleanup), 8)
+        for sql in cleanup:
+            plan = self._plan(sql)
+            self.assertIn('USING INTEGER PRIMARY KEY (rowid>', plan, sql)
+            self.assertNotIn('TEMP B-TREE', plan, sql)
+            self.assertNotIn('idx_seen_articles_status_inserted', plan, sql)
+
+    def test_dashboard_queries_use_indexes(self):
+        """Test that dashboard recency and post queries avoid full table scans"""
+        plan = self._plan("SELECT MAX(inserted_at) FROM seen_articles WHERE inserted_at > datetime('now', '-2 hours')")
+        self.assertIn('idx_seen_articles_inserted', plan)
+        plan = self._plan('SELECT wp_post_id FROM posts ORDER BY created_at DESC LIMIT 10')
+        self.assertIn('idx_posts_created', plan)
+        plan = self._plan('SELECT id FROM posts WHERE seen_article_id = ?', (1,))
+        self.assertIn('idx_posts_seen_article', plan)
+
+
+class TestTaxonomyCache(unittest.TestCase):
+    """Test cases for the SQLite-backed TaxonomyCache"""
+
+    def setUp(self):
+        self.tmp_dir = tempfile.mkdtemp()
+        self.db_path = os.path.join(self.tmp_dir, 'app.db')
+        self.db = Database(self.db_path)
+        self.db.initialize()
+
+    def tearDown(self):
+        self.db.close()
+        close_thread_connections()
+        shutil.rmtree(self.tmp_dir, ignore_errors=True)
+
+    def _rows(self):
+        return self.db.conn.execute('SELECT COUNT(*) FROM taxonomy_cache').fetchone()[0]
+
+    def test_set_category_is_written_behind_in_batches(self):
+        """Test that entries are visible immediately but persisted in one batch"""
+        cache = TaxonomyCache(self.db_path, flush_interval_seconds=3600, flush_batch_size=3, legacy_json_path=None)
+        cache.set_category('a', {'id': 1})
+        cache.set_category('b', {'id': 2})
+        self.assertEqual(cache.get_category('a'), {'id': 1})
+        self.assertEqual(self._rows(), 0)
+
+        cache.set_category('c', {'id': 3})
+        self.assertEqual(self._rows(), 3)
+
+        other = TaxonomyCache(self.db_path, legacy_json_path=None)
+        self.assertEqual(other.get_category('b'), {'id': 2})
+        self.assertIsNone(other.get_category('missing'))
+
+    def test_cache_has_its_own_connection(self):
+        """Test that the cache never commits or rolls back the Database's connection"""
+        cache = TaxonomyCache(self.db_path, legacy_json_path=None)
+        self.assertIsNot(cache._conn(), self.db.conn)
+        self.assertIs(cache._conn(), get_connection(self.db_path, owner='taxonomy_cache'))
+
+    def test_expired_entries_are_ignored_without_writes(self):
+        """Test that reading an expired entry returns None and purge removes it"""
+        cache = TaxonomyCache(self.db_path, ttl_hours=0, legacy_json_path=None)
+        cache.set_category('a', {'id': 1})
+        cache.close()
+        self.assertIsNone(cache.get_category('a'))
+        self.assertEqual(self._rows(), 1)
+        self.assertEqual(cache.purge_expired(), 1)
+
+    def test_imports_legacy_json_file(self):
+        """Test that fresh entries from the old JSON file seed an empty table"""
+        legacy = os.path.join(self.tmp_dir, 'taxonomy_cache.json')
+        with open(legacy, 'w', encoding='utf-8') as f:
+            json.dump({
+                'fresh': {'timestamp': datetime.now().isoformat(), 'data': {'id': 7}},
+                'stale': {'timestamp': '2000-01-01T00:00:00', 'data': {'id': 8}},
+            }, f)
+        cache = TaxonomyCache(self.db_path, legacy_json_path=legacy)
+        self.assertEqual(cache.get_category('fresh'), {'id': 7})
+        self.assertIsNone(cache.get_category('stale'))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -6,7 +6,7 @@ import unittest
 from unittest.mock import Mock, patch, MagicMock
 import json
 import base64
-from app.wordpress import WordPressClient
+from app.wordpress import WordPressClient, CATEGORY_LOOKUP_CACHE, TAG_LOOKUP_CACHE
 
 
 class TestWordPressClient(unittest.TestCase):
@@ -329,5 +329,102 @@ class TestWordPressClient(unittest.TestCase):
         self.assertFalse(result)
 
 
+class TestCategoryLookupCache(unittest.TestCase):
+    """Test cases for the shared category lookup cache"""
+
+    def setUp(self):
+        CATEGORY_LOOKUP_CACHE.clear()
+        self.client = WordPressClient({'url': 'https://example.com/wp-json/wp/v2'}, {})
+
+    def tearDown(self):
+        CATEGORY_LOOKUP_CACHE.clear()
+
+    @patch('requests.Session.get')
+    def test_repeated_slug_lookups_hit_the_network_once(self, mock_get):
+        """Test that found and not-found slugs are both served from the cache"""
+        found = Mock(status_code=200)
+        found.json.return_value = [{'id': 5, 'name': 'Flamengo', 'slug': 'flamengo', 'parent': 2}]
+        missing = Mock(status_code=200)
+        missing.json.return_value = []
+        mock_get.side_effect = [found, missing]
+
+        for _ in range(3):
+            self.assertEqual(self.client.get_category_by_slug('flamengo')['id'], 5)
+            self.assertIsNone(self.client.get_category_by_slug('nao-existe'))
+        self.assertEqual(mock_get.call_count, 2)
+
+    @patch('requests.Session.post')
+    @patch('requests.Session.get')
+    def test_create_category_replaces_negative_entry(self, mock_get, mock_post):
+        """Test that a created category is visible without another lookup"""
+        missing = Mock(status_code=200)
+        missing.json.return_value = []
+        mock_get.return_value = missing
+        created = Mock(status_code=201)
+        created.json.return_value = {'id': 9, 'name': 'Novo', 'slug': 'novo', 'parent': 0}
+        mock_post.return_value = created
+
+        self.assertIsNone(self.client.get_category_by_slug('novo'))
+        self.client.create_category('Novo', 'novo')
+        self.assertEqual(self.client.get_category_by_slug('novo')['id'], 9)
+        self.assertEqual(mock_get.call_count, 1)
+
+
+class TestTagLookupCache(unittest.TestCase):
+    """Test cases for the shared tag lookup cache"""
+
+    def setUp(self):
+        TAG_LOOKUP_CACHE.clear()
+        self.client = WordPressClient({'url': 'https://example.com/wp-json/wp/v2'}, {})
+
+    def tearDown(self):
+        TAG_LOOKUP_CACHE.clear()
+
+    @patch('requests.Session.get')
+    def test_repeated_tag_lookups_hit_the_network_once(self, mock_get):
+        """Test that a tag name is looked up once, whatever its case"""
+        found = Mock(status_code=200)
+        found.json.return_value = [{'id': 11, 'name': 'Flamengo', 'slug': 'flamengo'}]
+        mock_get.return_value = found
+
+        for name in ('Flamengo', 'flamengo', ' FLAMENGO '):
+            self.assertEqual(self.client._get_existing_tag_id(name), 11)
+        self.assertEqual(mock_get.call_count, 1)
+
+    @patch('requests.Session.post')
+    @patch('requests.Session.get')
+    def test_created_tag_is_served_from_the_cache(self, mock_get, mock_post):
+        """Test that a created tag replaces the negative entry without another lookup"""
+        missing = Mock(status_code=200)
+        missing.json.return_value = []
+        mock_get.return_value = missing
+        created = Mock(status_code=201)
+        created.json.return_value = {'id': 12, 'name': 'Novo', 'slug': 'novo'}
+        mock_post.return_value = created
+
+        self.assertIsNone(self.client._get_existing_tag_id('Novo'))
+        self.assertEqual(self.client._create_tag('Novo'), 12)
+        self.assertEqual(self.client._get_existing_tag_id('Novo'), 12)
+        self.assertEqual(mock_get.call_count, 1)
+
+    @patch('requests.Session.post')
+    @patch('requests.Session.get')
+    def test_term_exists_invalidates_the_negative_entry(self, mock_get, mock_post):
+        """Test that a tag created elsewhere meanwhile is looked up again"""
+        missing = Mock(status_code=200)
+        missing.json.return_value = []
+        found = Mock(status_code=200)
+        found.json.return_value = [{'id': 13, 'name': 'Corrida', 'slug': 'corrida'}]
+        mock_get.side_effect = [missing, found]
+        exists = Mock(status_code=400)
+        exists.json.return_value = {'code': 'term_exists'}
+        mock_post.return_value = exists
+
+        self.assertIsNone(self.client._get_existing_tag_id('Corrida'))
+        self.assertEqual(self.client._create_tag('Corrida'), 13)
+        self.assertEqual(self.client._get_existing_tag_id('Corrida'), 13)
+        self.assertEqual(mock_get.call_count, 2)
+
+
 if __name__ == '__main__':
     unittest.main()